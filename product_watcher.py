@@ -6,16 +6,41 @@ Simple Product Watcher
 - Auto-purchase when available
 """
 
+import argparse
 import asyncio
+import atexit
 import json
 import logging
+import queue
 import sys
 import os
+import time
 import difflib
+import random
+import re
+import threading
+import aiohttp
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from urllib.parse import parse_qs, urlparse
 from dotenv import load_dotenv
 
+try:
+    from rapidfuzz import fuzz
+except ImportError:  # Fall back to difflib when rapidfuzz is not installed
+    fuzz = None
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # Fall back to the default asyncio event loop (uvloop is not available on Windows)
+    uvloop = None
+
 # Load environment variables from .env file (specify absolute path)
 env_path = Path(__file__).parent / ".env"
 load_dotenv(dotenv_path=env_path)
@@ -32,15 +57,308 @@ from src.telegram.service import TelegramBot
 
 # Status file location
 STATUS_FILE = Path("product_status.json")
+EVENTS_FILE = Path("events.ndjson")
+# Guards the status/events writes made from asyncio.to_thread workers
+_status_write_lock = threading.Lock()
+
+# Keys a product API object may use for its product ID
+API_ID_KEYS = ("id", "prid", "product_id", "productId")
+
+# Minimum seconds between two Telegram alerts of the same kind
+ALERT_COOLDOWN = 300
+# Alerts queued within this many seconds are combined into one Telegram message
+ALERT_BATCH_WINDOW = 1.0
+ALERT_BATCH_SIZE = 10
+# Minimum gap between Telegram sends, well under the per-chat rate limit
+ALERT_MIN_SPACING = 1.0
+
+# Numeric product ID from a Blinkit product URL (.../prid/746548?foo=bar)
+_PRID_RE = re.compile(r"prid/(\d+)")
 
 # ANSI color code for product names
 PRODUCT_COLOR = '\033[95m'  # Magenta
 RESET_COLOR = '\033[0m'
 
+# Product title selectors, passed as an argument to _TITLE_JS
+TITLE_SELECTORS = ["h1", ".product-title", ".productName", "[data-testid='product-title']", ".pdp__title"]
+
+# JS extractors are built once at import and reused on every check;
+# selector lists are passed as evaluate arguments instead of being interpolated.
+# Resolves meta tag, DOM selectors and document title in a single page.evaluate round-trip
+_TITLE_JS = """(sels) => {
+    const m = document.querySelector("meta[property='og:title']");
+    if (m && m.content && m.content.trim()) return m.content.trim();
+    for (const s of sels) {
+        const el = document.querySelector(s);
+        if (el) {
+            const t = (el.innerText || el.textContent || '').trim();
+            if (t) return t;
+        }
+    }
+    return document.title || null;
+}"""
+
+# Common cart item selectors - including DefaultProductCard pattern from Blinkit
+CART_SELECTORS = [
+    "[class*='DefaultProductCard__ProductTitle']",  # Main pattern from Blinkit cart
+    ".cart-item-name",
+    ".product-name",
+    "[data-testid='cart-item-name']",
+    ".CartItem__ProductName",
+    ".CartItemCard__ProductName",
+    ".cart-product-title",
+    ".item-name",
+    ".productName",
+    "[class*='ProductTitle']"  # Generic product title class
+]
+# The cart drawer has rendered once one of its item titles is visible
+# (the generic ProductTitle class is left out since it also matches the product page)
+CART_READY_SELECTORS = tuple(CART_SELECTORS[:-1])
+
+# Selector probing, container scan and last-resort scan run in one page.evaluate round-trip
+_CART_JS = """(sels) => {
+    const generic = ['add', 'remove', 'qty', 'quantity', 'view more details'];
+    const textOf = (el) => (el.innerText || el.textContent || '').trim();
+
+    // 1. Known cart item selectors (avoid returning generic buttons or links)
+    for (const s of sels) {
+        const el = document.querySelector(s);
+        if (el) {
+            const text = textOf(el);
+            if (text && text.length > 5 && !generic.includes(text.toLowerCase())) return text;
+        }
+    }
+
+    // 2. Cart item containers - look for DefaultProductCard containers first (most reliable for Blinkit)
+    let containers = document.querySelectorAll('[class*="DefaultProductCard__Container"]');
+    if (containers.length === 0) {
+        // Fallback to other cart patterns
+        containers = [
+            ...document.querySelectorAll('[class*="CartItem"]:not([class*="Divider"])'),
+            ...document.querySelectorAll('[class*="cart-item"]'),
+            ...document.querySelectorAll('[data-testid*="cart"]'),
+        ];
+    }
+
+    if (containers.length > 0) {
+        const container = containers[0];
+        const candidates = [
+            container.querySelector('[class*="DefaultProductCard__ProductTitle"]'),
+            container.querySelector('h1, h2, h3, h4, h5, h6'),
+            container.querySelector('strong, [class*="title"], [class*="name"]'),
+        ];
+        for (const el of candidates) {
+            if (el) {
+                const text = textOf(el);
+                if (text && text.length > 5) return text;
+            }
+        }
+
+        // Get all text and extract first meaningful line
+        const allText = container.innerText || container.textContent;
+        if (allText) {
+            const lines = allText.split('\\n').filter(l => {
+                const trimmed = l.trim();
+                return trimmed.length > 10 && !generic.includes(trimmed.toLowerCase());
+            });
+            if (lines.length > 0) return lines[0].trim();
+        }
+    }
+
+    // 3. Last resort: any element containing product-like text
+    const allElements = document.querySelectorAll('[class*="product"], [class*="ProductTitle"], [class*="item"], [class*="cart"]');
+    for (const el of allElements) {
+        const text = textOf(el);
+        if (text.length > 10 && text.length < 500 &&
+            !generic.includes(text.toLowerCase()) &&
+            !text.match(/^\\d+\\s*(x|\\+|Rs|₹)/i)) {
+            return text.split('\\n')[0].trim();
+        }
+    }
+    return null;
+}"""
+
+
+# Common out of stock indicators (text matched case-insensitively against rendered page text)
+OUT_OF_STOCK_TEXTS = ["out of stock", "sold out", "not available"]
+OUT_OF_STOCK_SELECTORS = [
+    "[class*='outofstock' i]",
+    "[class*='out-of-stock' i]",
+    "[class*='soldout' i]",
+    "[class*='sold-out' i]"
+]
+
+# Checkout step selectors, specific to generic; click_first() prefers the precise ones over text=/[class*=] matches
+ADD_SELECTORS = (".add-to-cart", "button.add", "button:has-text('Add')", "text=ADD", "text=Add")
+
+# Open the cart drawer through whichever cart button is on the page
+CART_BUTTON_SELECTORS = (
+    "text=My Cart",
+    ".CartButton__Container-sc-1fuy2nj-3",
+    "[class*='CartButton__Container']",
+    "button[class*='CartButton']"
+)
+
+# "Proceed to pay" button which redirects to checkout
+PROCEED_TO_PAY_SELECTORS = (
+    "button:has-text('Proceed to Pay')",
+)
+
+# Cash / COD payment option. Based on HTML: <div role="button" aria-label="Cash" title="Cash">
+CASH_SELECTORS = (
+    "[aria-label='Cash']",
+    "div[role='button'][aria-label='Cash']",
+    "[title='Cash']",
+    "h5:has-text('Cash')",
+    "text=Cash",
+    "[class*='cod']",
+    "[class*='cash']"
+)
+
+# Pay Now / Place Order button
+PAY_SELECTORS = (
+    "button:has-text('Pay Now')",
+    "button:has-text('Pay now')",
+    "text=Pay Now",
+    "text=Pay now",
+    "button:has-text('Place Order')",
+    "text=Place Order"
+)
+
+# Returns true if any visible out-of-stock indicator is present or the ADD button is disabled
+_OUT_OF_STOCK_JS = """({texts, selectors}) => {
+    const isVisible = (el) => !!el && el.offsetParent !== null;
+    const pageText = (document.body && document.body.innerText || '').toLowerCase();
+    if (texts.some(t => pageText.includes(t))) return true;
+    for (const s of selectors) {
+        for (const el of document.querySelectorAll(s)) {
+            if (isVisible(el)) return true;
+        }
+    }
+
+    // Also check if ADD button is disabled
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+    while (walker.nextNode()) {
+        if (walker.currentNode.nodeValue.trim().toUpperCase() === 'ADD') {
+            const el = walker.currentNode.parentElement;
+            const btn = el.closest('button') || el;
+            return !!(btn.disabled || btn.getAttribute('disabled') !== null ||
+                      String(btn.className).includes('disabled'));
+        }
+    }
+    return false;
+}"""
+
+# Text of every button on the page, collected in one round-trip
+_BUTTON_TEXTS_JS = """() => Array.from(document.querySelectorAll('button'), b => b.textContent)"""
+
+# True once the product page has rendered its Coming Soon label or ADD button
+_PAGE_READY_JS = """() => /Coming Soon|\\bADD\\b/i.test((document.body && document.body.innerText) || '')"""
+
+# Scans document.body.innerText once for the "Coming Soon" label and the ADD button text
+_PAGE_STATUS_JS = """() => {
+    const t = (document.body && document.body.innerText) || '';
+    return {coming: /Coming Soon/i.test(t), add: /\\bADD\\b/i.test(t)};
+}"""
+
+# Shared HTTP session for product API polling and Telegram (keep-alive + connection pooling across checks)
+_http_session = None
+
+
+def get_http_session():
+    """Return the shared aiohttp session, creating it on first use"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    return _http_session
+
+
+async def close_http_session():
+    """Close the shared aiohttp session if it was opened"""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
 def colorize_product(name):
-    """Wrap product name with color codes"""
+    """Wrap product name with color codes (unchanged when the console log is not a terminal, see _USE_COLOR)"""
+    if not _USE_COLOR:
+        return name
     return f"{PRODUCT_COLOR}{name}{RESET_COLOR}"
 
+def name_similarity(expected, actual):
+    """Case-insensitive similarity ratio (0.0 - 1.0) between two product names"""
+    expected = (expected or "").lower()
+    actual = (actual or "").lower()
+    if fuzz is not None:
+        return fuzz.ratio(expected, actual) / 100.0
+    return difflib.SequenceMatcher(None, expected, actual).ratio()
+
+def any_of(page, selectors):
+    """Single locator matching the first visible element found by any of the selectors"""
+    locator = page.locator(selectors[0])
+    for sel in selectors[1:]:
+        locator = locator.or_(page.locator(sel))
+    return locator.locator("visible=true").first
+
+def is_broad_selector(selector):
+    """True for text= and [class*=...] selectors, which can also match unrelated elements"""
+    return selector.startswith("text=") or "[class*=" in selector
+
+async def click_first(page, selectors, label, timeout=5000, scroll=False):
+    """
+    Click the first visible element matching any of the selectors
+    
+    Waits once for any of the selectors to show a visible match, then clicks a match of
+    the precise selectors if there is one, falling back to the broad text=/[class*=] ones.
+    
+    Args:
+        page: Playwright page
+        selectors: Selectors to try, combined with any_of()
+        label: Name of the button for log messages
+        timeout: Milliseconds to wait for a match
+        scroll: Scroll the element into view before clicking
+    
+    Returns:
+        True if clicked, False if nothing matched in time
+    """
+    precise = [sel for sel in selectors if not is_broad_selector(sel)]
+    broad = [sel for sel in selectors if is_broad_selector(sel)]
+    try:
+        await any_of(page, selectors).wait_for(state="visible", timeout=timeout)
+        locator = None
+        for tier in (precise, broad):
+            if tier and await any_of(page, tier).count():
+                locator = any_of(page, tier)
+                break
+        if locator is None:
+            raise TimeoutError("visible match disappeared before the click")
+        if scroll:
+            await locator.scroll_into_view_if_needed(timeout=timeout)
+        await locator.click(timeout=timeout)
+    except Exception as e:
+        logger.debug("%s selectors failed: %s", label, e)
+        return False
+    logger.info("[OK] Clicked %s", label)
+    return True
+
+async def backoff(attempt):
+    """Sleep with exponential backoff (200 ms doubling, capped at 2 s) plus up to 100 ms jitter"""
+    await asyncio.sleep(min(0.2 * 2 ** attempt, 2.0) + random.random() * 0.1)
+
+async def is_visible_soon(page, selector, attempts=5):
+    """Poll is_visible with backoff between attempts until the selector shows up"""
+    for attempt in range(attempts):
+        if await page.is_visible(selector):
+            return True
+        if attempt < attempts - 1:
+            await backoff(attempt)
+    return False
+
 def play_alert_sound():
     """Play an alert sound when product is available"""
     try:
@@ -48,14 +366,13 @@ def play_alert_sound():
             # Windows: play a beep at 1000 Hz for 1 second
             # winsound.Beep(1000, 500)
             # Play it twice for emphasis
-            import time
             time.sleep(0.2)
             # winsound.Beep(1000, 1000)
         else:
             # On other platforms, use system beep
             print('\a', end='', flush=True)
     except Exception as e:
-        logger.debug(f"Failed to play alert sound: {e}")
+        logger.debug("Failed to play alert sound: %s", e)
 
 
 class OrdinalDateFormatter(logging.Formatter):
@@ -92,54 +409,93 @@ class OrdinalDateFormatter(logging.Formatter):
     
     RESET = '\033[0m'
     
+    # (time, level, message) colors per level, resolved once at class creation
+    _COLOR_CACHE = {
+        lvl: (colors['time'], colors['level'], colors['message'])
+        for lvl, colors in LEVEL_COLORS.items()
+    }
+    
+    # Day of month -> ordinal string ("1st", "2nd", ... "31st"); index 0 unused
+    _ORDINAL = tuple(
+        f"{d}{'th' if 10 <= d % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(d % 10, 'th')}"
+        for d in range(32)
+    )
+    
+    def __init__(self, *args, use_color=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.use_color = use_color
+        # Per-level "%s" template with the colored time/level/message sandwich pre-joined
+        self._style_cache = {}
+        for levelname in self._COLOR_CACHE:
+            self._level_template(levelname)
+        # Records within the same second share one formatted date string
+        self._last_sec = None
+        self._last_str = None
+    
+    def _level_template(self, levelname):
+        template = self._style_cache.get(levelname)
+        if template is None:
+            if not self.use_color:
+                template = f"%s - {levelname} - %s"
+                self._style_cache[levelname] = template
+                return template
+            ct, cl, cm = self._COLOR_CACHE.get(levelname, self._COLOR_CACHE['INFO'])
+            # Format: [colored_time] - colored_level - colored_message
+            template = f"{ct}%s{self.RESET} - {cl}{levelname}{self.RESET} - {cm}%s{self.RESET}"
+            self._style_cache[levelname] = template
+        return template
+    
     def format(self, record):
-        # Convert timestamp to ordinal date format
-        dt = datetime.fromtimestamp(record.created)
-        day = dt.day
-        month = dt.strftime('%b')
-        year = dt.year
-        time_str = dt.strftime('%I:%M:%S %p')
-        
-        # Add ordinal suffix to day
-        if 10 <= day % 100 <= 20:
-            suffix = 'th'
-        else:
-            suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th')
+        # Convert timestamp to ordinal date format (recomputed at most once per second)
+        sec = int(record.created)
+        if sec != self._last_sec:
+            dt = datetime.fromtimestamp(sec)
+            self._last_str = f"{self._ORDINAL[dt.day]} {dt.strftime('%b')} {dt.year} {dt.strftime('%I:%M:%S %p')}"
+            self._last_sec = sec
         
-        ordinal_date = f"{day}{suffix} {month} {year} {time_str}"
-        
-        # Get colors for this level
-        colors = self.LEVEL_COLORS.get(record.levelname, self.LEVEL_COLORS['INFO'])
-        
-        # Apply colors to each component
-        colored_time = f"{colors['time']}{ordinal_date}{self.RESET}"
-        colored_level = f"{colors['level']}{record.levelname}{self.RESET}"
-        colored_message = f"{colors['message']}{record.getMessage()}{self.RESET}"
-        
-        # Format: [colored_time] - colored_level - colored_message
-        log_message = f"{colored_time} - {colored_level} - {colored_message}"
-        
-        return log_message
+        return self._level_template(record.levelname) % (self._last_str, record.getMessage())
 
 
 # Configure logging with custom formatter
 stream_handler = logging.StreamHandler()
-stream_handler.setFormatter(OrdinalDateFormatter())
+# Escape codes are only useful on a terminal; check the stream the console log actually writes to
+_USE_COLOR = stream_handler.stream.isatty()
+stream_handler.setFormatter(OrdinalDateFormatter(use_color=_USE_COLOR))
 
 file_handler = logging.FileHandler('product_watcher.log', encoding='utf-8')
 file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%d %b %Y %I:%M %p')
 file_handler.setFormatter(file_formatter)
+# Only warnings and errors go to the log file; status history is kept in EVENTS_FILE as NDJSON
+file_handler.setLevel(logging.WARNING)
+
+# Records are handed to a background thread so console/file writes never block the event loop
+log_queue = queue.SimpleQueue()
+queue_handler = QueueHandler(log_queue)
+# Only merge args into the message here; the listener's handlers apply their own formatting
+queue_handler.setFormatter(logging.Formatter('%(message)s'))
+log_listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 
 logging.basicConfig(
     level=logging.INFO,
-    handlers=[file_handler, stream_handler],
+    handlers=[queue_handler],
     force=True
 )
 logger = logging.getLogger(__name__)
 
 
 class ProductWatcher:
-    def __init__(self, product_url, latitude, longitude, check_interval=30, location_label="Home", continue_on_out_of_stock=False, telegram_bot_token=None, telegram_channel_id=None, automate_checkout=False):
+    __slots__ = (
+        'product_url', 'latitude', 'longitude', 'check_interval',
+        'min_interval', 'max_interval', 'jitter', 'last_status', 'stable_checks', 'retry_after',
+        'query_count', 'auth', 'order', 'product_id', 'status_file', 'expected_product_name', '_expected_colored', '_expected_lower', '_name_matcher',
+        'product_api', 'api_cookie_header', 'location_label', 'continue_on_out_of_stock',
+        'automate_checkout', 'telegram_bot', '_last_alert', '_alert_queue', '_alert_task',
+        'telegram_retry_event', 'telegram_cancel_event', 'original_params'
+    )
+
+    def __init__(self, product_url, latitude, longitude, check_interval=30, location_label="Home", continue_on_out_of_stock=False, telegram_bot_token=None, telegram_channel_id=None, automate_checkout=False, min_interval=5, max_interval=None, jitter=2):
         """
         Initialize the product watcher
         
@@ -147,22 +503,41 @@ class ProductWatcher:
             product_url: Full Blinkit product URL
             latitude: Delivery location latitude
             longitude: Delivery location longitude
-            check_interval: Time between checks in seconds
+            check_interval: Time between checks in seconds (upper bound for adaptive polling)
             location_label: Saved address label to select (default 'Home')
             continue_on_out_of_stock: Keep monitoring if product goes out of stock (default False)
             telegram_bot_token: Telegram bot token for notifications
             telegram_channel_id: Telegram channel ID for notifications
             automate_checkout: If True, automatically proceed with checkout steps (default False)
+            min_interval: Shortest delay between checks, used right after a status change (default 5s)
+            max_interval: Longest delay between checks (default: check_interval)
+            jitter: Random +/- seconds added to each delay to avoid synchronized polling (default 2s)
         """
         self.product_url = product_url
         self.latitude = latitude
         self.longitude = longitude
         self.check_interval = check_interval
+        # Adaptive polling: start at min_interval after a status change, back off while stable
+        self.max_interval = max_interval or check_interval
+        self.min_interval = min(min_interval, self.max_interval)
+        self.jitter = jitter
+        self.last_status = None
+        self.stable_checks = 0
+        self.retry_after = None
         self.query_count = 0
         self.auth = None
         self.order = None
         self.product_id = self.extract_product_id(product_url)
+        # Status snapshot for this product (watch_many gives each product its own)
+        self.status_file = STATUS_FILE
         self.expected_product_name = None
+        self._expected_colored = colorize_product("Unknown")
+        self._expected_lower = ""
+        # SequenceMatcher indexed on the expected name, reused for every comparison
+        self._name_matcher = None
+        # Product XHR captured from the first page load, polled over HTTP on later checks
+        self.product_api = None
+        self.api_cookie_header = None
         # Label of the saved address to select via site UI (e.g., 'Home')
         self.location_label = location_label or "Home"
         # Continue refreshing if product goes out of stock
@@ -173,7 +548,13 @@ class ProductWatcher:
         # Telegram bot configuration
         self.telegram_bot = None
         if telegram_bot_token and telegram_channel_id:
-            self.telegram_bot = TelegramBot(telegram_bot_token, telegram_channel_id)
+            # Telegram calls share the product API's connection pool and DNS cache
+            self.telegram_bot = TelegramBot(telegram_bot_token, telegram_channel_id, session=get_http_session)
+        
+        # Telegram alerts are rate limited per kind and sent from a background queue
+        self._last_alert = {}
+        self._alert_queue = asyncio.Queue(maxsize=1024)
+        self._alert_task = None
         
         # Event to signal retry request from Telegram button
         self.telegram_retry_event = asyncio.Event()
@@ -191,41 +572,262 @@ class ProductWatcher:
             "telegram_channel_id": telegram_channel_id
         }
 
-    def extract_product_id(self, url):
-        """Extract product ID from URL"""
+    def queue_alert(self, kind, **notification):
+        """
+        Queue a Telegram product notification unless one of the same kind was sent recently
+        
+        Args:
+            kind: Alert kind used for the cooldown (e.g. 'available')
+            **notification: Arguments for TelegramBot.send_product_notification
+        
+        Returns:
+            True if the alert was queued, False if skipped
+        """
+        if not self.telegram_bot:
+            return False
+        now = time.monotonic()
+        last = self._last_alert.get(kind)
+        if last is not None and now - last < ALERT_COOLDOWN:
+            logger.info("[TELEGRAM] Skipping '%s' alert - one was sent %.0fs ago", kind, now - last)
+            return False
+        self._last_alert[kind] = now
+        if self._alert_task is None or self._alert_task.done():
+            self._alert_task = asyncio.create_task(self._alert_worker())
         try:
-            return url.split("prid/")[-1]
-        except:
+            self._alert_queue.put_nowait(notification)
+        except asyncio.QueueFull:
+            logger.warning("[TELEGRAM] Alert queue full - dropping '%s' alert", kind)
+            return False
+        return True
+
+    async def _alert_worker(self):
+        """Drain the alert queue in batches, honoring Telegram's retry_after on HTTP 429"""
+        loop = asyncio.get_running_loop()
+        last_sent = 0.0
+        while True:
+            batch = [await self._alert_queue.get()]
+            # Collect anything else queued within the flush window into the same message
+            deadline = loop.time() + ALERT_BATCH_WINDOW
+            while len(batch) < ALERT_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._alert_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                wait = ALERT_MIN_SPACING - (loop.time() - last_sent)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                for attempt in range(3):
+                    if await self.telegram_bot.send_product_notifications(batch):
+                        logger.info("[OK] Telegram notification with buttons sent successfully (%s alert(s))", len(batch))
+                        logger.info("[INFO] User can now click 'Retry' button to restart the watch process")
+                        break
+                    if not self.telegram_bot.retry_after:
+                        logger.warning("[WARN] Telegram notification failed to send")
+                        break
+                    logger.warning("[TELEGRAM] Rate limited - retrying in %ss", self.telegram_bot.retry_after)
+                    await asyncio.sleep(self.telegram_bot.retry_after)
+                last_sent = loop.time()
+            except Exception as e:
+                logger.error("[ERROR] Telegram notification error: %s", e)
+            finally:
+                for _ in batch:
+                    self._alert_queue.task_done()
+
+    async def flush_alerts(self, timeout=30):
+        """Wait for queued Telegram alerts to be sent, then stop the worker"""
+        if self._alert_task is None:
+            return
+        try:
+            await asyncio.wait_for(self._alert_queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("[TELEGRAM] Timed out sending queued alerts")
+        self._alert_task.cancel()
+        self._alert_task = None
+
+    async def wait_for_callback(self, timeout, page_wait=None):
+        """
+        Wait until a Telegram Retry/Cancel callback arrives or page_wait completes
+        
+        Args:
+            timeout: Maximum seconds to wait
+            page_wait: Optional awaitable (e.g. a Playwright wait) that ends the wait when it resolves
+        
+        Returns:
+            'retry', 'cancel', 'page' or None on timeout
+        """
+        waiters = {
+            asyncio.create_task(self.telegram_retry_event.wait()): "retry",
+            asyncio.create_task(self.telegram_cancel_event.wait()): "cancel",
+        }
+        if page_wait is not None:
+            waiters[asyncio.ensure_future(page_wait)] = "page"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            pending = set(waiters)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0, deadline - loop.time()), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    return None
+                for task in done:
+                    # A failed page wait (e.g. Playwright timeout) does not end the wait for callbacks
+                    if not task.cancelled() and task.exception() is None:
+                        return waiters[task]
             return None
+        finally:
+            for task in waiters:
+                task.cancel()
 
-    async def get_product_title(self, page):
-        """Try multiple selectors/meta tags to extract a reliable product title."""
-        # Use page.evaluate to read DOM properties directly to avoid locator wait issues
+    def extract_product_id(self, url):
+        """Extract product ID from URL (ignores trailing query strings / fragments)"""
+        if match := _PRID_RE.search(url or ""):
+            return match.group(1)
+        return None
+
+    @staticmethod
+    def url_targets_product(url, product_id):
+        """True if product_id is a whole path segment or query parameter value of url (not just a substring)"""
+        parsed = urlparse(url)
+        if product_id in parsed.path.split("/"):
+            return True
+        return any(product_id in values for values in parse_qs(parsed.query).values())
+
+    def _capture_product_api(self, request):
+        """Remember the product page's own XHR so later checks can replay it without the browser"""
+        if self.product_api is not None or not self.product_id:
+            return
         try:
-            try:
-                meta = await page.evaluate("() => { const m = document.querySelector(\"meta[property='og:title']\"); return m ? m.getAttribute('content') : null; }")
-                if meta:
-                    return meta.strip()
-            except Exception:
-                pass
+            if request.resource_type in ("xhr", "fetch") and self.url_targets_product(request.url, self.product_id):
+                self.product_api = {
+                    "method": request.method,
+                    "url": request.url,
+                    "data": request.post_data,
+                    "headers": {
+                        k: v for k, v in request.headers.items()
+                        if not k.startswith(":") and k.lower() not in ("cookie", "host", "content-length")
+                    }
+                }
+                logger.info("[API] Captured product API: %s %s", request.method, request.url)
+        except Exception as e:
+            logger.debug("Product API capture failed: %s", e)
 
-            selectors = ["h1", ".product-title", ".productName", "[data-testid='product-title']", ".pdp__title"]
-            for sel in selectors:
-                try:
-                    script = f"() => {{ const el = document.querySelector('{sel}'); return el ? (el.innerText || el.textContent) : null; }}"
-                    text = await page.evaluate(script)
-                    if text:
-                        return text.strip()
-                except Exception:
+    async def refresh_api_cookies(self):
+        """Copy the browser's auth cookies for the captured product API host"""
+        if not self.product_api or not self.auth or not self.auth.context:
+            return
+        try:
+            host = urlparse(self.product_api["url"]).hostname or ""
+            cookies = await self.auth.context.cookies()
+            self.api_cookie_header = "; ".join(
+                f"{c['name']}={c['value']}" for c in cookies
+                if host.endswith(c.get("domain", "").lstrip("."))
+            )
+        except Exception as e:
+            logger.debug("Failed to copy cookies for product API: %s", e)
+
+    @staticmethod
+    def api_product_id(node):
+        """The product ID an API object carries under one of API_ID_KEYS, as a string, or None"""
+        for key in API_ID_KEYS:
+            value = node.get(key)
+            if value is not None and not isinstance(value, (dict, list)):
+                return str(value)
+        return None
+
+    @staticmethod
+    def parse_api_availability(data, product_id):
+        """
+        Read coming-soon / stock flags for product_id from the product JSON
+        
+        Only the object whose id is product_id is read (with its nested fields), so related,
+        recommended or widget products in the same payload are ignored.
+        
+        Returns:
+            'coming_soon', 'available', or None if the product's own object or its flags are missing
+        """
+        product_id = str(product_id)
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, dict):
+                if ProductWatcher.api_product_id(node) == product_id:
+                    return ProductWatcher._read_availability_flags(node, product_id)
+                stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        return None
+
+    @staticmethod
+    def _read_availability_flags(product, product_id):
+        """Coming-soon / stock flags of one product object, skipping nested objects of other products"""
+        in_stock = False
+        stack = [product]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, dict):
+                other_id = ProductWatcher.api_product_id(node)
+                if other_id is not None and other_id != product_id:
                     continue
+                for key, value in node.items():
+                    if isinstance(value, (dict, list)):
+                        stack.append(value)
+                        continue
+                    key = key.lower()
+                    if "coming_soon" in key and value:
+                        return "coming_soon"
+                    if isinstance(value, str) and value.strip().lower() == "coming soon":
+                        return "coming_soon"
+                    if key in ("in_stock", "is_in_stock", "available", "is_available") and value is True:
+                        in_stock = True
+        return "available" if in_stock else None
 
-            try:
-                title = await page.title()
-                if title:
-                    return title.strip()
-            except Exception:
-                pass
+    async def probe_product_api(self):
+        """Poll the captured product API over HTTP instead of loading the page"""
+        if not self.product_api:
+            return None
 
+        headers = dict(self.product_api["headers"])
+        if self.api_cookie_header:
+            headers["Cookie"] = self.api_cookie_header
+
+        try:
+            async with get_http_session().request(
+                self.product_api["method"],
+                self.product_api["url"],
+                data=self.product_api["data"],
+                headers=headers
+            ) as response:
+                if response.status == 429:
+                    try:
+                        self.retry_after = float(response.headers.get("Retry-After", ""))
+                    except ValueError:
+                        self.retry_after = self.max_interval
+                    logger.warning("Product API rate limited - backing off %.0f seconds", self.retry_after)
+                    return None
+                if response.status != 200:
+                    logger.debug("Product API probe returned status %s", response.status)
+                    return None
+                data = await response.json(content_type=None)
+        except Exception as e:
+            logger.debug("Product API probe failed: %s", e)
+            return None
+
+        return self.parse_api_availability(data, self.product_id)
+
+    async def get_product_title(self, page):
+        """Try multiple selectors/meta tags to extract a reliable product title."""
+        try:
+            text = await page.evaluate(_TITLE_JS, TITLE_SELECTORS)
+            if text:
+                return text.strip()
         except Exception:
             # Any unexpected Playwright errors should not crash the watcher
             logger.debug("get_product_title: extraction failed, returning Unknown")
@@ -235,165 +837,81 @@ class ProductWatcher:
     async def check_stock_status(self, page):
         """Check if product is out of stock"""
         try:
-            # Common out of stock indicators
-            out_of_stock_indicators = [
-                "text=Out of Stock",
-                "text=Out of stock",
-                "text=Sold Out",
-                "text=Sold out",
-                "text=Not Available",
-                "text=Not available",
-                "[class*='outofstock' i]",
-                "[class*='out-of-stock' i]",
-                "[class*='soldout' i]",
-                "[class*='sold-out' i]"
-            ]
-            
-            for indicator in out_of_stock_indicators:
-                try:
-                    if await page.is_visible(indicator):
-                        return True
-                except Exception:
-                    continue
-            
-            # Also check if ADD button is disabled
-            try:
-                add_button = await page.query_selector("text=ADD")
-                if add_button:
-                    is_disabled = await add_button.evaluate("el => el.disabled || el.getAttribute('disabled') !== null || el.className.includes('disabled')")
-                    if is_disabled:
-                        return True
-            except Exception:
-                pass
-            
-            return False
+            # All indicators plus the ADD-disabled check are resolved in one page.evaluate round-trip
+            return bool(await page.evaluate(_OUT_OF_STOCK_JS, {
+                "texts": OUT_OF_STOCK_TEXTS,
+                "selectors": OUT_OF_STOCK_SELECTORS
+            }))
         except Exception as e:
-            logger.debug(f"check_stock_status error: {e}")
+            logger.debug("check_stock_status error: %s", e)
             return False
 
     async def get_cart_product_name(self, page):
         """Extract product name from cart view"""
         try:
-            # Try common cart item selectors - including DefaultProductCard pattern from Blinkit
-            selectors = [
-                "[class*='DefaultProductCard__ProductTitle']",  # Main pattern from Blinkit cart
-                ".cart-item-name",
-                ".product-name",
-                "[data-testid='cart-item-name']",
-                ".CartItem__ProductName",
-                ".CartItemCard__ProductName",
-                ".cart-product-title",
-                ".item-name",
-                ".productName",
-                "[class*='ProductTitle']"  # Generic product title class
-            ]
-            
-            for sel in selectors:
-                try:
-                    script = f"() => {{ const el = document.querySelector('{sel}'); return el ? (el.innerText || el.textContent) : null; }}"
-                    text = await page.evaluate(script)
-                    if text:
-                        cleaned = text.strip()
-                        # Avoid returning generic buttons or links
-                        if cleaned and len(cleaned) > 5 and not cleaned.lower() in ['view more details', 'add', 'remove', 'qty']:
-                            return cleaned
-                except Exception:
-                    continue
-            
-            # Try getting product info from cart item container - more flexible approach
-            try:
-                script = """() => {
-                    // Look for DefaultProductCard containers first (most reliable for Blinkit)
-                    let containers = document.querySelectorAll('[class*="DefaultProductCard__Container"]');
-                    
-                    if (containers.length === 0) {
-                        // Fallback to other cart patterns
-                        containers = [
-                            ...document.querySelectorAll('[class*="CartItem"]:not([class*="Divider"])'),
-                            ...document.querySelectorAll('[class*="cart-item"]'),
-                            ...document.querySelectorAll('[data-testid*="cart"]'),
-                        ];
-                    }
-                    
-                    if (containers.length > 0) {
-                        const container = containers[0];
-                        
-                        // Try to find product name in various places
-                        // 1. Look for DefaultProductCard title first (most reliable)
-                        let titleEl = container.querySelector('[class*="DefaultProductCard__ProductTitle"]');
-                        if (titleEl) {
-                            const text = (titleEl.innerText || titleEl.textContent).trim();
-                            if (text && text.length > 5) return text;
-                        }
-                        
-                        // 2. Look for headings
-                        let heading = container.querySelector('h1, h2, h3, h4, h5, h6');
-                        if (heading) {
-                            const text = (heading.innerText || heading.textContent).trim();
-                            if (text && text.length > 5) return text;
-                        }
-                        
-                        // 3. Look for text in strong/bold elements
-                        let strong = container.querySelector('strong, [class*="title"], [class*="name"]');
-                        if (strong) {
-                            const text = (strong.innerText || strong.textContent).trim();
-                            if (text && text.length > 5) return text;
-                        }
-                        
-                        // 4. Get all text and extract first meaningful line
-                        let allText = container.innerText || container.textContent;
-                        if (allText) {
-                            let lines = allText.split('\\n').filter(l => {
-                                const trimmed = l.trim();
-                                return trimmed.length > 10 && !['add', 'remove', 'qty', 'quantity', 'view more details'].includes(trimmed.toLowerCase());
-                            });
-                            if (lines.length > 0) return lines[0].trim();
-                        }
-                    }
-                    return null;
-                }"""
-                text = await page.evaluate(script)
-                if text and text != "null":
-                    return text.strip()
-            except Exception as e:
-                logger.debug(f"Container extraction failed: {e}")
-            
-            # Last resort: try to find any product-related text in the page
-            try:
-                script = """() => {
-                    // Look for DefaultProductCard__ProductTitle first (most reliable)
-                    const titleEls = document.querySelectorAll('[class*="DefaultProductCard__ProductTitle"]');
-                    if (titleEls.length > 0) {
-                        const text = (titleEls[0].innerText || titleEls[0].textContent).trim();
-                        if (text && text.length > 5) return text;
-                    }
-                    
-                    // Look for any element containing product-like text
-                    const allElements = document.querySelectorAll('[class*="product"], [class*="ProductTitle"], [class*="item"], [class*="cart"]');
-                    for (let el of allElements) {
-                        const text = (el.innerText || el.textContent || '').trim();
-                        // Look for text that's likely a product name (reasonable length, not generic words)
-                        if (text.length > 10 && text.length < 500 && 
-                            !['add', 'remove', 'qty', 'quantity', 'view more details'].includes(text.toLowerCase()) &&
-                            !text.match(/^\\d+\\s*(x|\\+|Rs|₹)/i)) {
-                            return text.split('\\n')[0].trim();
-                        }
-                    }
-                    return null;
-                }"""
-                text = await page.evaluate(script)
-                if text and text != "null":
-                    return text.strip()
-            except Exception as e:
-                logger.debug(f"Last resort extraction failed: {e}")
-            
+            text = await page.evaluate(_CART_JS, CART_SELECTORS)
+            if text:
+                return text.strip()
         except Exception as e:
-            logger.debug(f"get_cart_product_name: extraction failed: {e}")
-        
+            logger.debug("get_cart_product_name: extraction failed: %s", e)
+
         return "Unknown"
 
-    def write_status(self, status, details=None):
+    def set_expected_product_name(self, name):
+        """Remember the product name used to verify the page and cart before purchase"""
+        self.expected_product_name = name
+        self._expected_colored = colorize_product(name or "Unknown")
+        self._expected_lower = (name or "").lower()
+        self._name_matcher = None
+
+    def expected_similarity(self, actual):
+        """Similarity ratio (0.0 - 1.0) between the expected product name and actual"""
+        actual = (actual or "").lower()
+        if fuzz is not None:
+            return fuzz.ratio(self._expected_lower, actual) / 100.0
+        if self._name_matcher is None:
+            # difflib indexes the second sequence, so the constant expected name goes there
+            self._name_matcher = difflib.SequenceMatcher(None)
+            self._name_matcher.set_seq2(self._expected_lower)
+        self._name_matcher.set_seq1(actual)
+        return self._name_matcher.ratio()
+
+    def next_poll_interval(self):
+        """Delay before the next check: tight after a status change, exponential back-off while stable, plus jitter"""
+        if self.retry_after:
+            # Server asked us to slow down (HTTP 429 Retry-After)
+            interval, self.retry_after = self.retry_after, None
+            return interval
+        interval = min(self.max_interval, self.min_interval * 2 ** min(self.stable_checks, 16))
+        interval += random.uniform(-self.jitter, self.jitter)
+        return max(1.0, interval)
+
+    @staticmethod
+    def _write_status_file(status_data, status_file=STATUS_FILE):
+        if orjson is not None:
+            snapshot = orjson.dumps(status_data, option=orjson.OPT_INDENT_2)
+            event = orjson.dumps(status_data) + b'\n'
+        else:
+            snapshot = json.dumps(status_data, indent=2).encode()
+            event = json.dumps(status_data, separators=(',', ':')).encode() + b'\n'
+        # Watchers write from worker threads; serialize them and swap the snapshot in whole
+        # so neither they nor the status file readers ever see partial JSON
+        with _status_write_lock:
+            tmp_path = status_file.with_suffix(".tmp")
+            tmp_path.write_bytes(snapshot)
+            os.replace(tmp_path, status_file)
+            with open(EVENTS_FILE, 'ab') as f:
+                f.write(event)
+
+    async def write_status(self, status, details=None):
         """Write status to JSON file"""
+        # Track how long the status has been stable for adaptive polling
+        if status == self.last_status:
+            self.stable_checks += 1
+        else:
+            self.last_status = status
+            self.stable_checks = 0
+
         status_data = {
             "product_url": self.product_url,
             "product_id": self.product_id,
@@ -409,70 +927,96 @@ class ProductWatcher:
         }
         
         try:
-            with open(STATUS_FILE, 'w') as f:
-                json.dump(status_data, f, indent=2)
-            logger.info(f"Status: {status}")
+            # Write off the event loop so disk latency never stalls polling
+            await asyncio.to_thread(self._write_status_file, status_data, self.status_file)
+            logger.info("Status: %s", status)
             return True
         except Exception as e:
-            logger.error(f"Error writing status file: {e}")
+            logger.error("Error writing status file: %s", e)
             return False
 
     async def check_product_status(self):
         """Check if product is available or coming soon"""
         try:
             self.query_count += 1
-            logger.info(f"[CHECK #{self.query_count}] Navigating to product URL...")
-            
-            # Navigate to product URL
+
+            # Cheap HTTP probe first - only fall back to full navigation when the API
+            # indicates availability (or cannot be read)
+            if await self.probe_product_api() == "coming_soon":
+                logger.info("[CHECK #%s] [WAITING] Product API reports Coming Soon - skipping page load", self.query_count)
+                await self.write_status("coming_soon", {
+                    "message": "Product still Coming Soon in your location",
+                    "product_name": self.expected_product_name,
+                    "last_checked": datetime.now().isoformat(),
+                    "source": "api"
+                })
+                return False
+
+            page = self.order.page
             try:
-                await self.order.page.goto(self.product_url, wait_until="domcontentloaded", timeout=30000)
+                # Already on the product page: a reload is cheaper than a fresh navigation
+                if self.product_id and f"prid/{self.product_id}" in page.url:
+                    logger.info("[CHECK #%s] Reloading product page...", self.query_count)
+                    await page.reload(wait_until="domcontentloaded", timeout=30000)
+                else:
+                    logger.info("[CHECK #%s] Navigating to product URL...", self.query_count)
+                    await page.goto(self.product_url, wait_until="domcontentloaded", timeout=30000)
             except Exception as e:
-                logger.warning(f"Navigation took longer: {e}")
+                logger.warning("Navigation took longer: %s", e)
             
-            await asyncio.sleep(2)
+            # Resume as soon as the status-bearing content has rendered instead of a fixed 2s wait
+            try:
+                await page.wait_for_function(_PAGE_READY_JS, timeout=5000)
+            except Exception:
+                logger.debug("Product content not detected within 5s - checking anyway")
+            await self.refresh_api_cookies()
             
             # Get product details from page
             product_name = "Unknown"
+            colored_name = colorize_product(product_name)
             coming_soon_status = "Unknown"
+            is_add_to_cart = False
             
             try:
                 # Extract product name using robust extractor
                 try:
                     product_name = await self.get_product_title(self.order.page)
-                    logger.info(f"[PRODUCT] Name: {colorize_product(product_name)}")
+                    colored_name = colorize_product(product_name)
+                    logger.info("[PRODUCT] Name: %s", colored_name)
                     # Store for verification during purchase if not already set
                     if not self.expected_product_name:
-                        self.expected_product_name = product_name
-                        logger.info(f"[EXPECTED] Remembered product name for verification: {colorize_product(self.expected_product_name)}")
+                        self.set_expected_product_name(product_name)
+                        logger.info("[EXPECTED] Remembered product name for verification: %s", colored_name)
                 except Exception:
                     # Ignore extraction errors and continue to status checks
                     pass
 
-                # Check for "Coming Soon" text
-                if await self.order.page.is_visible("text=Coming Soon"):
+                # Read the rendered page text once and scan for "Coming Soon" / ADD
+                page_status = await self.order.page.evaluate(_PAGE_STATUS_JS)
+                is_add_to_cart = bool(page_status.get("add"))
+                if page_status.get("coming"):
                     coming_soon_status = "Coming Soon"
                 else:
                     coming_soon_status = "Available"
                     
-                logger.info(f"[STATUS] {coming_soon_status}")
+                logger.info("[STATUS] %s", coming_soon_status)
                 
             except Exception as e:
-                logger.warning(f"Error extracting product details: {e}")
+                logger.warning("Error extracting product details: %s", e)
             
             # Check if product is AVAILABLE (no Coming Soon, has ADD button)
             is_coming_soon = coming_soon_status == "Coming Soon"
-            is_add_to_cart = await self.order.page.is_visible("text=ADD")
             
-            logger.info(f"Coming Soon visible: {is_coming_soon}, Add button visible: {is_add_to_cart}")
+            logger.info("Coming Soon visible: %s, Add button visible: %s", is_coming_soon, is_add_to_cart)
             
             if is_add_to_cart and not is_coming_soon:
                 # Product is AVAILABLE
-                logger.info(f"[AVAILABLE] Product {colorize_product(product_name)} is now AVAILABLE!")
+                logger.info("[AVAILABLE] Product %s is now AVAILABLE!", colored_name)
                 
                 # Play alert sound
                 play_alert_sound()
                 
-                self.write_status("available", {
+                await self.write_status("available", {
                     "message": "Product is available for purchase!",
                     "product_name": product_name,
                     "product_id": self.product_id,
@@ -482,8 +1026,8 @@ class ProductWatcher:
                     
             elif is_coming_soon:
                 # Still coming soon
-                logger.info(f"[WAITING] Product {colorize_product(product_name)} is still Coming Soon...")
-                self.write_status("coming_soon", {
+                logger.info("[WAITING] Product %s is still Coming Soon...", colored_name)
+                await self.write_status("coming_soon", {
                     "message": "Product still Coming Soon in your location",
                     "product_name": product_name,
                     "last_checked": datetime.now().isoformat()
@@ -491,17 +1035,93 @@ class ProductWatcher:
                 return False
             else:
                 logger.warning("[UNKNOWN] Could not determine product status")
-                self.write_status("unknown", {
+                await self.write_status("unknown", {
                     "message": "Could not determine if product is available or coming soon",
                     "product_name": product_name
                 })
                 return False
                 
         except Exception as e:
-            logger.error(f"Error checking product: {e}")
-            self.write_status("error", {"error": str(e)})
+            logger.error("Error checking product: %s", e)
+            await self.write_status("error", {"error": str(e)})
             return False
 
+    def attach_page(self, page):
+        """Bind this watcher to a browser page"""
+        self.order = BlinkitOrder(page)
+        # Capture the product XHR on the first page load for HTTP polling
+        page.on("request", self._capture_product_api)
+
+    async def choose_address(self, header_selector, location_selector):
+        """Click the saved address in the open picker and wait for it to be applied, backing off between checks"""
+        page = self.auth.page
+        header_text = await page.inner_text(header_selector)
+        label_count = await page.locator(location_selector).count()
+        await page.click(location_selector)
+        # The header keeps showing the label, so wait for the picker's copy of it to go away
+        # or for the header to switch to the new address
+        for attempt in range(6):
+            if await page.locator(location_selector).count() < label_count:
+                return
+            try:
+                if await page.inner_text(header_selector, timeout=1000) != header_text:
+                    return
+            except Exception:
+                pass
+            await backoff(attempt)
+
+    async def apply_location(self):
+        """Select the saved address via the site UI, or set geolocation when coordinates are given"""
+        # If coordinates not provided, try selecting saved 'Home' address via the location bar UI
+        if not (self.latitude and self.longitude):
+            try:
+                # Selector for the location bar container (two classes)
+                loc_sel = "div.LocationBar__Container-sc-x8ezho-6.gcLVHe"
+                # Fallback: partial class match
+                if await self.auth.page.is_visible(loc_sel):
+                    await self.auth.page.click(loc_sel)
+                    # Look for a saved address labeled per user preference
+                    location_selector = f"text={self.location_label}"
+                    if await is_visible_soon(self.auth.page, location_selector):
+                        await self.choose_address(loc_sel, location_selector)
+                        logger.info("Selected saved address: %s", self.location_label)
+                        # Move cursor to My Cart button to dismiss location selector
+                        if await is_visible_soon(self.auth.page, "text=My Cart"):
+                            await self.auth.page.click("text=My Cart")
+                            await backoff(0)
+                            logger.info("Moved to My Cart")
+                    else:
+                        logger.info("'Home' address not found in location options")
+                else:
+                    # Try a broader selector
+                    try:
+                        broad = "[class*='LocationBar__Container']"
+                        if await self.auth.page.is_visible(broad):
+                            await self.auth.page.click(broad)
+                            location_selector = f"text={self.location_label}"
+                            if await is_visible_soon(self.auth.page, location_selector):
+                                await self.choose_address(broad, location_selector)
+                                logger.info("Selected saved address: %s (broad selector)", self.location_label)
+                                # Move cursor to My Cart button to dismiss location selector
+                                if await is_visible_soon(self.auth.page, "text=My Cart"):
+                                    await self.auth.page.click("text=My Cart")
+                                    await backoff(0)
+                                    logger.info("Moved to My Cart")
+                            else:
+                                logger.info("'Home' address not found after opening location bar")
+                    except Exception:
+                        logger.debug("Broad location selector failed")
+            except Exception as e:
+                logger.warning("Location UI selection failed: %s", e)
+        else:
+            # If coordinates provided, set geolocation in context
+            try:
+                if self.auth.context:
+                    await self.auth.context.set_geolocation({"latitude": self.latitude, "longitude": self.longitude})
+                    await self.auth.context.grant_permissions(["geolocation"])
+            except Exception as e:
+                logger.warning("Failed to set geolocation: %s", e)
+
     async def watch(self, max_checks=None):
         """
         Monitor product until available
@@ -512,88 +1132,34 @@ class ProductWatcher:
         logger.info("=" * 70)
         logger.info("PRODUCT WATCHER - Wait for Coming Soon to be Available")
         logger.info("=" * 70)
-        logger.info(f"Product URL: {self.product_url}")
-        logger.info(f"Check interval: {self.check_interval} seconds")
-        logger.info(f"Max checks: {max_checks if max_checks else 'Unlimited'}")
+        logger.info("Product URL: %s", self.product_url)
+        logger.info("Check interval: %s-%s seconds (adaptive, +/-%ss jitter)", self.min_interval, self.max_interval, self.jitter)
+        logger.info("Max checks: %s", max_checks if max_checks else 'Unlimited')
         logger.info("-" * 70)
         
         # Initialize browser and auth
         try:
             logger.info("Initializing Blinkit authentication...")
             if self.latitude and self.longitude:
-                logger.info(f"Using location: Latitude {self.latitude}, Longitude {self.longitude}")
+                logger.info("Using location: Latitude %s, Longitude %s", self.latitude, self.longitude)
             else:
                 logger.info("No coordinates provided — will select saved address via site UI (Home)")
             self.auth = BlinkitAuth(headless=False)  # Show browser
             await self.auth.start_browser()
 
-            # If coordinates not provided, try selecting saved 'Home' address via the location bar UI
-            if not (self.latitude and self.longitude):
-                try:
-                    # Selector for the location bar container (two classes)
-                    loc_sel = "div.LocationBar__Container-sc-x8ezho-6.gcLVHe"
-                    # Fallback: partial class match
-                    if await self.auth.page.is_visible(loc_sel):
-                        await self.auth.page.click(loc_sel)
-                        await asyncio.sleep(1)
-                        # Look for a saved address labeled per user preference
-                        location_selector = f"text={self.location_label}"
-                        if await self.auth.page.is_visible(location_selector):
-                            await self.auth.page.click(location_selector)
-                            await asyncio.sleep(2)
-                            logger.info(f"Selected saved address: {self.location_label}")
-                            # Move cursor to My Cart button to dismiss location selector
-                            if await self.auth.page.is_visible("text=My Cart"):
-                                await self.auth.page.click("text=My Cart")
-                                await asyncio.sleep(1)
-                                logger.info("Moved to My Cart")
-                        else:
-                            logger.info("'Home' address not found in location options")
-                    else:
-                        # Try a broader selector
-                        try:
-                            broad = "[class*='LocationBar__Container']"
-                            if await self.auth.page.is_visible(broad):
-                                await self.auth.page.click(broad)
-                                await asyncio.sleep(1)
-                                location_selector = f"text={self.location_label}"
-                                if await self.auth.page.is_visible(location_selector):
-                                    await self.auth.page.click(location_selector)
-                                    await asyncio.sleep(2)
-                                    logger.info(f"Selected saved address: {self.location_label} (broad selector)")
-                                    # Move cursor to My Cart button to dismiss location selector
-                                    if await self.auth.page.is_visible("text=My Cart"):
-                                        await self.auth.page.click("text=My Cart")
-                                        await asyncio.sleep(1)
-                                        logger.info("Moved to My Cart")
-                                else:
-                                    logger.info("'Home' address not found after opening location bar")
-                        except Exception:
-                            logger.debug("Broad location selector failed")
-                except Exception as e:
-                    logger.warning(f"Location UI selection failed: {e}")
-            else:
-                # If coordinates provided, set geolocation in context
-                try:
-                    if self.auth.context:
-                        await self.auth.context.set_geolocation({"latitude": self.latitude, "longitude": self.longitude})
-                        await self.auth.context.grant_permissions(["geolocation"])
-                except Exception as e:
-                    logger.warning(f"Failed to set geolocation: {e}")
-            
+            await self.apply_location()
+
             if not await self.auth.is_logged_in():
                 logger.error("Not logged in!")
                 await self.auth.close()
                 return False
             
             logger.info("[OK] Logged in successfully")
-            logger.info(f"[OK] Location set to: Lat {self.latitude}, Lon {self.longitude}")
-            self.order = BlinkitOrder(self.auth.page)
+            logger.info("[OK] Location set to: Lat %s, Lon %s", self.latitude, self.longitude)
+            self.attach_page(self.auth.page)
             
-            # Start Telegram polling if configured
+            # Start Telegram polling (or the webhook, when TELEGRAM_WEBHOOK_URL is set) if configured
             if self.telegram_bot:
-                logger.info("[TELEGRAM] Starting polling for button callbacks...")
-                
                 # Register callback handlers
                 async def on_retry():
                     logger.info("[TELEGRAM] Retry button clicked - will restart watch after current action")
@@ -603,18 +1169,14 @@ class ProductWatcher:
                     logger.info("[TELEGRAM] Cancel button clicked - stopping watch")
                     self.telegram_cancel_event.set()
                 
-                self.telegram_bot.register_callback("retry_watch", on_retry)
-                self.telegram_bot.register_callback("cancel_watch", on_cancel)
-                
-                # Start polling in background
-                self.telegram_bot.polling_task = asyncio.create_task(self.telegram_bot.start_polling())
+                await self.start_telegram_updates(on_retry, on_cancel)
             
         except Exception as e:
-            logger.error(f"Failed to initialize: {e}")
+            logger.error("Failed to initialize: %s", e)
             return False
         
         # Initial status
-        self.write_status("monitoring", {"started_at": datetime.now().isoformat()})
+        await self.write_status("monitoring", {"started_at": datetime.now().isoformat()})
         
         check_num = 0
         start_time = datetime.now()
@@ -624,12 +1186,12 @@ class ProductWatcher:
                 # Check if cancel was requested via Telegram button
                 if self.telegram_cancel_event.is_set():
                     logger.info("[TELEGRAM] Cancel requested - stopping watch")
-                    self.write_status("stopped", {"reason": "Cancelled via Telegram"})
+                    await self.write_status("stopped", {"reason": "Cancelled via Telegram"})
                     return False
                 
                 if max_checks and check_num >= max_checks:
-                    logger.info(f"Max checks ({max_checks}) reached. Stopping.")
-                    self.write_status("stopped", {"reason": "Max checks reached"})
+                    logger.info("Max checks (%s) reached. Stopping.", max_checks)
+                    await self.write_status("stopped", {"reason": "Max checks reached"})
                     return False
                 
                 check_num += 1
@@ -639,7 +1201,7 @@ class ProductWatcher:
                 
                 if is_available:
                     elapsed = datetime.now() - start_time
-                    logger.info(f"[SUCCESS] Product became available after {elapsed} ({check_num} checks)")
+                    logger.info("[SUCCESS] Product became available after %s (%s checks)", elapsed, check_num)
                     
                     # Check if product is in stock before attempting purchase
                     is_out_of_stock = await self.check_stock_status(self.order.page)
@@ -648,19 +1210,20 @@ class ProductWatcher:
                         logger.warning("[OUT OF STOCK] Product is out of stock!")
                         if self.continue_on_out_of_stock:
                             logger.info("[CONTINUE MODE] Product out of stock but continuing to monitor...")
-                            self.write_status("out_of_stock_monitoring", {
+                            await self.write_status("out_of_stock_monitoring", {
                                 "message": "Product went out of stock but continuing to monitor",
                                 "product_name": self.expected_product_name,
                                 "timestamp": datetime.now().isoformat(),
                                 "checks_so_far": check_num
                             })
                             # Wait before next check
-                            logger.info(f"Waiting {self.check_interval} seconds before next check...")
-                            await asyncio.sleep(self.check_interval)
+                            interval = self.next_poll_interval()
+                            logger.info("Waiting %.1f seconds before next check...", interval)
+                            await asyncio.sleep(interval)
                             continue  # Skip auto-purchase and go to next check
                         else:
                             logger.error("[ABORT] Stopping due to product going out of stock")
-                            self.write_status("out_of_stock", {
+                            await self.write_status("out_of_stock", {
                                 "message": "Product went out of stock",
                                 "product_nam e": self.expected_product_name,
                                 "timestamp": datetime.now().isoformat()
@@ -673,27 +1236,28 @@ class ProductWatcher:
                     
                     if success:
                         logger.info("[COMPLETE] Purchase completed!")
-                        self.write_status("purchased", {
+                        await self.write_status("purchased", {
                             "completed_at": datetime.now().isoformat(),
                             "total_checks": check_num
                         })
                         return True
                     else:
                         logger.warning("Auto-purchase failed. Manual intervention needed.")
-                        self.write_status("available", {
+                        await self.write_status("available", {
                             "message": "Product available but auto-purchase failed",
                             "action": "Manual purchase needed"
                         })
                         return False
                 
                 # Wait before next check
-                logger.info(f"Waiting {self.check_interval} seconds before next check...")
-                await asyncio.sleep(self.check_interval)
+                interval = self.next_poll_interval()
+                logger.info("Waiting %.1f seconds before next check...", interval)
+                await asyncio.sleep(interval)
                 
         except KeyboardInterrupt:
             logger.info("\n[STOPPED] Watcher stopped by user")
             elapsed = datetime.now() - start_time
-            self.write_status("stopped", {
+            await self.write_status("stopped", {
                 "reason": "User interrupted",
                 "checks_performed": check_num,
                 "duration": str(elapsed)
@@ -701,9 +1265,16 @@ class ProductWatcher:
             return False
         
         finally:
+            await self.flush_alerts()
+            
             # Stop Telegram polling if running
             if self.telegram_bot and self.telegram_bot.is_polling:
                 await self.telegram_bot.stop_polling()
+            if self.telegram_bot:
+                await self.telegram_bot.stop_webhook()
+                await self.telegram_bot.close()
+            # Closed after Telegram is stopped, since the bot shares this session
+            await close_http_session()
             
             if self.auth:
                 try:
@@ -711,28 +1282,183 @@ class ProductWatcher:
                         await self.auth.close()
                     logger.info("Browser closed")
                 except Exception as e:
-                    logger.debug(f"Browser close error: {e}")
+                    logger.debug("Browser close error: %s", e)
+
+    @classmethod
+    async def watch_many(cls, product_urls, max_concurrency=5, max_checks=None, **kwargs):
+        """
+        Monitor several products from a single browser, one page per product
+        
+        Args:
+            product_urls: List of Blinkit product URLs
+            max_concurrency: Max number of product checks running at once
+            max_checks: Max check rounds before giving up (None = infinite)
+            **kwargs: Passed through to ProductWatcher (latitude, longitude, check_interval, ...)
+        
+        Returns:
+            Dict mapping product URL to True if purchased, False otherwise
+        """
+        kwargs.setdefault("latitude", None)
+        kwargs.setdefault("longitude", None)
+        watchers = [cls(url, **kwargs) for url in product_urls]
+        # Watchers poll concurrently, so each product keeps its own product_status_<product id>.json
+        for i, watcher in enumerate(watchers, 1):
+            suffix = watcher.product_id or str(i)
+            watcher.status_file = STATUS_FILE.with_name(f"{STATUS_FILE.stem}_{suffix}.json")
+        results = {w.product_url: False for w in watchers}
+        if not watchers:
+            return results
+
+        lead = watchers[0]
+        logger.info("=" * 70)
+        logger.info("PRODUCT WATCHER - Watching %s products (max %s concurrent checks)", len(watchers), max_concurrency)
+        logger.info("=" * 70)
+
+        auth = BlinkitAuth(headless=False)  # Show browser
+        try:
+            await auth.start_browser()
+            lead.auth = auth
+            await lead.apply_location()
+
+            if not await auth.is_logged_in():
+                logger.error("Not logged in!")
+                return results
+            logger.info("[OK] Logged in successfully")
+
+            # One shared browser context, one cheap page per product
+            for i, watcher in enumerate(watchers):
+                watcher.auth = auth
+                watcher.attach_page(auth.page if i == 0 else await auth.context.new_page())
+
+            # One bot receives the Retry/Cancel buttons for every product: Retry goes to the product
+            # being purchased, Cancel stops them all
+            purchasing = None
+            if lead.telegram_bot:
+                async def on_retry():
+                    if purchasing is not None:
+                        logger.info("[TELEGRAM] Retry button clicked - restarting watch for %s", purchasing.product_url)
+                        purchasing.telegram_retry_event.set()
+
+                async def on_cancel():
+                    logger.info("[TELEGRAM] Cancel button clicked - stopping all watches")
+                    for watcher in watchers:
+                        watcher.telegram_cancel_event.set()
+
+                await lead.start_telegram_updates(on_retry, on_cancel)
+
+            sem = asyncio.Semaphore(max_concurrency)
+
+            async def check(watcher):
+                async with sem:
+                    return await watcher.check_product_status()
+
+            pending = list(watchers)
+            check_num = 0
+            while pending:
+                if max_checks and check_num >= max_checks:
+                    logger.info("Max checks (%s) reached. Stopping.", max_checks)
+                    break
+                if lead.telegram_cancel_event.is_set():
+                    logger.info("[TELEGRAM] Watch cancelled")
+                    break
+                check_num += 1
+
+                outcomes = await asyncio.gather(*(check(w) for w in pending), return_exceptions=True)
+                for watcher, outcome in zip(list(pending), outcomes):
+                    if isinstance(outcome, Exception):
+                        logger.error("Error checking %s: %s", watcher.product_url, outcome)
+                        continue
+                    if not outcome:
+                        continue
+
+                    # Purchases drive the page through checkout, so run them one at a time
+                    if await watcher.check_stock_status(watcher.order.page):
+                        logger.warning("[OUT OF STOCK] %s is out of stock!", watcher.product_url)
+                        if not watcher.continue_on_out_of_stock:
+                            pending.remove(watcher)
+                        continue
+                    purchasing = watcher
+                    try:
+                        purchased = await watcher.auto_purchase()
+                    finally:
+                        purchasing = None
+                    if watcher.telegram_retry_event.is_set():
+                        # Retry keeps the product on the watch list
+                        watcher.telegram_retry_event.clear()
+                        continue
+                    results[watcher.product_url] = purchased
+                    pending.remove(watcher)
+                    if lead.telegram_cancel_event.is_set():
+                        break
+
+                if pending:
+                    interval = min(w.next_poll_interval() for w in pending)
+                    logger.info("Waiting %.1f seconds before next check...", interval)
+                    await asyncio.sleep(interval)
+        finally:
+            if lead.telegram_bot:
+                if lead.telegram_bot.is_polling:
+                    await lead.telegram_bot.stop_polling()
+                await lead.telegram_bot.stop_webhook()
+            for watcher in watchers:
+                await watcher.flush_alerts()
+                if watcher.telegram_bot:
+                    await watcher.telegram_bot.close()
+            await close_http_session()
+            try:
+                await auth.close()
+                logger.info("Browser closed")
+            except Exception as e:
+                logger.debug("Browser close error: %s", e)
+
+        return results
+
+    async def start_telegram_updates(self, on_retry, on_cancel):
+        """Register the Retry/Cancel button handlers and start receiving updates (webhook if configured, else polling)"""
+        self.telegram_bot.register_callback("retry_watch", on_retry)
+        self.telegram_bot.register_callback("cancel_watch", on_cancel)
+        
+        webhook_url = os.getenv("TELEGRAM_WEBHOOK_URL")
+        webhook_secret = os.getenv("TELEGRAM_WEBHOOK_SECRET")
+        if webhook_url and not webhook_secret:
+            logger.warning("[TELEGRAM] TELEGRAM_WEBHOOK_URL is set without TELEGRAM_WEBHOOK_SECRET - falling back to polling")
+        if not (webhook_url and webhook_secret) or not await self.telegram_bot.start_webhook(
+            webhook_url,
+            secret_token=webhook_secret,
+            host=os.getenv("TELEGRAM_WEBHOOK_HOST", "127.0.0.1"),
+            port=int(os.getenv("TELEGRAM_WEBHOOK_PORT", "8443"))
+        ):
+            # Start polling in background
+            logger.info("[TELEGRAM] Starting polling for button callbacks...")
+            self.telegram_bot.polling_task = asyncio.create_task(self.telegram_bot.start_polling())
+
+    def receiving_telegram_updates(self):
+        """True if Retry/Cancel button presses can reach this watcher (polling or webhook running)"""
+        bot = self.telegram_bot
+        return bool(bot and (bot.is_polling or bot.webhook_runner is not None))
 
     async def auto_purchase(self):
         """Automatically add to cart and proceed to checkout"""
+        page = self.order.page
         try:
             logger.info("Step 1: Verifying product details before adding to cart...")
             
             # Check if telegram bot is configured
             if self.telegram_bot:
-                logger.info(f"[INFO] Telegram bot is configured and ready")
+                logger.info("[INFO] Telegram bot is configured and ready")
             else:
-                logger.info(f"[INFO] Telegram bot is NOT configured")
+                logger.info("[INFO] Telegram bot is NOT configured")
             
             # Verify we have the correct product on screen using fuzzy matching
-            product_name = await self.get_product_title(self.order.page)
-            logger.info(f"[VERIFY] Product on screen: {colorize_product(product_name)}")
+            product_name = await self.get_product_title(page)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("[VERIFY] Product on screen: %s", colorize_product(product_name))
 
             if self.expected_product_name:
-                logger.info(f"[VERIFY] Expected product: {colorize_product(self.expected_product_name)}")
+                logger.info("[VERIFY] Expected product: %s", self._expected_colored)
                 # Compute similarity
-                ratio = difflib.SequenceMatcher(None, (self.expected_product_name or "").lower(), (product_name or "").lower()).ratio()
-                logger.info(f"[MATCH] Similarity ratio: {ratio:.2f}")
+                ratio = self.expected_similarity(product_name)
+                logger.info("[MATCH] Similarity ratio: %.2f", ratio)
 
                 # Decision logic:
                 # - If exact/very close match -> proceed automatically
@@ -742,81 +1468,71 @@ class ProductWatcher:
                     logger.info("[AUTO] Good match (similarity >= 0.90) — proceeding automatically")
                 else:
                     logger.warning("[ABORT] Low-confidence match — aborting auto-purchase to avoid wrong product")
-                    self.write_status("available", {"message": "Aborted due to product name mismatch", "product_name": product_name, "similarity": ratio})
+                    await self.write_status("available", {"message": "Aborted due to product name mismatch", "product_name": product_name, "similarity": ratio})
                     return False
             
             logger.info("Step 2: Adding product to cart...")
             
             # Make sure we're clicking the right ADD button for this product
-            add_selectors = ["text=ADD", "text=Add", ".add-to-cart", "button.add", "button:has-text('Add')"]
-            clicked = False
-            for sel in add_selectors:
+            clicked = await click_first(page, ADD_SELECTORS, "ADD button")
+            if clicked:
                 try:
-                    if await self.order.page.is_visible(sel):
-                        await self.order.page.click(sel)
-                        await asyncio.sleep(2)
-                        logger.info(f"[OK] Clicked ADD selector: {sel}")
-                        clicked = True
-                        break
+                    await page.wait_for_selector("text=My Cart", state="visible", timeout=5000)
                 except Exception:
-                    continue
+                    logger.debug("Cart button did not appear after ADD")
 
             if not clicked:
                 logger.error("ADD button not found with known selectors")
                 return False
             
             logger.info("Step 3: Opening cart...")
-            # Navigate to cart or open cart drawer
-            if await self.order.page.is_visible("text=My Cart"):
-                await self.order.page.click("text=My Cart")
-                await asyncio.sleep(2)
-                logger.info("[OK] Cart opened")
+            # Open the cart drawer once through whichever cart button is on the page
+            # (clicking a second cart button would toggle the drawer closed again)
+            if await click_first(page, CART_BUTTON_SELECTORS, "cart button", timeout=3000):
+                try:
+                    await any_of(page, CART_READY_SELECTORS).wait_for(state="visible", timeout=5000)
+                except Exception:
+                    logger.debug("Cart items did not render after opening the cart")
+            else:
+                logger.warning("Could not click cart button")
             
             logger.info("Step 3a: Verifying product in cart...")
             # Extract product name from cart and verify it matches expected product
-            cart_product_name = await self.get_cart_product_name(self.order.page)
-            logger.info(f"[CART] Product in cart: {colorize_product(cart_product_name)}")
+            cart_product_name = await self.get_cart_product_name(page)
+            cart_colored = colorize_product(cart_product_name)
+            logger.info("[CART] Product in cart: %s", cart_colored)
             
             if self.expected_product_name and cart_product_name != "Unknown":
-                logger.info(f"[VERIFY] Expected product: {colorize_product(self.expected_product_name)}")
+                logger.info("[VERIFY] Expected product: %s", self._expected_colored)
                 # Compute similarity
-                ratio = difflib.SequenceMatcher(None, (self.expected_product_name or "").lower(), (cart_product_name or "").lower()).ratio()
-                logger.info(f"[MATCH] Cart product similarity ratio: {ratio:.2f}")
+                ratio = self.expected_similarity(cart_product_name)
+                logger.info("[MATCH] Cart product similarity ratio: %.2f", ratio)
                 
                 if ratio < 0.90:
-                    logger.warning(f"[MISMATCH] Product in cart does not match expected product!")
-                    logger.info(f"[MISMATCH] Cart product similarity ratio: {ratio:.2f}")
-                    logger.warning(f"Expected {colorize_product(self.expected_product_name)} but found {colorize_product(cart_product_name)} (similarity={ratio:.2f})")
+                    logger.warning("[MISMATCH] Product in cart does not match expected product!")
+                    logger.info("[MISMATCH] Cart product similarity ratio: %.2f", ratio)
+                    logger.warning("Expected %s but found %s (similarity=%.2f)", self._expected_colored, cart_colored, ratio)
                     logger.info("Proceeding to checkout anyway (auto-mode)")
                 else:
-                    logger.info(f"[OK] Cart product matches expected product (similarity={ratio:.2f})")
+                    logger.info("[OK] Cart product matches expected product (similarity=%.2f)", ratio)
             
             # Send Telegram notification only after product is verified to be correct
             if self.telegram_bot:
                 logger.info("Step 3b: Sending Telegram notification with action buttons...")
                 product_name = self.expected_product_name or cart_product_name or "Unknown Product"
-                
-                try:
-                    telegram_success = await self.telegram_bot.send_product_notification(
-                        product_name=product_name,
-                        product_url=self.product_url,
-                        location_name=self.location_label,
-                        with_buttons=True
-                    )
-                    
-                    if telegram_success:
-                        logger.info("[OK] Telegram notification with buttons sent successfully")
-                        logger.info("[INFO] User can now click 'Retry' button to restart the watch process")
-                    else:
-                        logger.warning("[WARN] Telegram notification failed to send")
-                except Exception as e:
-                    logger.error(f"[ERROR] Telegram notification error: {e}")
+                self.queue_alert(
+                    "available",
+                    product_name=product_name,
+                    product_url=self.product_url,
+                    location_name=self.location_label,
+                    with_buttons=True
+                )
             
             logger.info("[SUCCESS] Product successfully added to cart!")
             print("\n" + "=" * 70)
             print("✓ PRODUCT ADDED TO CART")
             print("=" * 70)
-            print(f"Product: {colorize_product(cart_product_name)}")
+            print(f"Product: {cart_colored}")
             print("=" * 70)
             
             # Check if user wants to automate checkout
@@ -826,60 +1542,32 @@ class ProductWatcher:
                 print("Awaiting Telegram callback (Retry/Cancel) or manual completion...")
                 print("=" * 70 + "\n")
                 
-                self.write_status("added_to_cart", {
+                await self.write_status("added_to_cart", {
                     "message": "Product successfully added to cart",
                     "product_name": cart_product_name,
                     "added_at": datetime.now().isoformat()
                 })
                 
+                # A bot that receives no updates can never deliver Retry/Cancel, so don't wait for one
+                if self.telegram_bot and not self.receiving_telegram_updates():
+                    logger.info("[TELEGRAM] Not receiving button callbacks - leaving checkout to you")
+                    return True
+                
                 # Wait for Telegram callbacks (retry or cancel)
-                # Check every 5 seconds for Telegram events
                 max_wait_time = 600  # 10 minutes max wait
-                elapsed = 0
-                
-                while elapsed < max_wait_time:
-                    # Check if user clicked Retry button
-                    if self.telegram_retry_event.is_set():
-                        logger.info("[TELEGRAM] Retry button clicked - restarting watch")
-                        return False
-                    
-                    # Check if user clicked Cancel button
-                    if self.telegram_cancel_event.is_set():
-                        logger.info("[TELEGRAM] Cancel button clicked - stopping watch")
-                        return False
-                    
-                    await asyncio.sleep(5)
-                    elapsed += 5
+                action = await self.wait_for_callback(max_wait_time)
+                if action == "retry":
+                    logger.info("[TELEGRAM] Retry button clicked - restarting watch")
+                    return False
+                if action == "cancel":
+                    logger.info("[TELEGRAM] Cancel button clicked - stopping watch")
+                    return False
                 
                 logger.info("[INFO] Max wait time reached - assuming manual payment completion")
                 return True
             
             logger.info("[USER] Proceeding with automated checkout steps")
             
-            logger.info("Step 4: Clicking on cart button to open cart drawer...")
-            # Click on the cart button with class CartButton__Container-sc-1fuy2nj-3 eOczDn
-            cart_button_selectors = [
-                ".CartButton__Container-sc-1fuy2nj-3",
-                "[class*='CartButton__Container']",
-                "button[class*='CartButton']"
-            ]
-            
-            cart_button_clicked = False
-            for sel in cart_button_selectors:
-                try:
-                    if await self.order.page.is_visible(sel):
-                        await self.order.page.click(sel)
-                        await asyncio.sleep(2)
-                        logger.info(f"[OK] Clicked cart button: {sel}")
-                        cart_button_clicked = True
-                        break
-                except Exception as e:
-                    logger.debug(f"Cart button selector {sel} failed: {e}")
-                    continue
-            
-            if not cart_button_clicked:
-                logger.warning("Could not click cart button")
-            
             # Check for Telegram retry/cancel interrupts
             if self.telegram_cancel_event.is_set():
                 logger.info("[TELEGRAM] Cancel requested - stopping checkout")
@@ -888,54 +1576,42 @@ class ProductWatcher:
                 logger.info("[TELEGRAM] Retry requested - aborting checkout")
                 return False
             
-            logger.info("Step 5: Clicking Proceed to pay button to go to checkout...")
+            logger.info("Step 4: Clicking Proceed to pay button to go to checkout...")
             
             # Scroll down to ensure the Proceed to pay button is visible
             try:
-                await self.order.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await asyncio.sleep(1)
+                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
                 logger.info("[OK] Scrolled to bottom of page")
             except Exception as e:
-                logger.debug(f"Scroll failed: {e}")
+                logger.debug("Scroll failed: %s", e)
             
             # Click "Proceed to pay" button which redirects to checkout
-            # Try various selectors for the button
-            proceed_to_pay_selectors = [
-                "button:has-text('Proceed to Pay')",
-            ]
-
-            proceed_clicked = False
-            for sel in proceed_to_pay_selectors:
-                try:
-                    if await self.order.page.is_visible(sel):
-                        # Scroll the element into view before clicking
-                        await self.order.page.locator(sel).first.scroll_into_view_if_needed()
-                        await asyncio.sleep(0.5)
-                        await self.order.page.click(sel)
-                        await asyncio.sleep(3)
-                        logger.info(f"[OK] Clicked: {sel}")
-                        proceed_clicked = True
-                        break
-                except Exception as e:
-                    logger.debug(f"Selector {sel} failed: {e}")
-                    continue
+            # Scroll the element into view before clicking; click() itself waits for
+            # the button to be visible and stable, so no settle delay is needed
+            proceed_clicked = await click_first(page, PROCEED_TO_PAY_SELECTORS, "Proceed to Pay", scroll=True)
 
             if not proceed_clicked:
                 logger.warning("Could not click Proceed to pay button - trying to find all buttons on page")
+            # The button dump is diagnostic only; skip the page round-trip when INFO is not logged
+            if not proceed_clicked and logger.isEnabledFor(logging.INFO):
                 # Try to find any button with payment-related text
                 try:
-                    all_buttons = await self.order.page.query_selector_all("button")
-                    logger.info(f"[DEBUG] Found {len(all_buttons)} buttons on page")
-                    for i, btn in enumerate(all_buttons):
-                        btn_text = await btn.text_content()
-                        logger.info(f"[DEBUG] Button {i}: {btn_text}")
+                    button_texts = await page.evaluate(_BUTTON_TEXTS_JS)
+                    logger.info("[DEBUG] Found %s buttons on page", len(button_texts))
+                    for i, btn_text in enumerate(button_texts):
+                        logger.info("[DEBUG] Button %s: %s", i, btn_text)
                 except Exception as e:
-                    logger.debug(f"Could not enumerate buttons: {e}")
+                    logger.debug("Could not enumerate buttons: %s", e)
 
             # Wait for redirect and ensure we're on checkout page
-            await asyncio.sleep(2)
-            current_url = self.order.page.url
-            logger.info(f"Current page URL: {current_url}")
+            if proceed_clicked:
+                try:
+                    # The checkout buttons are server-rendered, so DOM ready is enough - no need to wait for images/XHR
+                    await page.wait_for_url("**/checkout**", wait_until="domcontentloaded", timeout=15000)
+                except Exception:
+                    logger.warning("Checkout page did not load after Proceed to Pay")
+            current_url = page.url
+            logger.info("Current page URL: %s", current_url)
             
             # Check for Telegram retry/cancel interrupts before payment
             if self.telegram_cancel_event.is_set():
@@ -945,33 +1621,9 @@ class ProductWatcher:
                 logger.info("[TELEGRAM] Retry requested - aborting checkout before payment")
                 return False
 
-            logger.info("Step 6: Selecting Cash payment method...")
+            logger.info("Step 5: Selecting Cash payment method...")
             # Try common selectors for Cash / COD payment option
-            # Based on HTML: <div role="button" aria-label="Cash" title="Cash">
-            cash_selectors = [
-                "[aria-label='Cash']",
-                "div[role='button'][aria-label='Cash']",
-                "[title='Cash']",
-                "h5:has-text('Cash')",
-                "text=Cash",
-                "[class*='cod']",
-                "[class*='cash']"
-            ]
-
-            cash_clicked = False
-            for sel in cash_selectors:
-                try:
-                    if await self.order.page.is_visible(sel):
-                        await self.order.page.click(sel)
-                        await asyncio.sleep(1)
-                        logger.info(f"[OK] Selected payment option: {sel}")
-                        cash_clicked = True
-                        break
-                except Exception as e:
-                    logger.debug(f"Cash selector {sel} failed: {e}")
-                    continue
-
-            if not cash_clicked:
+            if not await click_first(page, CASH_SELECTORS, "Cash payment option"):
                 logger.warning("Could not automatically select Cash payment option")
             
             # Check for Telegram retry/cancel interrupts before final payment
@@ -982,58 +1634,67 @@ class ProductWatcher:
                 logger.info("[TELEGRAM] Retry requested - aborting before payment")
                 return False
 
-            logger.info("Step 7: Clicking Pay Now button...")
+            logger.info("Step 6: Clicking Pay Now button...")
             # Try to click Pay Now / Pay now button
-            pay_selectors = [
-                "button:has-text('Pay Now')",
-                "button:has-text('Pay now')",
-                "text=Pay Now",
-                "text=Pay now",
-                "button:has-text('Place Order')",
-                "text=Place Order"
-            ]
-
-            pay_clicked = False
-            for sel in pay_selectors:
-                try:
-                    if await self.order.page.is_visible(sel):
-                        await self.order.page.click(sel)
-                        await asyncio.sleep(2)
-                        logger.info(f"[OK] Clicked payment button: {sel}")
-                        pay_clicked = True
-                        break
-                except Exception:
-                    continue
-
-            if not pay_clicked:
+            if not await click_first(page, PAY_SELECTORS, "payment button"):
                 logger.warning("Pay button not found — please complete payment manually on the checkout page")
-                # Give user some time to complete manual payment, but check for Telegram interrupts every 5 seconds
-                logger.info("Waiting 120 seconds for you to complete payment manually...")
-                for wait_iteration in range(24):  # 24 * 5 = 120 seconds
-                    # Check for Telegram retry/cancel before continuing wait
-                    if self.telegram_cancel_event.is_set():
-                        logger.info("[TELEGRAM] Cancel requested - stopping during manual payment wait")
-                        return False
-                    if self.telegram_retry_event.is_set():
-                        logger.info("[TELEGRAM] Retry requested - aborting manual payment wait")
-                        return False
-                    
-                    await asyncio.sleep(5)  # Wait 5 seconds before next check
+                # Give user up to 120 seconds to complete manual payment, returning as soon as the
+                # order is confirmed or a Telegram interrupt arrives
+                logger.info("Waiting up to 120 seconds for you to complete payment manually...")
+                action = await self.wait_for_callback(
+                    120, page.wait_for_selector("text=Order placed", timeout=120000)
+                )
+                if action == "cancel":
+                    logger.info("[TELEGRAM] Cancel requested - stopping during manual payment wait")
+                    return False
+                if action == "retry":
+                    logger.info("[TELEGRAM] Retry requested - aborting manual payment wait")
+                    return False
             else:
-                logger.info("Payment button clicked; waiting briefly for confirmation...")
-                await asyncio.sleep(5)
+                logger.info("Payment button clicked; waiting for order confirmation...")
+                try:
+                    await page.wait_for_selector("text=Order placed", timeout=30000)
+                    logger.info("[OK] Order placed")
+                except Exception:
+                    logger.warning("Order confirmation not detected within 30 seconds")
 
             logger.info("[SUCCESS] Checkout steps attempted/completed")
             return True
             
         except Exception as e:
-            logger.error(f"Auto-purchase error: {e}")
+            logger.error("Auto-purchase error: %s", e)
             return False
+        finally:
+            # The Telegram alert is sent in the background while checkout continues;
+            # make sure it has gone out before reporting the purchase result
+            await self.flush_alerts(timeout=10)
+
+
 
+def parse_args(argv=None):
+    """Parse command line options; anything not given falls back to a prompt or default"""
+    parser = argparse.ArgumentParser(description="Watch a Blinkit product and auto-purchase when available")
+    parser.add_argument("--product-url", help="Blinkit product URL to watch")
+    parser.add_argument("--product-urls", help="Comma-separated product URLs to watch concurrently in one browser")
+    parser.add_argument("--max-concurrency", type=int, default=5, help="Max product checks running at once with --product-urls (default 5)")
+    parser.add_argument("--location", help="Saved address label to select (default 'Home')")
+    parser.add_argument("--interval", type=int, help="Maximum seconds between checks (default 30)")
+    parser.add_argument("--min-interval", type=int, default=5, help="Seconds between checks right after a status change (default 5)")
+    parser.add_argument("--continue-oos", action="store_true", help="Keep refreshing if the product goes out of stock")
+    parser.add_argument("--automate-checkout", action="store_true", help="Proceed through checkout automatically")
+    return parser.parse_args(argv)
 
 
-async def main():
+async def main(argv=None):
     """Main entry point"""
+    args = parse_args(argv)
+    if argv is None:
+        argv = sys.argv[1:]
+    # Prompt only for a bare interactive run; scripted runs use the options and defaults without blocking on stdin
+    interactive = not argv and sys.stdin.isatty()
+    if not (args.product_url or args.product_urls) and not interactive:
+        logger.error("--product-url or --product-urls is required when not running interactively")
+        sys.exit(2)
     
     # Ask user for product URL and location
     print("\n" + "=" * 70)
@@ -1046,55 +1707,84 @@ async def main():
     print("\nExample URL: https://blinkit.com/prn/x/prid/746548")
     print("-" * 70)
     
-    product_url = input("\nEnter product URL: ").strip()
-    
-    if not product_url.startswith("http"):
-        logger.error("Invalid URL. Must start with http")
-        return
-    
-    if "blinkit.com" not in product_url:
-        logger.error("Invalid URL. Must be a Blinkit product URL")
-        return
+    product_urls = [args.product_url] if args.product_url else []
+    if args.product_urls:
+        product_urls += [url.strip() for url in args.product_urls.split(",") if url.strip()]
+    if not product_urls:
+        product_urls = [input("\nEnter product URL: ").strip()]
+
+    for product_url in product_urls:
+        if not product_url.startswith("http"):
+            logger.error("Invalid URL. Must start with http")
+            return
+
+        if "blinkit.com" not in product_url:
+            logger.error("Invalid URL. Must be a Blinkit product URL")
+            return
+    product_url = product_urls[0]
     
     # Use site UI to select saved address instead of asking for coordinates
     print("\nUsing site UI to select a saved address via the site UI. No latitude/longitude input required.")
 
-    # Ask for the saved-address label to select (default: Home)
-    location_label = input("\nEnter saved address label to select (default 'Home'): ").strip() or "Home"
+    location_label = args.location or "Home"
+    check_interval = args.interval or 30
+    continue_on_oos = args.continue_oos
+    automate_checkout = args.automate_checkout
 
-    # Ask for check interval
-    try:
-        check_interval = int(input("\nEnter check interval in seconds (default 30): ").strip() or "30")
-    except ValueError:
-        check_interval = 30
+    if interactive:
+        # Ask for the saved-address label to select (default: Home)
+        location_label = input("\nEnter saved address label to select (default 'Home'): ").strip() or "Home"
 
-    # Ask if user wants to keep monitoring even if product goes out of stock
-    continue_on_oos = input("\nContinue refreshing if product goes out of stock? (y/N): ").strip().lower() in ('y', 'yes')
+        # Ask for check interval
+        try:
+            check_interval = int(input("\nEnter check interval in seconds (default 30): ").strip() or "30")
+        except ValueError:
+            check_interval = 30
+
+        # Ask if user wants to keep monitoring even if product goes out of stock
+        continue_on_oos = input("\nContinue refreshing if product goes out of stock? (y/N): ").strip().lower() in ('y', 'yes')
 
-    # Ask if user wants to automate checkout steps (ask once, applies to all retries)
-    automate_checkout = input("\nAutomate checkout steps (Proceed to Pay, Select Payment, Pay Now)? (y/N): ").strip().lower() in ('y', 'yes')
+        # Ask if user wants to automate checkout steps (ask once, applies to all retries)
+        automate_checkout = input("\nAutomate checkout steps (Proceed to Pay, Select Payment, Pay Now)? (y/N): ").strip().lower() in ('y', 'yes')
 
     # Load Telegram credentials from environment variables
     telegram_bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
     telegram_channel_id = os.getenv("TELEGRAM_CHANNEL_ID")
 
-    logger.info(f"Product URL: {product_url}")
-    logger.info(f"Location: using site-saved address ('{location_label}') via UI")
-    logger.info(f"Check interval: {check_interval} seconds")
-    logger.info(f"Continue on out-of-stock: {'YES - will keep refreshing' if continue_on_oos else 'NO - will stop'}")
-    logger.info(f"Automate checkout: {'YES - will auto proceed through checkout' if automate_checkout else 'NO - will stop after adding to cart'}")
+    logger.info("Product URL(s): %s", ", ".join(product_urls))
+    logger.info("Location: using site-saved address ('%s') via UI", location_label)
+    logger.info("Check interval: %s seconds", check_interval)
+    logger.info("Continue on out-of-stock: %s", 'YES - will keep refreshing' if continue_on_oos else 'NO - will stop')
+    logger.info("Automate checkout: %s", 'YES - will auto proceed through checkout' if automate_checkout else 'NO - will stop after adding to cart')
     if telegram_bot_token and telegram_channel_id:
-        logger.info(f"Telegram notifications: ENABLED (Channel: {telegram_channel_id})")
+        logger.info("Telegram notifications: ENABLED (Channel: %s)", telegram_channel_id)
     else:
         logger.info("Telegram notifications: DISABLED (set TELEGRAM_BOT_TOKEN and TELEGRAM_CHANNEL_ID in .env)")
 
+    if len(product_urls) > 1:
+        # Several products: one browser, one page per product, checked concurrently
+        results = await ProductWatcher.watch_many(
+            product_urls,
+            max_concurrency=args.max_concurrency,
+            check_interval=check_interval,
+            location_label=location_label,
+            continue_on_out_of_stock=continue_on_oos,
+            telegram_bot_token=telegram_bot_token,
+            telegram_channel_id=telegram_channel_id,
+            automate_checkout=automate_checkout,
+            min_interval=args.min_interval
+        )
+        for url, purchased in results.items():
+            logger.info("%s %s", '[SUCCESS]' if purchased else '[INFO] Not purchased:', url)
+        return
+
     # Run watcher in a loop to support retry via Telegram
     retry_count = 0
     while True:
-        logger.info(f"\n{'='*70}")
+        logger.info("\n%s", '='*70)
         if retry_count > 0:
-            logger.info(f"RETRY #{retry_count} - Starting new watch cycle with same parameters")
-        logger.info(f"{'='*70}\n")
+            logger.info("RETRY #%s - Starting new watch cycle with same parameters", retry_count)
+        logger.info("%s\n", '='*70)
         
         # Start watching (no coordinates provided — watcher will try to select given saved address)
         watcher = ProductWatcher(
@@ -1106,7 +1796,8 @@ async def main():
             continue_on_oos,
             telegram_bot_token=telegram_bot_token,
             telegram_channel_id=telegram_channel_id,
-            automate_checkout=automate_checkout
+            automate_checkout=automate_checkout,
+            min_interval=args.min_interval
         )
         success = await watcher.watch(max_checks=None)  # Infinite checks
         
@@ -1120,7 +1811,7 @@ async def main():
             if watcher.telegram_retry_event.is_set():
                 logger.info("[TELEGRAM] Retry button clicked - automatically restarting watch cycle")
                 retry_count += 1
-                logger.info(f"Restarting watch cycle (Retry #{retry_count})...")
+                logger.info("Restarting watch cycle (Retry #%s)...", retry_count)
                 watcher.telegram_retry_event.clear()  # Clear the event for next cycle
                 await asyncio.sleep(2)  # Brief pause before restart
                 continue
@@ -1132,10 +1823,13 @@ async def main():
                 break
             
             # Otherwise, ask user if they want to retry (terminal fallback)
+            if not interactive:
+                logger.info("Not running interactively - exiting.")
+                break
             retry_choice = input("\nWould you like to retry watching this product? (y/N): ").strip().lower()
             if retry_choice in ('y', 'yes'):
                 retry_count += 1
-                logger.info(f"Restarting watch cycle (Retry #{retry_count})...")
+                logger.info("Restarting watch cycle (Retry #%s)...", retry_count)
                 await asyncio.sleep(2)  # Brief pause before restart
                 continue
             else:
@@ -1143,9 +1837,19 @@ async def main():
                 break
 
 
+def run():
+    """Run main() on uvloop when it is installed, otherwise on the default event loop"""
+    if uvloop is None:
+        return asyncio.run(main())
+    if sys.version_info >= (3, 12):
+        return asyncio.run(main(), loop_factory=uvloop.new_event_loop)
+    uvloop.install()
+    return asyncio.run(main())
+
+
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run()
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         sys.exit(1)
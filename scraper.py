@@ -4,27 +4,219 @@ Blinkit Product Web Scraper
 - Crawl product URLs from 70000 to 79999
 - Extract product name and price
 - Filter products containing "hot wheels" keyword
-- Export results to Excel
+- Append results to a CSV store and export them to Excel
 """
 
 import asyncio
-import pandas as pd
+import csv
+import html
+import json
+import re
 import sys
 import os
-from datetime import datetime
+import time
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
+
+try:
+    import xlsxwriter
+except ImportError:  # Fall back to openpyxl for writing the workbook
+    xlsxwriter = None
+
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.auth import BlinkitAuth
-from src.order.blinkit_order import BlinkitOrder
 
 # Output file - fixed filename for incremental updates
 def get_output_filename():
     return Path("blinkit_products.xlsx")
 
+# Append-only CSV holding every scraped product; the Excel file is rebuilt from it on export
+def get_store_filename():
+    return Path("blinkit_products.csv")
+
+COLUMNS = ['Product ID', 'Product Name', 'Price', 'Image URL']
+
+# Product page URL is this prefix followed by the product ID
+PRODUCT_URL_PREFIX = "https://blinkit.com/prn/x/prid/"
+
+# IDs that had no product page, with the time they were checked; skipped until NOT_FOUND_TTL passes
+NOT_FOUND_FILE = Path("blinkit_not_found.json")
+NOT_FOUND_TTL = 7 * 24 * 3600
+
+# Product name fallbacks, tried after Blinkit's own title selector and the og:title meta tag
+NAME_SELECTORS = ["h1", ".product-title", ".productName", "[data-testid='product-title']", "[class*='ProductName']"]
+
+# Common price selectors, tried before the ₹ amount regex over the page text
+PRICE_SELECTORS = [
+    ".product-price",
+    "[class*='Price']",
+    "[class*='price']",
+    "[data-testid='product-price']"
+]
+
+# Any of these being in the DOM means the product page has rendered enough to extract
+READY_SELECTOR = ".tw-text-500.tw-font-extrabold.tw-line-clamp-50, meta[property='og:title'], h1"
+
+# Extracts everything get_product_info needs in a single page.evaluate call;
+# selector lists are passed as arguments rather than interpolated into the script
+EXTRACT_JS = """({nameSelectors, priceSelectors}) => {
+    const textOf = (sel) => {
+        const el = document.querySelector(sel);
+        return el ? (el.innerText || el.textContent) : null;
+    };
+    const bodyText = document.documentElement.innerText || '';
+    const result = {textLength: bodyText.length, name: null, nameSource: null, image: null, price: null, priceSource: null};
+
+    // Name: Blinkit's specific selector, then the meta tag, then generic selectors
+    result.name = textOf('.tw-text-500.tw-font-extrabold.tw-line-clamp-50');
+    if (result.name) {
+        result.nameSource = 'specific selector';
+    } else {
+        const meta = document.querySelector("meta[property='og:title']");
+        result.name = meta ? meta.getAttribute('content') : null;
+        if (result.name) {
+            result.nameSource = 'meta';
+        } else {
+            for (const sel of nameSelectors) {
+                result.name = textOf(sel);
+                if (result.name) {
+                    result.nameSource = 'selector ' + sel;
+                    break;
+                }
+            }
+        }
+    }
+
+    // Image from ProductCarousel__ImageContainer
+    const container = document.querySelector('[class*="ProductCarousel__ImageContainer"]');
+    const img = container && container.querySelector('img');
+    if (img && img.src) result.image = img.src;
+
+    // Price: known selectors; otherwise hand back the page text for PRICE_RE in Python
+    for (const sel of priceSelectors) {
+        result.price = textOf(sel);
+        if (result.price) {
+            result.priceSource = 'selector ' + sel;
+            break;
+        }
+    }
+    if (!result.price) result.bodyText = bodyText.slice(0, 20000);
+    return result;
+}"""
+
+# First rupee amount in a page's text, used when no price selector matches
+PRICE_RE = re.compile(r"₹\s*\d+(?:,\d+)*")
+
+def meta_property_re(prop):
+    """
+    Regex for the content of a <meta property=prop> tag
+    
+    Attribute order varies, so both orders are matched. Each value runs to the quote it was opened
+    with, so a double-quoted title may contain apostrophes. The content is group 3 or group 5.
+    """
+    prop = re.escape(prop)
+    return re.compile(
+        rf"""<meta[^>]+(?:property=(["']){prop}\1[^>]*content=(["'])((?:(?!\2).)*)\2"""
+        rf"""|content=(["'])((?:(?!\4).)*)\4[^>]*property=(["']){prop}\6)""",
+        re.IGNORECASE | re.DOTALL
+    )
+
+def meta_content(match):
+    """Unescaped content of a meta_property_re() match, or "" if there was no match"""
+    if not match:
+        return ""
+    return html.unescape(match.group(3) if match.group(3) is not None else match.group(5)).strip()
+
+# Server-rendered HTML fields read by the HTTP fast path
+OG_TITLE_RE = meta_property_re("og:title")
+OG_IMAGE_RE = meta_property_re("og:image")
+PRICE_AMOUNT_RE = meta_property_re("product:price:amount")
+
+# Next.js page data: the build ID in the inline __NEXT_DATA__ script unlocks the per-page JSON endpoint
+NEXT_DATA_RE = re.compile(r'<script[^>]+id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.DOTALL)
+NEXT_DATA_URL = "https://blinkit.com/_next/data/{build_id}/prn/x/prid/{product_id}.json"
+
+# Keys a product record may use for its ID, price and image in the JSON page data
+ID_KEYS = ("id", "prid", "product_id", "productId")
+PRICE_KEYS = ("price", "selling_price", "offer_price", "mrp")
+IMAGE_KEYS = ("image_url", "image", "images", "thumbnail")
+
+def loads_json(data):
+    """Parse JSON text or bytes with orjson when available"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def find_product_fields(data, product_id):
+    """
+    Search JSON page data for the record of product_id
+    
+    Only objects whose id/prid/product_id is product_id are considered, so related and
+    recommended products elsewhere in the page data are ignored.
+    
+    Returns:
+        (product_name, price, image_url), or (None, None, None) if no such object has both a name and a price
+    """
+    product_id = str(product_id)
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+        stack.extend(reversed(list(node.values())))
+        if not any(str(node.get(key)) == product_id for key in ID_KEYS if node.get(key) is not None):
+            continue
+        name = node.get("name")
+        price = next((node[key] for key in PRICE_KEYS if node.get(key) not in (None, "")), None)
+        if isinstance(name, str) and name.strip() and price is not None:
+            if isinstance(price, (int, float)):
+                price = f"₹{price:g}"
+            image = next((node[key] for key in IMAGE_KEYS if node.get(key)), "N/A")
+            if isinstance(image, list):
+                image = image[0]
+            if isinstance(image, dict):
+                image = image.get("url") or image.get("image_url") or "N/A"
+            return name.strip(), str(price).strip(), str(image)
+    return None, None, None
+
+# Give up on the HTTP fast path after this many misses without a single hit (page is client-rendered)
+FAST_PATH_MAX_MISSES = 5
+
+# Resource types the scraper never reads; image URLs come from the img src attribute, not the download
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+# HTTP statuses that mean the server wants us to slow down; the product is retried after a shared pause
+THROTTLE_STATUSES = frozenset({429, 503})
+THROTTLE_RETRIES = 3
+THROTTLE_BACKOFF = 2.0
+
+class RateLimited(Exception):
+    """Raised when a product request is answered with one of THROTTLE_STATUSES"""
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+# HTTP statuses that mean the product page really does not exist
+NOT_FOUND_STATUSES = frozenset({404, 410})
+
+class ScrapeFailed(Exception):
+    """Raised when a product page could not be loaded or read, as opposed to the page saying there is no product"""
+
+async def block_heavy_resources(route):
+    """Playwright route handler that aborts requests for BLOCKED_RESOURCE_TYPES"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
 class ProductScraper:
-    def __init__(self, start_id=746500, end_id=747000, keyword_filter="hot wheels"):
+    def __init__(self, start_id=746500, end_id=747000, keyword_filter="hot wheels", concurrency=8, export_xlsx=True, rescrape_known=False):
         """
         Initialize the product scraper
         
@@ -32,19 +224,176 @@ class ProductScraper:
             start_id: Starting product ID (default 70000)
             end_id: Ending product ID (default 79999)
             keyword_filter: Keyword to filter products (e.g., "hot wheels")
+            concurrency: Number of browser tabs scraping in parallel (default 8)
+            export_xlsx: Rebuild the Excel file from the CSV store after scraping (default True)
+            rescrape_known: Also scrape IDs already in the store or recently not found (default False)
         """
         self.start_id = start_id
         self.end_id = end_id
         self.keyword_filter = keyword_filter.lower()
-        self.products = []
+        self.concurrency = max(1, concurrency)
+        # Try a plain HTTP fetch of the server-rendered page before driving the browser
+        self.use_fast_path = True
+        self.fast_path_hits = 0
+        self.fast_path_misses = 0
+        # Next.js build ID for the JSON page data endpoint: None until checked, "" when the site isn't Next.js
+        self.next_build_id = None
+        self.next_data_hits = 0
+        self.next_data_misses = 0
+        # Every worker waits until this monotonic time after a 429/503, so the whole scraper backs off together
+        self.throttle_until = 0.0
+        # Matching products, stored column-wise in COLUMNS order
+        self.product_ids = []
+        self.product_names = []
+        self.prices = []
+        self.image_urls = []
         self.auth = None
         self.current_id = start_id
         self.output_file = get_output_filename()
+        self.store_file = get_store_filename()
+        self.export_xlsx = export_xlsx
+        # Number of matching products already appended to the CSV store
+        self._stored_count = 0
+        # Deduplicated store as last loaded, reused while the CSV's mtime is unchanged
+        self._store_df = None
+        self._store_mtime = None
+        self.rescrape_known = rescrape_known
+        # product_id -> time it was found to have no product page
+        self.not_found = {}
+
+    async def get_product_info_fast(self, url, product_id, verbose=False):
+        """
+        Extract product name, price and image from the server-rendered HTML without rendering the page
+        
+        Uses the browser context's request client, so the session cookies are sent along. The price is
+        only read from data scoped to this product (its price meta tag or its inline page data record),
+        never from the first rupee amount in the HTML, which may belong to a banner or related product.
+        
+        Returns:
+            (product_name, price, image_url), or (None, None, None) if the HTML has no product name or scoped price
+        """
+        try:
+            response = await self.auth.context.request.get(url, timeout=10000)
+            if response.status in THROTTLE_STATUSES:
+                raise RateLimited(response.status)
+            if not response.ok:
+                if verbose:
+                    print(f"  [DEBUG] Fast path status: {response.status}")
+                return None, None, None
+            body = await response.text()
+        except RateLimited:
+            raise
+        except Exception as e:
+            if verbose:
+                print(f"  [DEBUG] Fast path error: {e}")
+            return None, None, None
+        
+        if self.next_build_id is None:
+            self.detect_next_data(body)
+        
+        product_name = meta_content(OG_TITLE_RE.search(body))
+        price = self.scoped_price(body, product_id) if product_name else None
+        if not price:
+            self.fast_path_misses += 1
+            if not self.fast_path_hits and self.fast_path_misses >= FAST_PATH_MAX_MISSES:
+                self.use_fast_path = False
+                print("[INFO] Product pages have no server-rendered name and price - using the browser only")
+            return None, None, None
+        self.fast_path_hits += 1
+        
+        image_url = meta_content(OG_IMAGE_RE.search(body))
+        if verbose:
+            print(f"  [DEBUG] Got name from HTML fast path: {product_name}")
+        return product_name, price, image_url or "N/A"
+
+    @staticmethod
+    def scoped_price(body, product_id):
+        """Price of product_id from its price meta tag or its inline __NEXT_DATA__ record, or None"""
+        amount = meta_content(PRICE_AMOUNT_RE.search(body))
+        if amount:
+            try:
+                return f"₹{float(amount.replace(',', '')):g}"
+            except ValueError:
+                return amount
+        match = NEXT_DATA_RE.search(body)
+        if match:
+            try:
+                return find_product_fields(loads_json(match.group(1)), product_id)[1]
+            except ValueError:
+                pass
+        return None
+
+    def detect_next_data(self, body):
+        """Record the Next.js build ID from a product page's HTML, or "" if the page has no __NEXT_DATA__"""
+        match = NEXT_DATA_RE.search(body)
+        build_id = ""
+        if match:
+            try:
+                build_id = loads_json(match.group(1)).get("buildId") or ""
+            except ValueError:
+                pass
+        self.next_build_id = build_id
+        if build_id:
+            print(f"[INFO] Next.js page data found (build {build_id}) - reading product JSON directly")
+
+    async def get_product_info_json(self, product_id, verbose=False):
+        """
+        Read product name, price and image from the Next.js page data endpoint, skipping HTML entirely
+        
+        Returns:
+            (product_name, price, image_url), or (None, None, None) if the JSON has no product
+        """
+        url = NEXT_DATA_URL.format(build_id=self.next_build_id, product_id=product_id)
+        try:
+            response = await self.auth.context.request.get(url, timeout=10000)
+            if response.status in THROTTLE_STATUSES:
+                raise RateLimited(response.status)
+            if not response.ok:
+                if verbose:
+                    print(f"  [DEBUG] Page data status: {response.status}")
+                return None, None, None
+            result = find_product_fields(loads_json(await response.body()), product_id)
+        except RateLimited:
+            raise
+        except Exception as e:
+            if verbose:
+                print(f"  [DEBUG] Page data error: {e}")
+            return None, None, None
+        
+        if not result[0]:
+            self.next_data_misses += 1
+            if not self.next_data_hits and self.next_data_misses >= FAST_PATH_MAX_MISSES:
+                self.next_build_id = ""
+                print("[INFO] Next.js page data has no product fields - falling back to HTML")
+            return None, None, None
+        self.next_data_hits += 1
+        if verbose:
+            print(f"  [DEBUG] Got name from page data: {result[0]}")
+        return result
 
     async def get_product_info(self, page, product_id, verbose=False):
-        """Extract product name and price from product page"""
+        """
+        Extract product name and price from product page
+        
+        Returns:
+            (product_name, price, image_url), or (None, None, None) if the page says there is no product
+        
+        Raises:
+            RateLimited: if the server answered with one of THROTTLE_STATUSES
+            ScrapeFailed: if the page could not be loaded or read
+        """
         try:
-            url = f"https://blinkit.com/prn/x/prid/{product_id}"
+            url = PRODUCT_URL_PREFIX + str(product_id)
+            
+            if self.next_build_id:
+                result = await self.get_product_info_json(product_id, verbose)
+                if result[0]:
+                    return result
+            
+            if self.use_fast_path:
+                result = await self.get_product_info_fast(url, product_id, verbose)
+                if result[0]:
+                    return result
             
             # Navigate to product page
             try:
@@ -55,106 +404,55 @@ class ProductScraper:
             except Exception as e:
                 if verbose:
                     print(f"  [DEBUG] Navigation error: {e}")
+                raise ScrapeFailed(f"navigation error: {e}") from e
+            if status in THROTTLE_STATUSES:
+                raise RateLimited(status)
+            if status in NOT_FOUND_STATUSES:
                 return None, None, None
+            if response is None or not response.ok:
+                raise ScrapeFailed(f"HTTP {status}")
             
-            await asyncio.sleep(0.5)
-            
-            # Check if page has content (not a 404 or error page)
+            # The product name (or its meta tag) is the readiness signal; missing pages fail fast
             try:
-                page_text = await page.text_content()
-                if not page_text or len(page_text) < 50:
-                    if verbose:
-                        print(f"  [DEBUG] Page text too short: {len(page_text) if page_text else 0} chars")
-                    return None, None, None
+                await page.wait_for_selector(READY_SELECTOR, state="attached", timeout=4000)
             except Exception:
-                pass
-            
-            # Extract product name
-            product_name = "Unknown"
-            try:
-                # Try Blinkit's specific selector first
-                specific_selector = ".tw-text-500.tw-font-extrabold.tw-line-clamp-50"
-                script = f"() => {{ const el = document.querySelector('{specific_selector}'); return el ? (el.innerText || el.textContent) : null; }}"
-                text = await page.evaluate(script)
-                if text:
-                    product_name = text.strip()
-                    if verbose:
-                        print(f"  [DEBUG] Got name from specific selector: {product_name}")
-                else:
-                    # Try meta tag
-                    meta = await page.evaluate("() => { const m = document.querySelector(\"meta[property='og:title']\"); return m ? m.getAttribute('content') : null; }")
-                    if meta:
-                        product_name = meta.strip()
-                        if verbose:
-                            print(f"  [DEBUG] Got name from meta: {product_name}")
-                    else:
-                        # Try other selectors
-                        selectors = ["h1", ".product-title", ".productName", "[data-testid='product-title']", "[class*='ProductName']"]
-                        for sel in selectors:
-                            script = f"() => {{ const el = document.querySelector('{sel}'); return el ? (el.innerText || el.textContent) : null; }}"
-                            text = await page.evaluate(script)
-                            if text:
-                                product_name = text.strip()
-                                if verbose:
-                                    print(f"  [DEBUG] Got name from selector {sel}: {product_name}")
-                                break
-            except Exception as e:
                 if verbose:
-                    print(f"  [DEBUG] Name extraction error: {e}")
+                    print("  [DEBUG] Product name not found within 4s")
             
-            # Extract image URL
-            image_url = "N/A"
+            # Read page length, name, image and price in one round-trip
             try:
-                # Extract from ProductCarousel__ImageContainer
-                script = """() => {
-                    const container = document.querySelector('[class*="ProductCarousel__ImageContainer"]');
-                    if (container) {
-                        const img = container.querySelector('img');
-                        if (img && img.src) {
-                            return img.src;
-                        }
-                    }
-                    return null;
-                }"""
-                img_src = await page.evaluate(script)
-                if img_src:
-                    image_url = img_src.strip()
-                    if verbose:
-                        print(f"  [DEBUG] Got image URL: {image_url}")
+                data = await page.evaluate(EXTRACT_JS, {
+                    "nameSelectors": NAME_SELECTORS,
+                    "priceSelectors": PRICE_SELECTORS
+                })
             except Exception as e:
                 if verbose:
-                    print(f"  [DEBUG] Image extraction error: {e}")
+                    print(f"  [DEBUG] Extraction error: {e}")
+                raise ScrapeFailed(f"extraction error: {e}") from e
             
-            # Extract price
-            price = "N/A"
-            try:
-                # Common price selectors
-                price_selectors = [
-                    ".product-price",
-                    "[class*='Price']",
-                    "[class*='price']",
-                    "[data-testid='product-price']"
-                ]
-                
-                for sel in price_selectors:
-                    script = f"() => {{ const el = document.querySelector('{sel}'); return el ? (el.innerText || el.textContent) : null; }}"
-                    price_text = await page.evaluate(script)
-                    if price_text:
-                        price = price_text.strip()
-                        if verbose:
-                            print(f"  [DEBUG] Got price from selector {sel}: {price}")
-                        break
-                
-                # If still not found, try to extract from page text
-                if price == "N/A":
-                    script = "() => { const text = document.documentElement.innerText; const match = text.match(/₹\\s*(\\d+(?:,\\d+)*)/); return match ? match[0] : null; }"
-                    price_match = await page.evaluate(script)
-                    if price_match:
-                        price = price_match.strip()
-                        if verbose:
-                            print(f"  [DEBUG] Got price from regex: {price}")
-            except Exception as e:
+            # A page that loaded fine but rendered (almost) no text failed to render, it did not say "not found"
+            if data["textLength"] < 50:
                 if verbose:
+                    print(f"  [DEBUG] Page text too short: {data['textLength']} chars")
+                raise ScrapeFailed(f"page text too short ({data['textLength']} chars)")
+            
+            product_name = (data["name"] or "").strip() or "Unknown"
+            if verbose and product_name != "Unknown":
+                print(f"  [DEBUG] Got name from {data['nameSource']}: {product_name}")
+            
+            image_url = (data["image"] or "").strip() or "N/A"
+            if verbose and image_url != "N/A":
+                print(f"  [DEBUG] Got image URL: {image_url}")
+            
+            price = (data["price"] or "").strip()
+            if not price:
+                match = PRICE_RE.search(data.get("bodyText") or "")
+                price = match.group(0) if match else "N/A"
+                data["priceSource"] = "regex"
+            if verbose:
+                if price != "N/A":
+                    print(f"  [DEBUG] Got price from {data['priceSource']}: {price}")
+                else:
                     print(f"  [DEBUG] Price extraction error: Price not found")
             
             # Return only if we got a valid product name
@@ -165,10 +463,35 @@ class ProductScraper:
                     print(f"  [DEBUG] No valid product name found")
                 return None, None, None
             
+        except (RateLimited, ScrapeFailed):
+            raise
         except Exception as e:
             if verbose:
                 print(f"  [DEBUG] Unexpected error: {e}")
-            return None, None, None
+            raise ScrapeFailed(f"unexpected error: {e}") from e
+
+    async def get_product_info_with_retry(self, page, product_id, verbose=False):
+        """
+        Call get_product_info, backing off and retrying when the server answers 429/503
+        
+        A throttled response pushes throttle_until forward, which pauses every worker, not just this one.
+        
+        Raises:
+            RateLimited: if the product is still throttled after THROTTLE_RETRIES retries
+            ScrapeFailed: if the page could not be loaded or read
+        """
+        for attempt in range(THROTTLE_RETRIES + 1):
+            delay = self.throttle_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                return await self.get_product_info(page, product_id, verbose=verbose)
+            except RateLimited as e:
+                if attempt == THROTTLE_RETRIES:
+                    raise
+                backoff = THROTTLE_BACKOFF * 2 ** attempt
+                self.throttle_until = max(self.throttle_until, time.monotonic() + backoff)
+                print(f"[WAIT] PID:{product_id} got {e} - backing off {backoff:.0f}s")
 
     async def scrape_products(self, headless=True, verbose=False):
         """
@@ -183,10 +506,25 @@ class ProductScraper:
         print("=" * 70)
         print(f"Scraping product IDs from {self.start_id} to {self.end_id}")
         print(f"Filtering for keyword: '{self.keyword_filter}'")
-        print(f"Output file: {self.output_file}")
+        print(f"Output file: {self.store_file}" + (f" (Excel: {self.output_file})" if self.export_xlsx else ""))
+        print(f"Concurrent pages: {self.concurrency}")
         print(f"Debug mode: {'ON' if verbose else 'OFF'}")
         print("-" * 70)
         
+        product_ids = range(self.start_id, self.end_id + 1)
+        known_ids = self.load_known_ids()
+        if not self.rescrape_known:
+            product_ids = [product_id for product_id in product_ids if product_id not in known_ids]
+            skipped = self.end_id - self.start_id + 1 - len(product_ids)
+            if skipped:
+                print(f"Skipping {skipped} IDs already stored or recently not found")
+        
+        total_products = len(product_ids)
+        scraped_count = 0
+        filtered_count = 0
+        processed_count = 0
+        pages = []
+        
         try:
             print("Initializing browser...")
             self.auth = BlinkitAuth(headless=headless)
@@ -199,39 +537,65 @@ class ProductScraper:
             
             print("[OK] Logged in successfully\n")
             
-            total_products = self.end_id - self.start_id + 1
-            scraped_count = 0
-            filtered_count = 0
+            # Product pages only need the DOM; skip images, fonts, media and CSS for every tab
+            await self.auth.context.route("**/*", block_heavy_resources)
+            
+            # One tab per worker in the logged-in context, so every tab shares the session cookies
+            pages = [self.auth.page] + [await self.auth.context.new_page() for _ in range(self.concurrency - 1)]
+            
+            queue = asyncio.Queue()
+            for product_id in product_ids:
+                queue.put_nowait(product_id)
             
-            for product_id in range(self.start_id, self.end_id + 1):
-                self.current_id = product_id
-                progress = ((product_id - self.start_id + 1) / total_products) * 100
-                
-                # Enable verbose for first few products even if not requested
-                is_verbose = verbose or (scraped_count + filtered_count < 3)
-                
-                product_name, price, image_url = await self.get_product_info(self.auth.page, product_id, verbose=is_verbose)
-                
-                if product_name:
-                    scraped_count += 1
+            async def worker(index, page):
+                nonlocal scraped_count, filtered_count, processed_count
+                # Stagger worker start-up so the tabs don't hit the server in lockstep
+                await asyncio.sleep(index * 0.1)
+                while True:
+                    try:
+                        product_id = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    self.current_id = product_id
+                    
+                    # Enable verbose for first few products even if not requested
+                    is_verbose = verbose or (scraped_count + filtered_count < 3)
                     
-                    # Check if product matches keyword filter
-                    if self.keyword_filter in product_name.lower():
-                        self.products.append({
-                            "Product ID": product_id,
-                            "Image URL": image_url,
-                            "Product Name": product_name,
-                            "Price": price
-                        })
-                        filtered_count += 1
-                        print(f"[{progress:.1f}%] [MATCH] PID:{product_id} | {product_name} | {price}")
+                    try:
+                        product_name, price, image_url = await self.get_product_info_with_retry(page, product_id, verbose=is_verbose)
+                    except RateLimited as e:
+                        # Not recorded as not found, so the next run tries this ID again
+                        processed_count += 1
+                        progress = (processed_count / total_products) * 100
+                        print(f"[{progress:.1f}%] [THROTTLED] PID:{product_id} ({e} after {THROTTLE_RETRIES} retries)")
+                        continue
+                    except ScrapeFailed as e:
+                        # Not recorded as not found either; only pages that say so are skipped on later runs
+                        processed_count += 1
+                        progress = (processed_count / total_products) * 100
+                        print(f"[{progress:.1f}%] [ERROR] PID:{product_id} ({e})")
+                        continue
+                    processed_count += 1
+                    progress = (processed_count / total_products) * 100
+                    
+                    if product_name:
+                        scraped_count += 1
+                        
+                        # Check if product matches keyword filter
+                        if self.keyword_filter in product_name.lower():
+                            self.product_ids.append(product_id)
+                            self.product_names.append(product_name)
+                            self.prices.append(price)
+                            self.image_urls.append(image_url)
+                            filtered_count += 1
+                            print(f"[{progress:.1f}%] [MATCH] PID:{product_id} | {product_name} | {price}")
+                        else:
+                            print(f"[{progress:.1f}%] [FOUND] PID:{product_id} | {product_name} | {price} (no keyword match)")
                     else:
-                        print(f"[{progress:.1f}%] [FOUND] PID:{product_id} | {product_name} | {price} (no keyword match)")
-                else:
-                    print(f"[{progress:.1f}%] [NOT_FOUND] PID:{product_id} (product not available or error)")
-                
-                # Small delay to avoid overwhelming the server
-                await asyncio.sleep(0.3)
+                        self.not_found[product_id] = time.time()
+                        print(f"[{progress:.1f}%] [NOT_FOUND] PID:{product_id} (product not available)")
+            
+            await asyncio.gather(*(worker(i, page) for i, page in enumerate(pages)))
             
             print("\n" + "-" * 70)
             print(f"[COMPLETE] Scraping finished")
@@ -239,10 +603,10 @@ class ProductScraper:
             print(f"Products with '{self.keyword_filter}': {filtered_count}")
             print("-" * 70)
             
-            # Export to Excel
-            if self.products:
-                self.export_to_excel()
-                print(f"\n[SUCCESS] Results exported to {self.output_file}")
+            # Save results
+            if self.product_ids:
+                self.save_results()
+                print(f"\n[SUCCESS] Results saved to {self.store_file}" + (f" and {self.output_file}" if self.export_xlsx else ""))
             else:
                 print(f"\n[INFO] No products found matching '{self.keyword_filter}'")
             
@@ -251,11 +615,17 @@ class ProductScraper:
         except KeyboardInterrupt:
             print("\n[STOPPED] Scraping interrupted by user")
             print(f"Scraped {filtered_count} filtered products so far")
-            if self.products:
-                self.export_to_excel()
+            if self.product_ids:
+                self.save_results()
             return False
         
         finally:
+            self.save_not_found()
+            for page in pages[1:]:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
             if self.auth:
                 try:
                     if hasattr(self.auth, 'close'):
@@ -264,106 +634,139 @@ class ProductScraper:
                 except Exception as e:
                     print(f"[DEBUG] Browser close error: {e}")
 
-    def export_to_excel(self):
-        """Export scraped products to Excel file, merging with existing data"""
-        try:
-            from openpyxl import Workbook
-            from openpyxl.styles import Font
-            
-            # Prepare new data
-            df_new = pd.DataFrame(self.products)
-            df_new['Product ID'] = df_new['Product ID'].astype(int)
-            
-            # Reorder columns
-            column_order = ['Product ID', 'Product Name', 'Price', 'Image URL']
-            df_new = df_new[column_order].set_index('Product ID')
-            
-            # Load existing data if file exists
-            df_merged = None
-            if self.output_file.exists():
-                try:
-                    # Read existing file defensively
-                    df_existing = pd.read_excel(self.output_file, dtype=object)
+    def load_known_ids(self):
+        """
+        Product IDs that don't need scraping again
+        
+        Returns:
+            Set of IDs already in the CSV store plus IDs found to have no product within NOT_FOUND_TTL
+        """
+        known_ids = set()
+        if not self.store_file.exists() and self.output_file.exists():
+            self._seed_store_from_excel()
+        if self.store_file.exists():
+            try:
+                # Only the ID column is needed, so skip pandas and read the CSV directly
+                with open(self.store_file, newline='', encoding='utf-8') as f:
+                    reader = csv.reader(f)
+                    next(reader, None)
+                    for row in reader:
+                        if row and row[0].isdigit():
+                            known_ids.add(int(row[0]))
+            except Exception as e:
+                print(f"[INFO] Could not read {self.store_file}: {e}")
+        
+        if NOT_FOUND_FILE.exists():
+            try:
+                with open(NOT_FOUND_FILE, encoding='utf-8') as f:
+                    checked = json.load(f)
+                cutoff = time.time() - NOT_FOUND_TTL
+                self.not_found = {int(pid): ts for pid, ts in checked.items() if ts >= cutoff}
+            except Exception as e:
+                print(f"[INFO] Could not read {NOT_FOUND_FILE}: {e}")
+        known_ids.update(self.not_found)
+        return known_ids
 
-                    # Ensure required columns exist
-                    for col in ['Product ID', 'Product Name', 'Price', 'Image URL']:
-                        if col not in df_existing.columns:
-                            df_existing[col] = pd.NA
+    def save_not_found(self):
+        """Persist the IDs with no product page so later runs can skip them"""
+        if not self.not_found:
+            return
+        try:
+            with open(NOT_FOUND_FILE, 'w', encoding='utf-8') as f:
+                json.dump({str(pid): ts for pid, ts in self.not_found.items()}, f)
+        except Exception as e:
+            print(f"[INFO] Could not save {NOT_FOUND_FILE}: {e}")
 
-                    # Coerce Product ID to numeric, drop invalid rows
-                    df_existing['Product ID'] = pd.to_numeric(df_existing['Product ID'], errors='coerce')
-                    df_existing = df_existing.dropna(subset=['Product ID'])
-                    df_existing['Product ID'] = df_existing['Product ID'].astype(int)
-                    df_existing = df_existing.set_index('Product ID')
+    def save_results(self):
+        """Append new products to the CSV store and rebuild the Excel file if enabled"""
+        if self._stored_count == len(self.product_ids):
+            return  # Nothing new since the last save
+        if not self.append_to_store():
+            return
+        if self.export_xlsx:
+            self.export_to_excel()
 
-                    # Merge: new data overwrites old for existing IDs, keep old for IDs not in new data
-                    df_merged = df_existing.copy()
-                    df_merged.update(df_new)
+    def append_to_store(self):
+        """Append products not yet stored to the CSV store; earlier rows are never rewritten"""
+        try:
+            # First run with a store: carry over products from an existing Excel file
+            if not self.store_file.exists() and self.output_file.exists():
+                self._seed_store_from_excel()
+            
+            new_file = not self.store_file.exists()
+            with open(self.store_file, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(COLUMNS)
+                start = self._stored_count
+                writer.writerows(zip(
+                    self.product_ids[start:], self.product_names[start:], self.prices[start:], self.image_urls[start:]
+                ))
+            print(f"[INFO] {len(self.product_ids) - self._stored_count} new/updated products appended to {self.store_file}")
+            self._stored_count = len(self.product_ids)
+            return True
+        except Exception as e:
+            print(f"[ERROR] Failed to append to {self.store_file}: {e}")
+            return False
 
-                    # Add rows that are present in df_new but missing in df_merged
-                    new_idx = df_new.index.difference(df_merged.index)
-                    if len(new_idx) > 0:
-                        df_merged = pd.concat([df_merged, df_new.loc[new_idx]])
+    def _seed_store_from_excel(self):
+        """Copy the products from an Excel file written by an older version into a new CSV store"""
+        import pandas as pd
+        
+        try:
+            df_existing = pd.read_excel(self.output_file, dtype=object)
+            for col in COLUMNS:
+                if col not in df_existing.columns:
+                    df_existing[col] = pd.NA
+            df_existing['Product ID'] = pd.to_numeric(df_existing['Product ID'], errors='coerce')
+            df_existing = df_existing.dropna(subset=['Product ID'])
+            df_existing['Product ID'] = df_existing['Product ID'].astype(int)
+            df_existing[COLUMNS].to_csv(self.store_file, index=False)
+            print(f"[INFO] Imported {len(df_existing)} existing products from {self.output_file}")
+        except Exception as e:
+            print(f"[INFO] Could not read existing file, starting a new store: {e}")
 
-                    df_merged = df_merged.sort_index()
+    def load_store(self):
+        """Read the CSV store, keeping only the latest row per Product ID"""
+        import pandas as pd  # Imported on first save; scraping itself never needs pandas
+        
+        mtime = self.store_file.stat().st_mtime_ns
+        if self._store_df is not None and mtime == self._store_mtime:
+            return self._store_df
+        
+        df = pd.read_csv(self.store_file, dtype=object, keep_default_na=False)
+        
+        # Coerce Product ID to numeric, drop invalid rows
+        df['Product ID'] = pd.to_numeric(df['Product ID'], errors='coerce')
+        df = df.dropna(subset=['Product ID'])
+        df['Product ID'] = df['Product ID'].astype(int)
+        
+        # Later rows are newer scrapes, so they win for duplicate IDs
+        df = df.drop_duplicates(subset='Product ID', keep='last').sort_values('Product ID')
+        
+        # Names and prices repeat across IDs (same product, several listings), so store them as categories
+        df['Product Name'] = df['Product Name'].astype('category')
+        df['Price'] = df['Price'].astype('category')
+        self._store_df = df
+        self._store_mtime = mtime
+        return self._store_df
 
-                    print(f"[INFO] Merged with {len(df_existing)} existing products")
-                    print(f"[INFO] {len(df_new)} new/updated products processed")
-                except Exception as e:
-                    print(f"[INFO] Could not read existing file, creating new: {e}")
-                    df_merged = df_new
-            else:
-                df_merged = df_new
-            
-            # Reset index to convert Product ID back to column
-            df_merged = df_merged.reset_index()
-            
-            # Create workbook and worksheet
-            wb = Workbook()
-            ws = wb.active
-            ws.title = 'Products'
-            
-            # Write headers
-            for col_num, col_name in enumerate(column_order, 1):
-                cell = ws.cell(row=1, column=col_num)
-                cell.value = col_name
-            
-            # Write data and add hyperlinks to Product IDs
-            for row_num, row_data in enumerate(df_merged.values, 2):
-                for col_num, value in enumerate(row_data, 1):
-                    cell = ws.cell(row=row_num, column=col_num)
-                    
-                    # Add hyperlink for Product ID column
-                    if col_num == 1:  # Product ID column
-                        product_id = int(value)
-                        product_url = f"https://blinkit.com/prn/x/prid/{product_id}"
-                        cell.value = product_id
-                        cell.hyperlink = product_url
-                        cell.font = Font(color="0563C1", underline="single")
-                    else:
-                        cell.value = value
-            
-            # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
-            
-            # Format Product ID column as number (no thousand separators)
-            for row in ws.iter_rows(min_col=1, max_col=1, min_row=2, max_row=len(df_merged) + 1):
-                for cell in row:
-                    cell.number_format = '0'
+    def export_to_excel(self):
+        """Export every stored product to the Excel file"""
+        try:
+            column_order = COLUMNS
+            df_merged = self.load_store()
+            if df_merged.empty:
+                print(f"[INFO] {self.store_file} has no products to export")
+                return True
             
-            wb.save(str(self.output_file))
+            # Write next to the real file and swap it in, so a crash never leaves a half-written workbook
+            tmp_file = self.output_file.with_name(self.output_file.name + ".tmp")
+            if xlsxwriter is not None:
+                self._write_xlsx_streaming(df_merged, column_order, tmp_file)
+            else:
+                self._write_xlsx_openpyxl(df_merged, column_order, tmp_file)
+            os.replace(tmp_file, self.output_file)
             print(f"[INFO] Total products in file: {len(df_merged)}")
             
             return True
@@ -376,6 +779,86 @@ class ProductScraper:
             print(f"[ERROR] Failed to export to Excel: {e}")
             return False
 
+    def _write_xlsx_streaming(self, df, column_order, path):
+        """Write the products sheet to path with xlsxwriter in constant-memory mode"""
+        import pandas as pd
+        
+        wb = xlsxwriter.Workbook(str(path), {'constant_memory': True, 'strings_to_urls': False})
+        try:
+            ws = wb.add_worksheet('Products')
+            hyperlink_format = wb.add_format({'font_color': '#0563C1', 'underline': 1, 'num_format': '0'})
+            
+            # Column widths are tracked while writing; constant-memory sheets can't be re-read
+            max_length = [len(col_name) for col_name in column_order]
+            ws.write_row(0, 0, column_order)
+            
+            for row_num, row_data in enumerate(df.itertuples(index=False), 1):
+                for col_num, value in enumerate(row_data):
+                    if col_num == 0:  # Product ID column, linked to the product page
+                        product_id = int(value)
+                        text = str(product_id)
+                        ws.write_url(row_num, 0, PRODUCT_URL_PREFIX + text, hyperlink_format, text)
+                    else:
+                        if pd.isna(value):
+                            value = None
+                        text = str(value)
+                        ws.write(row_num, col_num, value)
+                    if len(text) > max_length[col_num]:
+                        max_length[col_num] = len(text)
+            
+            for col_num, width in enumerate(max_length):
+                ws.set_column(col_num, col_num, min(width + 2, 50))
+        finally:
+            wb.close()
+
+    def _write_xlsx_openpyxl(self, df_merged, column_order, path):
+        """Write the products sheet to path with openpyxl (used when xlsxwriter is not installed)"""
+        from openpyxl import Workbook
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+        
+        # Create workbook and worksheet
+        wb = Workbook()
+        ws = wb.active
+        ws.title = 'Products'
+
+        # Write headers
+        for col_num, col_name in enumerate(column_order, 1):
+            cell = ws.cell(row=1, column=col_num)
+            cell.value = col_name
+
+        # One shared style object for every Product ID hyperlink
+        link_font = Font(color="0563C1", underline="single")
+
+        # Column widths are tracked while writing instead of re-reading every cell afterwards
+        max_length = [len(col_name) for col_name in column_order]
+
+        # Write data and add hyperlinks to Product IDs
+        for row_num, row_data in enumerate(df_merged.itertuples(index=False), 2):
+            for col_num, value in enumerate(row_data, 1):
+                cell = ws.cell(row=row_num, column=col_num)
+
+                # Add hyperlink for Product ID column
+                if col_num == 1:  # Product ID column
+                    product_id = int(value)
+                    text = str(product_id)
+                    cell.value = product_id
+                    cell.hyperlink = PRODUCT_URL_PREFIX + text
+                    cell.font = link_font
+                    # Format Product ID column as number (no thousand separators)
+                    cell.number_format = '0'
+                else:
+                    cell.value = value
+                    text = str(value)
+                if len(text) > max_length[col_num - 1]:
+                    max_length[col_num - 1] = len(text)
+
+        # Auto-adjust column widths
+        for col_num, width in enumerate(max_length, 1):
+            ws.column_dimensions[get_column_letter(col_num)].width = min(width + 2, 50)
+
+        wb.save(str(path))
+
 
 async def main():
     """Main entry point"""
@@ -406,11 +889,22 @@ async def main():
     debug_input = input("Enable debug/verbose mode? (y/N): ").strip().lower()
     debug = debug_input in ('y', 'yes')
     
+    try:
+        concurrency_input = input("Number of pages to scrape in parallel (default 8): ").strip()
+        concurrency = int(concurrency_input) if concurrency_input else 8
+    except ValueError:
+        concurrency = 8
+    
+    export_input = input("Rebuild the Excel file after scraping? (Y/n): ").strip().lower()
+    export_xlsx = export_input not in ('n', 'no')
+    
     print(f"\n[INFO] Starting product ID: {start_id}")
     print(f"[INFO] Ending product ID: {end_id}")
     print(f"[INFO] Keyword filter: '{keyword}'")
     print(f"[INFO] Headless mode: {headless}")
     print(f"[INFO] Debug mode: {debug}")
+    print(f"[INFO] Concurrent pages: {concurrency}")
+    print(f"[INFO] Excel export: {export_xlsx}")
     
     # Validate range
     if start_id >= end_id:
@@ -424,7 +918,7 @@ async def main():
             return
     
     # Start scraping
-    scraper = ProductScraper(start_id, end_id, keyword)
+    scraper = ProductScraper(start_id, end_id, keyword, concurrency=concurrency, export_xlsx=export_xlsx)
     success = await scraper.scrape_products(headless=headless, verbose=debug)
     
     if success:
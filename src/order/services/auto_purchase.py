@@ -7,13 +7,43 @@ when product becomes available.
 import json
 import logging
 import asyncio
+import os
 import time
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # Fall back to polling the status file
+    FileSystemEventHandler = object
+    Observer = None
+
 logger = logging.getLogger(__name__)
 
+
+class StatusFileHandler(FileSystemEventHandler):
+    """Sets an asyncio.Event when the status file changes (called from watchdog's thread)"""
+    
+    def __init__(self, path: Path, loop: asyncio.AbstractEventLoop, event: asyncio.Event):
+        super().__init__()
+        self.name = path.name
+        self.loop = loop
+        self.event = event
+    
+    def on_any_event(self, event):
+        # Writers may replace the file via a rename, so match the destination too
+        paths = (event.src_path, getattr(event, "dest_path", "") or "")
+        if any(os.path.basename(p) == self.name for p in paths):
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
 class AutoPurchaseService:
     """Service that monitors product availability and triggers automatic purchase"""
     
@@ -29,16 +59,30 @@ class AutoPurchaseService:
         self.order = order
         self.last_status = None
         self.product_details = None
+        # Parsed status file and the mtime it was read at, reused until the file changes
+        self._status_cache = None
+        self._status_mtime = None
         
     def read_status(self) -> Optional[Dict[str, Any]]:
         """Read current status from monitor file"""
         try:
-            if not self.STATUS_FILE.exists():
+            try:
+                mtime = os.stat(self.STATUS_FILE).st_mtime_ns
+            except FileNotFoundError:
                 logger.debug(f"Status file not found: {self.STATUS_FILE}")
                 return None
             
-            with open(self.STATUS_FILE, 'r') as f:
-                return json.load(f)
+            if mtime == self._status_mtime:
+                return self._status_cache
+            
+            if orjson is not None:
+                with open(self.STATUS_FILE, 'rb') as f:
+                    self._status_cache = orjson.loads(f.read())
+            else:
+                with open(self.STATUS_FILE, 'r') as f:
+                    self._status_cache = json.load(f)
+            self._status_mtime = mtime
+            return self._status_cache
         except Exception as e:
             logger.error(f"Error reading status file: {e}")
             return None
@@ -137,29 +181,43 @@ class AutoPurchaseService:
         Watch monitor status file and act when product becomes available
         
         Args:
-            check_interval: How often to check status file (seconds)
+            check_interval: How often to check status file (seconds) when watchdog is not installed
             max_wait: Maximum time to wait (seconds), None = infinite
             
         Returns:
             True if product purchased, False otherwise
         """
-        logger.info(f"Auto-purchase watcher started")
+        logger.info("Auto-purchase watcher started")
         logger.info(f"Monitoring: {self.STATUS_FILE.absolute()}")
-        logger.info(f"Check interval: {check_interval} seconds")
+        if Observer is not None:
+            logger.info("Change detection: file system events")
+        else:
+            logger.info(f"Check interval: {check_interval} seconds")
         logger.info(f"Max wait time: {max_wait if max_wait else 'Unlimited'} seconds")
         logger.info("-" * 60)
         
         start_time = datetime.now()
         check_count = 0
         
+        # Wake up on file system events instead of polling when watchdog is installed
+        changed = asyncio.Event()
+        observer = None
+        if Observer is not None:
+            observer = Observer()
+            handler = StatusFileHandler(self.STATUS_FILE, asyncio.get_running_loop(), changed)
+            observer.schedule(handler, str(self.STATUS_FILE.absolute().parent), recursive=False)
+            observer.start()
+        
         try:
             while True:
                 # Check if max wait time exceeded
+                remaining = None
                 if max_wait:
                     elapsed = (datetime.now() - start_time).total_seconds()
                     if elapsed > max_wait:
                         logger.info(f"Max wait time exceeded ({max_wait} seconds)")
                         break
+                    remaining = max_wait - elapsed
                 
                 check_count += 1
                 current_status = self.read_status()
@@ -193,7 +251,14 @@ class AutoPurchaseService:
                 else:
                     logger.debug(f"Check #{check_count}: Monitor file not found yet...")
                 
-                await asyncio.sleep(check_interval)
+                if observer is not None:
+                    try:
+                        await asyncio.wait_for(changed.wait(), timeout=remaining)
+                    except asyncio.TimeoutError:
+                        pass
+                    changed.clear()
+                else:
+                    await asyncio.sleep(check_interval)
                 
         except KeyboardInterrupt:
             elapsed = (datetime.now() - start_time).total_seconds()
@@ -202,4 +267,9 @@ class AutoPurchaseService:
             logger.info(f"Checks performed: {check_count}")
             return False
         
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+        
         return False
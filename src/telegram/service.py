@@ -4,64 +4,259 @@ Telegram Bot Service
 - Poll for button click callbacks
 """
 
+import html
+import json
 import logging
+import os
+import random
+import time
+from collections import OrderedDict
 import aiohttp
 import asyncio
+from aiohttp import web
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
+
+try:
+    import httpx
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+except ImportError:  # Fall back to aiohttp over HTTP/1.1
+    httpx = None
 
 logger = logging.getLogger(__name__)
 
+# Request bodies serialized with orjson are sent as raw bytes, so the content type has to be set by hand
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Product block of an availability notification; only Telegram-supported HTML tags (no <h1>, etc.)
+PRODUCT_TEMPLATE = (
+    "<b>Product:</b> {name}\n\n"
+    "📍<b>Location:</b> <b>{location}</b>\n\n"
+    "<b>Link:</b>\n"
+    "<a href=\"{url}\">Open on Blinkit</a>"
+)
+
+# Most callback handlers allowed to run at once; further clicks wait their turn
+MAX_CONCURRENT_HANDLERS = 32
+
+# Clicks on the same unhandled callback_data within UNKNOWN_CALLBACK_TTL seconds are dropped silently;
+# up to UNKNOWN_CALLBACK_CACHE_SIZE values are remembered
+UNKNOWN_CALLBACK_TTL = 60
+UNKNOWN_CALLBACK_CACHE_SIZE = 128
+
+# Polling errors are retried after a random delay of up to this many seconds, doubling per failure up to the cap
+POLL_BACKOFF_MIN = 1.0
+POLL_BACKOFF_MAX = 30.0
+
+# Bot API server; override with TELEGRAM_API_BASE to use a self-hosted telegram-bot-api server or a nearby proxy
+DEFAULT_API_BASE = "https://api.telegram.org"
+
+
+def inline_keyboard(buttons: dict) -> dict:
+    """
+    Build a reply_markup with one row of inline buttons
+    
+    Args:
+        buttons: Dict of button labels and callback_data (e.g., {"Retry": "retry_watch"})
+    """
+    return {"inline_keyboard": [[
+        {"text": label, "callback_data": callback_data}
+        for label, callback_data in buttons.items()
+    ]]}
+
+
+# Buttons attached to notifications sent with_buttons
+DEFAULT_BUTTONS = {
+    "Retry": "retry_watch",
+    "Cancel": "cancel_watch"
+}
+DEFAULT_REPLY_MARKUP = inline_keyboard(DEFAULT_BUTTONS)
+
+# Toast shown when a button is clicked, by callback_data; other registered callbacks get DEFAULT_CALLBACK_REPLY
+CALLBACK_REPLIES = {
+    "retry_watch": "🔄 Restarting watch...",
+    "cancel_watch": "❌ Watch cancelled"
+}
+DEFAULT_CALLBACK_REPLY = "✓ Processing..."
+
 
 class TelegramBot:
     """Send messages to Telegram channel and handle button callbacks"""
     
-    def __init__(self, bot_token: str, channel_id: str):
+    __slots__ = (
+        'bot_token', 'channel_id', 'base_url', 'send_message_url', 'get_updates_url', 'answer_callback_url',
+        'set_webhook_url', 'delete_webhook_url', 'last_update_id', 'get_updates_timeout', 'get_updates_payload',
+        'callback_handlers', 'answer_unhandled', 'polling_task', 'is_polling', 'webhook_runner', '_inflight',
+        'retry_after', '_session', '_shared_session', '_use_httpx', '_handler_sem', '_seen_unknown'
+    )
+    
+    def __init__(self, bot_token: str, channel_id: str, api_base: str = None, session=None):
         """
         Initialize Telegram bot
         
         Args:
             bot_token: Telegram bot token (from @BotFather)
             channel_id: Telegram channel ID (e.g., @mychannel or -100123456789)
+            api_base: Bot API server URL (default: TELEGRAM_API_BASE env var, else https://api.telegram.org)
+            session: aiohttp.ClientSession shared with the rest of the application, or a callable returning one.
+                     The bot uses it instead of opening its own and never closes it.
         """
+        # A shared aiohttp session takes precedence over the bot's own httpx client
+        self._shared_session = session
+        self._use_httpx = httpx is not None and session is None
         self.bot_token = bot_token
         self.channel_id = channel_id
-        self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        api_base = (api_base or os.getenv("TELEGRAM_API_BASE") or DEFAULT_API_BASE).rstrip("/")
+        self.base_url = f"{api_base}/bot{bot_token}"
+        # Bot API endpoints, built once rather than per request
+        self.send_message_url = f"{self.base_url}/sendMessage"
+        self.get_updates_url = f"{self.base_url}/getUpdates"
+        self.answer_callback_url = f"{self.base_url}/answerCallbackQuery"
+        self.set_webhook_url = f"{self.base_url}/setWebhook"
+        self.delete_webhook_url = f"{self.base_url}/deleteWebhook"
         self.last_update_id = 0
+        # getUpdates timeouts: a little over the 10s long poll in total, and a hung socket is given up on after 12s
+        if self._use_httpx:
+            self.get_updates_timeout = httpx.Timeout(15.0, connect=5.0, read=12.0)
+        else:
+            self.get_updates_timeout = aiohttp.ClientTimeout(total=15, sock_connect=5, sock_read=12)
+        # getUpdates payload reused by every poll; only the offset changes
+        self.get_updates_payload = {
+            "offset": 1,
+            "timeout": 10,  # Long polling timeout
+            "allowed_updates": ["callback_query"]  # Only get button clicks
+        }
         self.callback_handlers = {}
+        # Reply "Handler not found" to clicks with no registered handler (e.g. stale buttons from an earlier run).
+        # Off by default: Telegram clears the button's spinner on its own, so the reply is a wasted round-trip.
+        self.answer_unhandled = False
+        # callback_data without a handler -> monotonic time it was last reported, oldest first
+        self._seen_unknown = OrderedDict()
         self.polling_task = None
         self.is_polling = False
+        # aiohttp.web runner serving the webhook endpoint (None when polling)
+        self.webhook_runner = None
+        # Callback handler and answer tasks still running; referenced here so they aren't garbage collected mid-run
+        self._inflight = set()
+        self._handler_sem = asyncio.Semaphore(MAX_CONCURRENT_HANDLERS)
+        # Seconds Telegram asked us to wait after the last HTTP 429 (None if not rate limited)
+        self.retry_after = None
+        # Own pooled HTTP session (when none is shared), opened on first request so connections are reused.
+        # With httpx + h2 installed it is an HTTP/2 client, so the long poll and button answers share one connection.
+        self._session = None
+    
+    def _get_session(self):
+        """Return the bot's HTTP session (httpx.AsyncClient or aiohttp.ClientSession), creating it on first use"""
+        if self._shared_session is not None:
+            return self._shared_session() if callable(self._shared_session) else self._shared_session
+        if self._use_httpx:
+            if self._session is None or self._session.is_closed:
+                self._session = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=75),
+                    timeout=httpx.Timeout(30.0, connect=5.0)
+                )
+        elif self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=75),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def _post(self, url: str, payload: dict, timeout=None):
+        """
+        POST a JSON payload to the Bot API
+        
+        Args:
+            url: Endpoint URL
+            payload: JSON request body
+            timeout: httpx.Timeout or aiohttp.ClientTimeout (matching the client in use) overriding the session default
+        
+        Returns:
+            (status, raw response body); callers only decode the body when they need it
+        
+        Raises:
+            asyncio.TimeoutError: if the request times out
+        """
+        session = self._get_session()
+        kwargs = {"timeout": timeout} if timeout is not None else {}
+        if self._use_httpx:
+            if orjson is not None:
+                kwargs.update(content=orjson.dumps(payload), headers=JSON_HEADERS)
+            else:
+                kwargs["json"] = payload
+            try:
+                response = await session.post(url, **kwargs)
+            except httpx.TimeoutException as e:
+                raise asyncio.TimeoutError() from e
+            return response.status_code, response.content
+        
+        if orjson is not None:
+            kwargs.update(data=orjson.dumps(payload), headers=JSON_HEADERS)
+        else:
+            kwargs["json"] = payload
+        async with session.post(url, **kwargs) as response:
+            # Read the body even when it's unused, so the connection goes back to the pool
+            return response.status, await response.read()
+    
+    async def close(self):
+        """Close the bot's own HTTP session if it was opened (a shared session is left to its owner)"""
+        if self._session is not None:
+            if self._use_httpx:
+                await self._session.aclose()
+            elif not self._session.closed:
+                await self._session.close()
+        self._session = None
     
-    async def send_message(self, message: str, parse_mode: str = "HTML") -> bool:
+    async def send_message(self, message: str, parse_mode: str = "HTML", reply_markup: dict = None) -> bool:
         """
         Send a text message to the Telegram channel
         
         Args:
             message: Message text (supports HTML formatting)
             parse_mode: HTML or Markdown formatting
+            reply_markup: Optional inline keyboard, e.g. inline_keyboard({"Retry": "retry_watch"})
         
         Returns:
             True if successful, False otherwise
         """
         try:
-            url = f"{self.base_url}/sendMessage"
             payload = {
                 "chat_id": self.channel_id,
                 "text": message,
                 "parse_mode": parse_mode
             }
+            if reply_markup is not None:
+                payload["reply_markup"] = reply_markup
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status == 200:
-                        logger.info("✓ Telegram message sent successfully")
-                        return True
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Telegram send failed (status {response.status}): {error_text}")
-                        return False
+            status, body = await self._post(self.send_message_url, payload)
+            if status == 200:
+                self.retry_after = None
+                logger.info("✓ Telegram message sent successfully")
+                return True
+            else:
+                error_text = body.decode("utf-8", "replace")
+                self._record_retry_after(status, error_text)
+                logger.error(f"Telegram send failed (status {status}): {error_text}")
+                return False
         except Exception as e:
             logger.error(f"Telegram error: {e}")
             return False
     
+    def _record_retry_after(self, status: int, error_text: str):
+        """Remember Telegram's retry_after hint from an HTTP 429 response"""
+        self.retry_after = None
+        if status != 429:
+            return
+        try:
+            data = orjson.loads(error_text) if orjson is not None else json.loads(error_text)
+            self.retry_after = data.get("parameters", {}).get("retry_after")
+        except (ValueError, AttributeError):
+            pass
+    
     async def send_product_notification(self, product_name: str, product_url: str, location_name: str, with_buttons: bool = False) -> bool:
         """
         Send a formatted product availability notification
@@ -75,73 +270,65 @@ class TelegramBot:
         Returns:
             True if successful, False otherwise
         """
-        # Use only Telegram-supported HTML tags (avoid <h1>, etc.)
         message = (
             f"<b>🎉 Product Available!</b>\n\n"
-            f"<b>Product:</b> {product_name}\n\n"
-            f"📍<b>Location:</b> <b>{location_name}</b>\n\n"
-            f"<b>Link:</b>\n"
-            f"<a href=\"{product_url}\">Open on Blinkit</a>"
+            f"{self._format_product(product_name, product_url, location_name)}"
         )
 
-        if with_buttons:
-            result = await self.send_message_with_buttons(message)
-        else:
-            result = await self.send_message(message)
+        result = await self.send_message(message, reply_markup=DEFAULT_REPLY_MARKUP if with_buttons else None)
         
         if not result:
             logger.warning("Telegram notification failed — check bot token, channel id, and that the bot is added to the channel/group.")
         return result
     
+    async def send_product_notifications(self, notifications: list) -> bool:
+        """
+        Send several product availability notifications as a single message
+        
+        Args:
+            notifications: List of dicts with send_product_notification arguments
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if len(notifications) == 1:
+            return await self.send_product_notification(**notifications[0])
+
+        message = f"<b>🎉 {len(notifications)} Products Available!</b>\n\n" + "\n\n➖➖➖\n\n".join(
+            self._format_product(n["product_name"], n["product_url"], n["location_name"])
+            for n in notifications
+        )
+
+        with_buttons = any(n.get("with_buttons") for n in notifications)
+        result = await self.send_message(message, reply_markup=DEFAULT_REPLY_MARKUP if with_buttons else None)
+
+        if not result:
+            logger.warning("Telegram notification failed — check bot token, channel id, and that the bot is added to the channel/group.")
+        return result
+
+    @staticmethod
+    def _format_product(product_name: str, product_url: str, location_name: str) -> str:
+        """Format the product, location and link lines of a notification"""
+        # Escaped so '<' or '&' in a product name can't break Telegram's HTML parsing and fail the send
+        return PRODUCT_TEMPLATE.format_map({
+            "name": html.escape(str(product_name)),
+            "location": html.escape(str(location_name)),
+            "url": html.escape(str(product_url), quote=True)
+        })
+    
     async def send_message_with_buttons(self, message: str, buttons: dict = None) -> bool:
         """
-        Send a message with inline buttons
+        Send a message with inline buttons (shorthand for send_message with reply_markup)
         
         Args:
             message: Message text (supports HTML formatting)
-            buttons: Dict of button labels and callback_data (e.g., {"Retry": "retry_watch"})
+            buttons: Dict of button labels and callback_data (default: Retry/Cancel)
         
         Returns:
             True if successful, False otherwise
         """
-        if buttons is None:
-            buttons = {
-                "Retry": "retry_watch",
-                "Cancel": "cancel_watch"
-            }
-        
-        try:
-            url = f"{self.base_url}/sendMessage"
-            
-            # Build inline keyboard
-            inline_keyboard = []
-            for label, callback_data in buttons.items():
-                inline_keyboard.append({
-                    "text": label,
-                    "callback_data": callback_data
-                })
-            
-            payload = {
-                "chat_id": self.channel_id,
-                "text": message,
-                "parse_mode": "HTML",
-                "reply_markup": {
-                    "inline_keyboard": [inline_keyboard]
-                }
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status == 200:
-                        logger.info("✓ Telegram message with buttons sent successfully")
-                        return True
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Telegram send failed (status {response.status}): {error_text}")
-                        return False
-        except Exception as e:
-            logger.error(f"Telegram error: {e}")
-            return False
+        reply_markup = DEFAULT_REPLY_MARKUP if buttons is None else inline_keyboard(buttons)
+        return await self.send_message(message, reply_markup=reply_markup)
     
     def register_callback(self, callback_data: str, handler_func):
         """
@@ -159,29 +346,26 @@ class TelegramBot:
         Poll Telegram for new updates (callback queries from button clicks)
         
         Returns:
-            List of updates from Telegram
+            List of updates from Telegram, or None if the request failed
         """
         try:
-            url = f"{self.base_url}/getUpdates"
-            payload = {
-                "offset": self.last_update_id + 1,
-                "timeout": 10,  # Long polling timeout
-                "allowed_updates": ["callback_query"]  # Only get button clicks
-            }
+            payload = self.get_updates_payload
+            payload["offset"] = self.last_update_id + 1
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("ok"):
-                            return data.get("result", [])
-                    return []
+            status, body = await self._post(self.get_updates_url, payload, timeout=self.get_updates_timeout)
+            if status == 200:
+                data = orjson.loads(body) if orjson is not None else json.loads(body)
+                if data.get("ok"):
+                    return data.get("result", [])
+            # Non-OK replies (e.g. 409 while a webhook is set) won't fix themselves, so make them visible
+            logger.warning(f"Error polling updates (status {status}): {body.decode('utf-8', 'replace')}")
+            return None
         except asyncio.TimeoutError:
             # Long polling timeout is normal
             return []
         except Exception as e:
             logger.debug(f"Error polling updates: {e}")
-            return []
+            return None
     
     async def answer_callback_query(self, callback_query_id: str, text: str = "", show_alert: bool = False):
         """
@@ -193,20 +377,74 @@ class TelegramBot:
             show_alert: If True, show as alert popup; if False, show as toast
         """
         try:
-            url = f"{self.base_url}/answerCallbackQuery"
             payload = {
                 "callback_query_id": callback_query_id,
                 "text": text,
                 "show_alert": show_alert
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status != 200:
-                        logger.warning(f"Failed to answer callback query: {await response.text()}")
+            status, body = await self._post(self.answer_callback_url, payload)
+            if status != 200:
+                logger.warning(f"Failed to answer callback query: {body.decode('utf-8', 'replace')}")
         except Exception as e:
             logger.debug(f"Error answering callback query: {e}")
     
+    def dispatch_update(self, update: dict):
+        """Record an update from getUpdates or the webhook and start handling its button click, if any"""
+        self.last_update_id = update.get("update_id", self.last_update_id)
+        
+        # Check if this is a callback query (button click)
+        callback_query = update.get("callback_query")
+        if callback_query:
+            # Handle in the background so a slow handler doesn't hold up the next poll
+            self._spawn(self._handle_callback(callback_query))
+    
+    def _spawn(self, coro):
+        """Run a coroutine as a background task tracked in _inflight"""
+        task = asyncio.create_task(coro)
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+        return task
+    
+    async def _handle_callback(self, callback_query: dict):
+        """Answer a button click and run its registered handler"""
+        callback_id = callback_query.get("id")
+        from_user = callback_query.get("from", {})
+        user_name = from_user.get("first_name", "User")
+        callback_data = callback_query.get("data", "")
+
+        # Call registered handler if exists
+        if callback_data in self.callback_handlers:
+            logger.info(f"[TELEGRAM] Button clicked by {user_name}: {callback_data}")
+            handler = self.callback_handlers[callback_data]
+            try:
+                # Answer the callback query (show feedback to user) while the handler starts
+                reply = CALLBACK_REPLIES.get(callback_data, DEFAULT_CALLBACK_REPLY)
+                self._spawn(self.answer_callback_query(callback_id, reply, show_alert=False))
+                logger.info(f"[TELEGRAM] Executing {callback_data} handler for {user_name}")
+
+                # Execute the handler
+                async with self._handler_sem:
+                    await handler()
+            except Exception as e:
+                logger.error(f"Error handling callback: {e}")
+                await self.answer_callback_query(callback_id, "Error processing action", show_alert=True)
+        else:
+            now = time.monotonic()
+            last_seen = self._seen_unknown.get(callback_data)
+            if last_seen is not None and now - last_seen < UNKNOWN_CALLBACK_TTL:
+                return  # Repeat click on the same stale button; already reported
+            self._seen_unknown[callback_data] = now
+            self._seen_unknown.move_to_end(callback_data)
+            if len(self._seen_unknown) > UNKNOWN_CALLBACK_CACHE_SIZE:
+                self._seen_unknown.popitem(last=False)
+            
+            if self.answer_unhandled:
+                logger.warning(f"No handler registered for callback from {user_name}: {callback_data}")
+                await self.answer_callback_query(callback_id, "Handler not found", show_alert=True)
+            else:
+                logger.debug(f"No handler registered for callback from {user_name}: {callback_data}")
+    
     async def start_polling(self):
         """
         Start polling for button click callbacks (runs in background)
@@ -216,54 +454,125 @@ class TelegramBot:
             return
         
         self.is_polling = True
+        # getUpdates is refused (409 Conflict) while a webhook is registered
+        if not await self.delete_webhook():
+            logger.warning("[TELEGRAM] Could not delete webhook; polling may be refused")
         logger.info("[TELEGRAM] Started polling for button callbacks...")
         
+        backoff = POLL_BACKOFF_MIN
         while self.is_polling:
             try:
                 updates = await self.get_updates()
+                if updates is None:
+                    # Failed polls return at once; back off (with jitter) so an outage isn't hammered
+                    await asyncio.sleep(backoff * random.random())
+                    backoff = min(backoff * 2, POLL_BACKOFF_MAX)
+                    continue
+                backoff = POLL_BACKOFF_MIN
                 
                 for update in updates:
-                    self.last_update_id = update.get("update_id", self.last_update_id)
-                    
-                    # Check if this is a callback query (button click)
-                    callback_query = update.get("callback_query")
-                    if callback_query:
-                        callback_id = callback_query.get("id")
-                        from_user = callback_query.get("from", {})
-                        user_name = from_user.get("first_name", "User")
-                        callback_data = callback_query.get("data", "")
-                        
-                        logger.info(f"[TELEGRAM] Button clicked by {user_name}: {callback_data}")
-                        
-                        # Call registered handler if exists
-                        if callback_data in self.callback_handlers:
-                            handler = self.callback_handlers[callback_data]
-                            try:
-                                # Answer the callback query (show feedback to user)
-                                if callback_data == "retry_watch":
-                                    await self.answer_callback_query(callback_id, "🔄 Restarting watch...", show_alert=False)
-                                    logger.info(f"[TELEGRAM] Executing retry handler for {user_name}")
-                                elif callback_data == "cancel_watch":
-                                    await self.answer_callback_query(callback_id, "❌ Watch cancelled", show_alert=False)
-                                    logger.info(f"[TELEGRAM] Executing cancel handler for {user_name}")
-                                else:
-                                    await self.answer_callback_query(callback_id, "✓ Processing...", show_alert=False)
-                                
-                                # Execute the handler
-                                await handler()
-                            except Exception as e:
-                                logger.error(f"Error handling callback: {e}")
-                                await self.answer_callback_query(callback_id, "Error processing action", show_alert=True)
-                        else:
-                            logger.warning(f"No handler registered for callback: {callback_data}")
-                            await self.answer_callback_query(callback_id, "Handler not found", show_alert=True)
-                
-                # Small delay to avoid busy waiting
-                await asyncio.sleep(0.1)
+                    self.dispatch_update(update)
                 
             except Exception as e:
                 logger.error(f"Error in polling loop: {e}")
-                await asyncio.sleep(1)  # Wait before retrying
+                await asyncio.sleep(backoff * random.random())  # Wait before retrying
+                backoff = min(backoff * 2, POLL_BACKOFF_MAX)
+    
+    async def set_webhook(self, url: str, secret_token: str = None) -> bool:
+        """
+        Ask Telegram to push button clicks to a webhook instead of waiting for getUpdates
+        
+        Args:
+            url: Public HTTPS URL Telegram should POST updates to
+            secret_token: Value Telegram sends back in the X-Telegram-Bot-Api-Secret-Token header
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        payload = {"url": url, "allowed_updates": ["callback_query"]}
+        if secret_token:
+            payload["secret_token"] = secret_token
+        try:
+            status, body = await self._post(self.set_webhook_url, payload)
+            if status == 200:
+                return True
+            logger.error(f"Telegram setWebhook failed (status {status}): {body.decode('utf-8', 'replace')}")
+        except Exception as e:
+            logger.error(f"Telegram setWebhook error: {e}")
+        return False
+    
+    async def delete_webhook(self) -> bool:
+        """Remove the webhook so getUpdates polling works again"""
+        try:
+            status, _ = await self._post(self.delete_webhook_url, {})
+            return status == 200
+        except Exception as e:
+            logger.debug(f"Error deleting webhook: {e}")
+            return False
+    
+    async def start_webhook(self, url: str, secret_token: str, host: str = "127.0.0.1", port: int = 8443, path: str = "/telegram") -> bool:
+        """
+        Serve a webhook endpoint for button callbacks and register it with Telegram
+        
+        Alternative to start_polling: nothing is held open while idle, and each click arrives as a single push.
+        TLS must be terminated in front of this server (reverse proxy or tunnel) that forwards url here.
+        
+        Args:
+            url: Public HTTPS URL that reaches host:port/path
+            secret_token: Shared secret checked on every request (required)
+            host: Interface to listen on (loopback by default; the proxy forwards to it)
+            port: Port to listen on
+            path: URL path of the endpoint
+        
+        Returns:
+            True if the server started and Telegram accepted the webhook
+        
+        Raises:
+            ValueError: If secret_token is empty
+        """
+        if not secret_token:
+            raise ValueError("start_webhook requires a secret_token")
+        if self.webhook_runner:
+            logger.warning("Webhook already started")
+            return True
+        
+        async def handle(request):
+            if request.headers.get("X-Telegram-Bot-Api-Secret-Token") != secret_token:
+                return web.Response(status=403)
+            body = await request.read()
+            try:
+                update = orjson.loads(body) if orjson is not None else json.loads(body)
+            except ValueError:
+                return web.Response(status=400)
+            self.dispatch_update(update)
+            return web.Response()
+        
+        app = web.Application()
+        app.router.add_post(path, handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except OSError as e:
+            logger.error(f"Could not start webhook server on {host}:{port}: {e}")
+            await runner.cleanup()
+            return False
+        self.webhook_runner = runner
+        
+        if not await self.set_webhook(url, secret_token):
+            await self.stop_webhook()
+            return False
+        logger.info(f"[TELEGRAM] Receiving button callbacks via webhook on {host}:{port}{path}")
+        return True
+    
+    async def stop_webhook(self):
+        """Unregister the webhook and stop its server"""
+        if not self.webhook_runner:
+            return
+        await self.delete_webhook()
+        await self.webhook_runner.cleanup()
+        self.webhook_runner = None
+        logger.info("[TELEGRAM] Stopped webhook server")
     
     async def stop_polling(self):
         """
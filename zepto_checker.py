@@ -7,15 +7,26 @@ Zepto Product Checker
 """
 
 import asyncio
+import difflib
 import json
 import logging
 import os
+import re
 import sys
 import time
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
-from fuzzywuzzy import fuzz
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:  # Fall back to difflib when rapidfuzz is not installed
+    fuzz = None
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
 
 # Load environment variables from .env file
 env_path = Path(__file__).parent / ".env"
@@ -33,11 +44,203 @@ from src.telegram.service import TelegramBot
 # Status file location
 ZEPTO_STATUS_FILE = Path("zepto_status.json")
 ZEPTO_URLS_FILE = Path("zepto/hot-wheels-urls.txt")
+# Selectors that worked on a previous run, tried first next time
+ZEPTO_SELECTORS_FILE = Path("zepto_selectors.json")
+# An unchanged status is rewritten at most this often (seconds); transitions are always written
+STATUS_REFRESH_INTERVAL = 60
+
+# Reads the product page's stock state in one round-trip: out-of-stock text/classes and a visible Add to Cart button
+STOCK_STATE_JS = """() => {
+    const visible = (el) => !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+    const text = (document.body && document.body.innerText) || '';
+    const outOfStock = /out of stock/i.test(text)
+        || [...document.querySelectorAll("[class*='outofstock' i], [class*='out-of-stock' i]")].some(visible);
+    const addToCart = [...document.querySelectorAll("button[aria-label='Add to Cart'], div[aria-label='Add to Cart'] button")].some(visible)
+        || [...document.querySelectorAll('button')].some((b) => visible(b) && /add to cart/i.test(b.innerText));
+    return {outOfStock, addToCart};
+}"""
+
+# Reads every logged-in signal in one round-trip: visible account/profile UI, the saved-address
+# location button, auth data in localStorage and whether the page has real content
+LOGIN_STATE_JS = """() => {
+    const visible = (el) => !!(el && (el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+    const anyVisible = (sel) => [...document.querySelectorAll(sel)].some(visible);
+    const hasText = (sel, labels) => [...document.querySelectorAll(sel)].some(
+        (el) => visible(el) && labels.some((label) => (el.innerText || '').toLowerCase().includes(label)));
+    const indicator = anyVisible([
+        "button[aria-label='Account']",
+        "button[aria-label='Profile']",
+        "[data-testid='user-menu']",
+        "[data-testid='user-profile']",
+        "[class*='user-profile']",
+        "[class*='user-menu']",
+        "[class*='account']"
+    ].join(', '))
+        || hasText('a', ['my orders', 'addresses', 'my account'])
+        || hasText('button', ['account', 'profile']);
+    const location = [...document.querySelectorAll("h3[data-testid='user-address']")]
+        .some((h3) => visible(h3.closest('button')));
+    let storage = false;
+    try {
+        storage = !!(localStorage.getItem('user') || localStorage.getItem('auth') || localStorage.getItem('token')
+            || localStorage.getItem('userId') || localStorage.getItem('uid'));
+    } catch (e) {}
+    const content = document.querySelector('[class*="product"]') !== null
+        || document.querySelector('[class*="categor"]') !== null
+        || document.querySelectorAll('[class*="main"], [class*="content"], main').length > 0;
+    return {indicator, location, storage, content};
+}"""
+
+# Cookie names that may belong to a signed-in session (mirrors the localStorage keys checked in LOGIN_STATE_JS).
+# Generic names like these can also be set for anonymous or analytics sessions, so a match is only a hint.
+AUTH_COOKIE_NAMES = frozenset({
+    "user", "auth", "token", "userId", "uid",
+    "accessToken", "access_token", "auth_token", "authToken", "refreshToken", "sessionId"
+})
+
+# Clicks the first button whose text contains the (lowercased) label and returns that text, or null
+CLICK_BUTTON_BY_TEXT_JS = """(label) => {
+    for (const button of document.querySelectorAll('button')) {
+        const text = button.textContent;
+        if (text && text.toLowerCase().includes(label)) {
+            button.click();
+            return text;
+        }
+    }
+    return null;
+}"""
+
+# Seconds remaining at which the post-login cookie wait logs its countdown
+COOKIE_WAIT_LOG_MARKS = (90, 60, 30, 5, 4, 3, 2, 1)
+
+# Requests aborted while monitoring: images, fonts and media plus analytics beacons, none of which affect stock detection
+BLOCKED_REQUESTS_RE = re.compile(
+    r"\.(?:png|jpe?g|webp|avif|gif|svg|ico|woff2?|ttf|otf|mp4|webm)(?:[?#]|$)"
+    r"|//[^/]*(?:google-analytics\.com|googletagmanager\.com|segment\.(?:io|com)|hotjar\.com"
+    r"|clevertap-prod\.com|facebook\.net|doubleclick\.net)/",
+    re.IGNORECASE
+)
+
+# Page is ready for the stock check once the stock state has rendered either way
+STOCK_READY_JS = "() => { const state = (" + STOCK_STATE_JS + ")(); return state.outOfStock || state.addToCart; }"
+# Longest wait (ms) for the page to settle after a navigation or click
+SETTLE_TIMEOUT = 5000
+
+# Element probes, each joined into one selector list so Playwright runs a single query per group
+ADD_TO_CART_CSS = ", ".join([
+    "button[aria-label='Add to Cart']",
+    "button:has-text('Add To Cart')",
+    "div[aria-label='Add to Cart'] button",
+    "button:has-text('Add to Cart')"
+])
+CART_BUTTON_CSS = ", ".join([
+    "button[aria-label='Cart']",
+    "button[data-testid='cart-btn']",
+    "div.group button[data-testid='cart-btn']"
+])
+ADDRESS_BUTTON_CSS = ", ".join([
+    "button:has(h3[data-testid='user-address'])",
+    "button[data-testid='user-address']",
+    "[data-testid='user-address']"
+])
+# Open cart drawer or checkout page: the drawer itself, its bill summary or its pay/checkout button
+CART_OPEN_CSS = ", ".join([
+    "[data-testid='cart-drawer']",
+    "[role='dialog']:has-text('Bill')",
+    ":is(h2, h3, h4, h5, p, span):has-text('Bill Details')",
+    "button:has-text('Click to Pay')",
+    "button:has-text('Proceed')",
+    "button:has-text('Add Address')"
+])
+# The product's own details; its Add to Cart button is preferred over the ones in related-product carousels
+PRODUCT_SECTION_CSS = "#product-features-wrapper"
+LOCATION_MODAL_CSS = ", ".join([
+    "div[data-testid='address-model']",  # Original (typo in Zepto?)
+    "div[data-testid='address-modal']",  # Correct spelling
+    "[role='dialog']",
+    "div[class*='modal']",
+    "div[class*='Modal']"
+])
+
+# Stock fields looked for in Zepto's JSON API responses -> whether True means out of stock
+STOCK_KEYS = {
+    "outOfStock": True, "isOutOfStock": True, "out_of_stock": True, "soldOut": True, "isSoldOut": True,
+    "inStock": False, "isInStock": False, "in_stock": False, "available": False, "isAvailable": False
+}
+
+def dumps_json(data):
+    """Serialize data to indented JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+def loads_json(data):
+    """Parse JSON text or bytes with orjson when available"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def find_stock_flag(data, product_id):
+    """
+    Find the out-of-stock flag of product_id in a JSON API response
+    
+    Only objects that carry product_id as a value (and their children) are searched,
+    so recommendations for other products on the same response are ignored.
+    
+    Returns:
+        True if out of stock, False if in stock, None if the response has no stock field for the product
+    """
+    stack = [(data, False)]
+    while stack:
+        node, in_product = stack.pop()
+        if isinstance(node, list):
+            stack.extend((item, in_product) for item in node)
+            continue
+        if not isinstance(node, dict):
+            continue
+        in_product = in_product or product_id in node.values()
+        if in_product:
+            for key, means_out_of_stock in STOCK_KEYS.items():
+                value = node.get(key)
+                if isinstance(value, bool):
+                    return value == means_out_of_stock
+        stack.extend((value, in_product) for value in node.values() if isinstance(value, (dict, list)))
+    return None
 
 # ANSI color codes
 PRODUCT_COLOR = '\033[95m'  # Magenta
 RESET_COLOR = '\033[0m'
 
+async def settle(locator, state="visible", timeout=SETTLE_TIMEOUT):
+    """Wait until locator reaches state; returns False on timeout instead of raising"""
+    try:
+        await locator.wait_for(state=state, timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+async def click_visible(page, css, scope=None, timeout=SETTLE_TIMEOUT):
+    """
+    Click the first visible match of css, preferring matches inside scope
+    
+    Waits for any visible match on the page, then clicks one under scope if there is one,
+    falling back to the first visible match anywhere on the page.
+    
+    Returns:
+        The locator that was clicked, or None if nothing visible matched in time
+    """
+    anywhere = page.locator(css).locator("visible=true").first
+    try:
+        await anywhere.wait_for(state="visible", timeout=timeout)
+        locator = anywhere
+        if scope:
+            scoped = page.locator(scope).locator(css).locator("visible=true").first
+            if await scoped.count():
+                locator = scoped
+        await locator.click(timeout=timeout)
+        return locator
+    except Exception as e:
+        logger.debug("No visible match for %s: %s", css, e)
+        return None
+
 def colorize_product(name):
     """Wrap product name with color codes"""
     return f"{PRODUCT_COLOR}{name}{RESET_COLOR}"
@@ -52,43 +255,54 @@ def play_alert_sound():
         else:
             print('\a', end='', flush=True)
     except Exception as e:
-        logger.debug(f"Failed to play alert sound: {e}")
+        logger.debug("Failed to play alert sound: %s", e)
 
 
 class OrdinalDateFormatter(logging.Formatter):
     """Custom formatter with ordinal dates and colored output"""
     
+    # (time, level, message) colors per level
     LEVEL_COLORS = {
-        'DEBUG': {'time': '\033[36m', 'level': '\033[36m', 'message': '\033[36m'},
-        'INFO': {'time': '\033[94m', 'level': '\033[92m', 'message': '\033[92m'},
-        'WARNING': {'time': '\033[94m', 'level': '\033[93m', 'message': '\033[93m'},
-        'ERROR': {'time': '\033[94m', 'level': '\033[91m', 'message': '\033[91m'},
-        'CRITICAL': {'time': '\033[94m', 'level': '\033[95m', 'message': '\033[95m'}
+        'DEBUG': ('\033[36m', '\033[36m', '\033[36m'),
+        'INFO': ('\033[94m', '\033[92m', '\033[92m'),
+        'WARNING': ('\033[94m', '\033[93m', '\033[93m'),
+        'ERROR': ('\033[94m', '\033[91m', '\033[91m'),
+        'CRITICAL': ('\033[94m', '\033[95m', '\033[95m')
     }
     
     RESET = '\033[0m'
     
+    # Day of month -> ordinal string ("1st", "2nd", ... "31st"); index 0 unused
+    ORDINALS = tuple(
+        f"{d}{'th' if 10 <= d % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(d % 10, 'th')}"
+        for d in range(32)
+    )
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Per-level "%s" template with the colored time/level/message pre-joined
+        self._templates = {}
+        # Records within the same second share one formatted date string
+        self._cache_sec = None
+        self._cache_date = None
+    
+    def _template(self, levelname):
+        template = self._templates.get(levelname)
+        if template is None:
+            ct, cl, cm = self.LEVEL_COLORS.get(levelname, self.LEVEL_COLORS['INFO'])
+            template = f"{ct}%s{self.RESET} - {cl}{levelname}{self.RESET} - {cm}%s{self.RESET}"
+            self._templates[levelname] = template
+        return template
+    
     def format(self, record):
-        dt = datetime.fromtimestamp(record.created)
-        day = dt.day
-        month = dt.strftime('%b')
-        year = dt.year
-        time_str = dt.strftime('%I:%M:%S %p')
+        # Ordinal date, recomputed at most once per second
+        sec = int(record.created)
+        if sec != self._cache_sec:
+            dt = datetime.fromtimestamp(sec)
+            self._cache_date = f"{self.ORDINALS[dt.day]} {dt.strftime('%b')} {dt.year} {dt.strftime('%I:%M:%S %p')}"
+            self._cache_sec = sec
         
-        if 10 <= day % 100 <= 20:
-            suffix = 'th'
-        else:
-            suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(day % 10, 'th')
-        
-        ordinal_date = f"{day}{suffix} {month} {year} {time_str}"
-        colors = self.LEVEL_COLORS.get(record.levelname, self.LEVEL_COLORS['INFO'])
-        
-        colored_time = f"{colors['time']}{ordinal_date}{self.RESET}"
-        colored_level = f"{colors['level']}{record.levelname}{self.RESET}"
-        colored_message = f"{colors['message']}{record.getMessage()}{self.RESET}"
-        
-        log_message = f"{colored_time} - {colored_level} - {colored_message}"
-        return log_message
+        return self._template(record.levelname) % (self._cache_date, record.getMessage())
 
 
 # Configure logging
@@ -125,9 +339,27 @@ class ZeptoChecker:
         """
         self.product_url = product_url
         self.product_name = product_name
+        # Lowercased once for the name check in add_to_cart
+        self._expected_lower = (product_name or "").lower()
         self.location_label = location_label or "home"
         self.check_interval = check_interval
         self.query_count = 0
+        # Product variant ID from ".../pn/<slug>/pvid/<id>" URLs, used to find the product in API responses
+        path = product_url.split("?", 1)[0].rstrip("/")
+        self.product_id = path.rsplit("/pvid/", 1)[1] if "/pvid/" in path else None
+        # JSON endpoint the product page loads its stock state from, found during the first page check
+        self.stock_api_url = None
+        self.last_product_name = product_name
+        # Colored form of last_product_name for log lines, rebuilt only when the name changes
+        self._colored_name = colorize_product(product_name)
+        # Status file for this product (watch_many gives each product its own)
+        self.status_file = ZEPTO_STATUS_FILE
+        # Last status written to the status file and when, so repeated polls skip the rewrite
+        self._last_status = None
+        self._last_write_ts = 0.0
+        # Product names read from the page, keyed by page URL; cleared on every product page load
+        self._name_cache = {}
+        self._winning_selectors = self.load_winning_selectors()
         self.page = None
         self.browser = None
         self.context = None
@@ -138,119 +370,100 @@ class ZeptoChecker:
             self.telegram_bot = TelegramBot(telegram_bot_token, telegram_channel_id)
 
     async def save_cookies(self):
-        """Save cookies from current context to file"""
+        """Save cookies and local storage from current context to file"""
         try:
             if self.context:
-                cookies = await self.context.cookies()
-                with open(self.ZEPTO_COOKIES_FILE, 'w') as f:
-                    json.dump(cookies, f, indent=2)
-                logger.info(f"[OK] Cookies saved to {self.ZEPTO_COOKIES_FILE}")
+                await self.context.storage_state(path=str(self.ZEPTO_COOKIES_FILE))
+                logger.info("[OK] Cookies saved to %s", self.ZEPTO_COOKIES_FILE)
                 return True
         except Exception as e:
-            logger.debug(f"Error saving cookies: {e}")
+            logger.debug("Error saving cookies: %s", e)
         return False
 
-    async def load_cookies(self):
-        """Load cookies from file into context"""
+    def prepare_saved_session(self):
+        """
+        Check for a saved session the browser context can be created from
+        
+        Older versions saved a bare cookie list; it is rewritten in place as
+        Playwright storage state so new_context(storage_state=...) can read it.
+        """
         try:
             if not self.ZEPTO_COOKIES_FILE.exists():
                 logger.info("No saved cookies found")
                 return False
             
-            with open(self.ZEPTO_COOKIES_FILE, 'r') as f:
-                cookies = json.load(f)
+            with open(self.ZEPTO_COOKIES_FILE, 'rb') as f:
+                state = loads_json(f.read())
             
-            if self.context:
-                await self.context.add_cookies(cookies)
-                logger.info(f"[OK] Cookies loaded from {self.ZEPTO_COOKIES_FILE}")
-                return True
+            if isinstance(state, list):
+                state = {"cookies": state, "origins": []}
+                with open(self.ZEPTO_COOKIES_FILE, 'wb') as f:
+                    f.write(dumps_json(state))
+            return True
         except Exception as e:
-            logger.debug(f"Error loading cookies: {e}")
+            logger.debug("Error loading cookies: %s", e)
         return False
 
+    async def has_auth_cookie(self):
+        """Check the browser context for a likely auth cookie without touching the page"""
+        try:
+            cookies = await self.context.cookies("https://www.zepto.com")
+            return any(cookie["name"] in AUTH_COOKIE_NAMES and cookie.get("value") for cookie in cookies)
+        except Exception as e:
+            logger.debug("Could not read cookies: %s", e)
+            return False
+
     async def is_logged_in(self):
-        """Check if user is logged in by checking for logged-in indicators and URL changes"""
+        """Check if user is logged in by checking for auth cookies, logged-in indicators and URL changes"""
         try:
-            # First check: Look for logged-in UI indicators
-            # Check for signs of being logged in - look for account/profile elements
-            # Common indicators: user menu, order history link, saved addresses, etc.
-            logged_in_indicators = [
-                "button[aria-label='Account']",
-                "button[aria-label='Profile']",
-                "[data-testid='user-menu']",
-                "[data-testid='user-profile']",
-                "a:has-text('My Orders')",
-                "a:has-text('Addresses')",
-                "a:has-text('My Account')",
-                "button:has-text('Account')",
-                "button:has-text('Profile')",
-                "[class*='user-profile']",
-                "[class*='user-menu']",
-                "[class*='account']"
-            ]
+            # An auth-looking cookie is only a hint; the page signals below decide
+            if await self.has_auth_cookie():
+                logger.debug("Found a possible auth cookie - confirming on the page")
             
-            for indicator in logged_in_indicators:
-                try:
-                    if await self.page.is_visible(indicator, timeout=2000):
-                        logger.info("[OK] User is logged in - found UI indicator")
-                        return True
-                except Exception:
-                    pass
+            # All page-side checks run in one round-trip; the URL check stays here since it needs no page access
+            signals = await self.page.evaluate(LOGIN_STATE_JS)
+            
+            # First check: Look for logged-in UI indicators (account/profile elements, order history, saved addresses)
+            if signals.get("indicator"):
+                logger.info("[OK] User is logged in - found UI indicator")
+                return True
             
             # Second check: Look for the location selector button which typically appears when logged in
-            # The location selector has the user's saved address
-            try:
-                location_selector = "button:has(h3[data-testid='user-address'])"
-                if await self.page.is_visible(location_selector, timeout=2000):
-                    logger.info("[OK] User is logged in - found location selector")
-                    return True
-            except Exception:
-                pass
+            if signals.get("location"):
+                logger.info("[OK] User is logged in - found location selector")
+                return True
             
-            # Third check: Check if we can find any user-related cookies or local storage
-            try:
-                # Check for presence of user data in local storage
-                user_data = await self.page.evaluate("""
-                    () => {
-                        // Check if user data is in localStorage
-                        const userToken = localStorage.getItem('user') || localStorage.getItem('auth') || localStorage.getItem('token');
-                        const userId = localStorage.getItem('userId') || localStorage.getItem('uid');
-                        return (userToken || userId) ? true : false;
-                    }
-                """)
-                if user_data:
-                    logger.info("[OK] User is logged in - found auth token in storage")
-                    return True
-            except Exception as e:
-                logger.debug(f"Could not check localStorage: {e}")
+            # Third check: Check for presence of user data in local storage
+            if signals.get("storage"):
+                logger.info("[OK] User is logged in - found auth token in storage")
+                return True
             
-            # Fourth check: Look at current URL and check if it redirects (logged out users get redirected)
-            try:
-                current_url = self.page.url
-                # If we're still on zepto.com and not on a login/redirect page, likely logged in
-                if "zepto.com" in current_url and "login" not in current_url.lower() and "auth" not in current_url.lower():
-                    # Check if page has main content (not a login/empty page)
-                    has_content = await self.page.evaluate("""
-                        () => {
-                            // Check if page has actual content beyond login elements
-                            const hasProducts = document.querySelector('[class*="product"]') !== null;
-                            const hasCategories = document.querySelector('[class*="categor"]') !== null;
-                            const hasMainContent = document.querySelectorAll('[class*="main"], [class*="content"], main').length > 0;
-                            return hasProducts || hasCategories || hasMainContent;
-                        }
-                    """)
-                    if has_content:
-                        logger.info("[OK] User is logged in - found main content on page")
-                        return True
-            except Exception as e:
-                logger.debug(f"Could not check page content: {e}")
+            # Fourth check: If we're still on zepto.com and not on a login/redirect page with main content, likely logged in
+            current_url = self.page.url
+            if "zepto.com" in current_url and "login" not in current_url.lower() and "auth" not in current_url.lower():
+                if signals.get("content"):
+                    logger.info("[OK] User is logged in - found main content on page")
+                    return True
             
             logger.info("[INFO] User appears to be logged out")
             return False
         except Exception as e:
-            logger.debug(f"Error checking login status: {e}")
+            logger.debug("Error checking login status: %s", e)
             return False
 
+    async def wait_for_cookie_storage(self, wait_time=90):
+        """Sleep once for wait_time seconds, logging the countdown from scheduled callbacks"""
+        loop = asyncio.get_running_loop()
+        handles = [
+            loop.call_later(wait_time - remaining, logger.info, "Storing cookies... (%ss remaining)", remaining)
+            for remaining in COOKIE_WAIT_LOG_MARKS if remaining <= wait_time
+        ]
+        try:
+            await asyncio.sleep(wait_time)
+        finally:
+            for handle in handles:
+                handle.cancel()
+
     async def login(self):
         """Manual login - user needs to authenticate"""
         try:
@@ -280,12 +493,7 @@ class ZeptoChecker:
                     logger.info("Waiting for more than 1 minute to ensure cookies are properly stored...")
                     
                     # Wait for more than 1 minute (90 seconds) for cookies to be fully stored
-                    wait_time = 90
-                    for i in range(wait_time):
-                        remaining = wait_time - i
-                        if remaining % 30 == 0 or remaining <= 5:
-                            logger.info(f"Storing cookies... ({remaining}s remaining)")
-                        await asyncio.sleep(1)
+                    await self.wait_for_cookie_storage()
                     
                     # Save cookies for future use
                     logger.info("Saving authentication cookies...")
@@ -304,7 +512,7 @@ class ZeptoChecker:
                 await asyncio.sleep(check_interval)
                 waited += check_interval
                 remaining_time = max_wait - waited
-                logger.info(f"Waiting for login... ({waited}s elapsed, {remaining_time}s remaining)")
+                logger.info("Waiting for login... (%ss elapsed, %ss remaining)", waited, remaining_time)
             
             # Timeout reached - ask user for manual confirmation
             logger.info("=" * 70)
@@ -323,12 +531,7 @@ class ZeptoChecker:
                 logger.info("Waiting for more than 1 minute to ensure cookies are properly stored...")
                 
                 # Wait for more than 1 minute (90 seconds) for cookies to be fully stored
-                wait_time = 90
-                for i in range(wait_time):
-                    remaining = wait_time - i
-                    if remaining % 30 == 0 or remaining <= 5:
-                        logger.info(f"Storing cookies... ({remaining}s remaining)")
-                    await asyncio.sleep(1)
+                await self.wait_for_cookie_storage()
                 
                 # Save cookies
                 if await self.save_cookies():
@@ -342,11 +545,38 @@ class ZeptoChecker:
                 return False
             
         except Exception as e:
-            logger.error(f"Error during login: {e}")
+            logger.error("Error during login: %s", e)
             return False
 
+    def load_winning_selectors(self):
+        """Load the selectors that worked on previous runs"""
+        try:
+            if ZEPTO_SELECTORS_FILE.exists():
+                with open(ZEPTO_SELECTORS_FILE, 'rb') as f:
+                    return loads_json(f.read())
+        except Exception as e:
+            logger.debug("Error loading saved selectors: %s", e)
+        return {}
+
+    def remember_selector(self, key, selector):
+        """Record the selector that worked for key, rewriting the file only when it changed"""
+        if self._winning_selectors.get(key) == selector:
+            return
+        self._winning_selectors[key] = selector
+        try:
+            tmp_path = ZEPTO_SELECTORS_FILE.with_suffix(".tmp")
+            tmp_path.write_bytes(dumps_json(self._winning_selectors))
+            os.replace(tmp_path, ZEPTO_SELECTORS_FILE)
+        except Exception as e:
+            logger.debug("Error saving selectors: %s", e)
+
     def write_status(self, status, details=None):
-        """Write status to JSON file"""
+        """Write status to JSON file (skipped while the status is unchanged and recently written)"""
+        now = time.monotonic()
+        if status == self._last_status and now - self._last_write_ts < STATUS_REFRESH_INTERVAL:
+            logger.info("Status: %s", status)
+            return True
+        
         status_data = {
             "product_url": self.product_url,
             "product_name": self.product_name,
@@ -359,12 +589,16 @@ class ZeptoChecker:
         }
         
         try:
-            with open(ZEPTO_STATUS_FILE, 'w') as f:
-                json.dump(status_data, f, indent=2)
-            logger.info(f"Status: {status}")
+            # Write to a temp file and swap it in so readers never see partial JSON
+            tmp_path = self.status_file.with_suffix(".tmp")
+            tmp_path.write_bytes(dumps_json(status_data))
+            os.replace(tmp_path, self.status_file)
+            self._last_status = status
+            self._last_write_ts = now
+            logger.info("Status: %s", status)
             return True
         except Exception as e:
-            logger.error(f"Error writing status file: {e}")
+            logger.error("Error writing status file: %s", e)
             return False
 
     async def select_location(self, page, location_label):
@@ -376,7 +610,7 @@ class ZeptoChecker:
             location_label: Location label to select (e.g., 'home')
         """
         try:
-            logger.info(f"Selecting location: {location_label}...")
+            logger.info("Selecting location: %s...", location_label)
             
             # First approach: Try to find and click the location button by text content
             # This is more flexible than aria-label
@@ -385,71 +619,32 @@ class ZeptoChecker:
                 location_text_selector = f"button:has-text('{location_label}')"
                 if await page.is_visible(location_text_selector, timeout=3000):
                     await page.click(location_text_selector, timeout=5000)
-                    logger.info(f"[OK] Location button clicked via text selector")
-                    await asyncio.sleep(1)
+                    logger.info("[OK] Location button clicked via text selector")
+                    await settle(page.locator(LOCATION_MODAL_CSS).first, "hidden")
                     return True
             except Exception as e:
-                logger.debug(f"Text selector approach failed: {e}")
+                logger.debug("Text selector approach failed: %s", e)
             
-            # Second approach: Click the user address button (more generic)
+            # Second approach: Click the user address button (more generic; an h3 address is clicked via its parent button)
             try:
-                address_button_selectors = [
-                    "button:has(h3[data-testid='user-address'])",
-                    "button[data-testid='user-address']",
-                    "[data-testid='user-address']",
-                    "h3[data-testid='user-address']"
-                ]
-                
-                for selector in address_button_selectors:
-                    try:
-                        if await page.is_visible(selector, timeout=2000):
-                            # If it's an h3, click the parent button
-                            if "h3" in selector:
-                                button = await page.query_selector(f"button:has({selector})")
-                                if button:
-                                    await button.click()
-                                    logger.info(f"[OK] Location button clicked (parent of user-address)")
-                                    break
-                            else:
-                                await page.click(selector, timeout=5000)
-                                logger.info(f"[OK] Location button clicked (user-address)")
-                                break
-                    except Exception:
-                        pass
-                
-                await asyncio.sleep(2)
+                address_button = page.locator(ADDRESS_BUTTON_CSS).first
+                if await address_button.is_visible():
+                    await address_button.click(timeout=5000)
+                    logger.info("[OK] Location button clicked (user-address)")
             except Exception as e:
-                logger.debug(f"Address button approach failed: {e}")
+                logger.debug("Address button approach failed: %s", e)
             
-            # Third approach: Look for modal with any of the possible selectors
+            # Third approach: Look for modal with any of the possible selectors (waits for it to open after the click)
             logger.info("Looking for location modal...")
             
-            modal_selectors = [
-                "div[data-testid='address-model']",  # Original (typo in Zepto?)
-                "div[data-testid='address-modal']",  # Correct spelling
-                "[role='dialog']",
-                "div[class*='modal']",
-                "div[class*='Modal']"
-            ]
-            
-            modal_found = False
-            for modal_selector in modal_selectors:
-                try:
-                    if await page.is_visible(modal_selector, timeout=3000):
-                        logger.info(f"[OK] Modal found with selector: {modal_selector}")
-                        modal_found = True
-                        break
-                except Exception:
-                    pass
-            
-            if not modal_found:
+            if await settle(page.locator(LOCATION_MODAL_CSS).first):
+                logger.info("[OK] Location modal found")
+            else:
                 logger.warning("Modal not found with standard selectors, trying alternative approach...")
-                # Sometimes the modal might already be open from the click
-                await asyncio.sleep(2)
             
             # Fourth approach: Look for the location option in the modal
             # Try by text content (most reliable)
-            logger.info(f"Searching for '{location_label}' option in modal...")
+            logger.info("Searching for '%s' option in modal...", location_label)
             
             location_option_selectors = [
                 f"button:has-text('{location_label.capitalize()}')",
@@ -458,6 +653,12 @@ class ZeptoChecker:
                 f"div:has-text('{location_label}')",
                 f"span:has-text('{location_label}')"
             ]
+            # Try the selector that worked last time first
+            selector_key = f"location_option:{location_label}"
+            cached_selector = self._winning_selectors.get(selector_key)
+            if cached_selector in location_option_selectors:
+                location_option_selectors.remove(cached_selector)
+                location_option_selectors.insert(0, cached_selector)
             
             location_clicked = False
             for option_selector in location_option_selectors:
@@ -465,7 +666,7 @@ class ZeptoChecker:
                     # Check if element is visible
                     elements = await page.query_selector_all(option_selector)
                     if elements:
-                        logger.debug(f"Found {len(elements)} element(s) with selector: {option_selector}")
+                        logger.debug("Found %s element(s) with selector: %s", len(elements), option_selector)
                         
                         # Click the first one that's visible
                         for element in elements:
@@ -473,8 +674,9 @@ class ZeptoChecker:
                                 is_visible = await element.is_visible()
                                 if is_visible:
                                     await element.click()
-                                    logger.info(f"[OK] Location '{location_label}' selected")
+                                    logger.info("[OK] Location '%s' selected", location_label)
                                     location_clicked = True
+                                    self.remember_selector(selector_key, option_selector)
                                     break
                             except Exception:
                                 pass
@@ -482,10 +684,10 @@ class ZeptoChecker:
                         if location_clicked:
                             break
                 except Exception as e:
-                    logger.debug(f"Option selector failed ({option_selector}): {e}")
+                    logger.debug("Option selector failed (%s): %s", option_selector, e)
             
             if location_clicked:
-                await asyncio.sleep(2)
+                await settle(page.locator(LOCATION_MODAL_CSS).first, "hidden")
                 logger.info("[OK] Location selected successfully")
                 return True
             
@@ -495,26 +697,34 @@ class ZeptoChecker:
             
             # Last resort: Click the first button we can find (might work if modal is open)
             try:
-                buttons = await page.query_selector_all("button")
-                for button in buttons:
-                    text = await button.text_content()
-                    if text and location_label.lower() in text.lower():
-                        await button.click()
-                        logger.info(f"[OK] Location found and clicked: {text}")
-                        await asyncio.sleep(2)
-                        return True
+                # Matching and clicking both happen in the page, one round-trip for all buttons
+                text = await page.evaluate(CLICK_BUTTON_BY_TEXT_JS, location_label.lower())
+                if text is not None:
+                    logger.info("[OK] Location found and clicked: %s", text)
+                    await settle(page.locator(LOCATION_MODAL_CSS).first, "hidden")
+                    return True
             except Exception as e:
-                logger.debug(f"Last resort button search failed: {e}")
+                logger.debug("Last resort button search failed: %s", e)
             
-            logger.warning(f"[WARNING] Could not select location '{location_label}' - proceeding anyway")
+            logger.warning("[WARNING] Could not select location '%s' - proceeding anyway", location_label)
             return True  # Return True to not block the flow - user might have selected manually
                     
         except Exception as e:
-            logger.error(f"Error selecting location: {e}")
+            logger.error("Error selecting location: %s", e)
             return False
 
     async def get_product_name(self, page):
-        """Extract product name from Zepto product page"""
+        """Extract product name from Zepto product page (cached per page load)"""
+        cached = self._name_cache.get(page.url)
+        if cached:
+            return cached
+        product_name = await self._read_product_name(page)
+        if product_name != "Unknown":
+            self._name_cache[page.url] = product_name
+        return product_name
+
+    async def _read_product_name(self, page):
+        """Read the product name from the page's title elements"""
         try:
             # Product name is in div id "product-features-wrapper" under h1 tag
             h1_selector = "#product-features-wrapper h1"
@@ -524,7 +734,7 @@ class ZeptoChecker:
                 if product_name:
                     return product_name.strip()
             except Exception as e:
-                logger.debug(f"Failed to get product name from h1: {e}")
+                logger.debug("Failed to get product name from h1: %s", e)
             
             # Fallback selectors
             selectors = [
@@ -543,73 +753,101 @@ class ZeptoChecker:
             
             return "Unknown"
         except Exception as e:
-            logger.debug(f"get_product_name error: {e}")
+            logger.debug("get_product_name error: %s", e)
             return "Unknown"
 
+    async def sniff_stock_api(self, response):
+        """Page response handler: remember the first GET JSON endpoint that reports this product's stock"""
+        if self.stock_api_url or response.request.resource_type not in ("xhr", "fetch") or response.request.method != "GET":
+            return
+        try:
+            data = await response.json()
+        except Exception:
+            return
+        if find_stock_flag(data, self.product_id) is not None:
+            self.stock_api_url = response.url
+            logger.info("[OK] Found stock API endpoint - later checks skip the page load: %s", response.url)
+
+    async def check_stock_api(self):
+        """
+        Read the product's stock state from the sniffed JSON endpoint
+        
+        Returns:
+            True if out of stock, False if in stock, None if the endpoint failed (page checks resume)
+        """
+        out_of_stock = None
+        try:
+            response = await self.context.request.get(self.stock_api_url, timeout=10000)
+            if response.ok:
+                out_of_stock = find_stock_flag(await response.json(), self.product_id)
+        except Exception as e:
+            logger.debug("Stock API error: %s", e)
+        if out_of_stock is None:
+            logger.info("Stock API no longer reports the product - falling back to page checks")
+            self.stock_api_url = None
+        return out_of_stock
+
     async def check_product_availability(self):
         """Check if product is available on Zepto"""
         try:
             self.query_count += 1
-            logger.info(f"[CHECK #{self.query_count}] Navigating to product URL...")
+            
+            # Cheap JSON check first; the page is only loaded when it reports stock (or fails),
+            # which also leaves the page ready for add_to_cart
+            if self.stock_api_url and await self.check_stock_api():
+                logger.info("[CHECK #%s] Stock API: out of stock", self.query_count)
+                logger.info("[WAITING] Product %s is Out of Stock...", self._colored_name)
+                self.write_status("out_of_stock", {
+                    "message": "Product is Out of Stock",
+                    "product_name": self.last_product_name,
+                    "last_checked": datetime.now().isoformat()
+                })
+                return False
+            
+            logger.info("[CHECK #%s] Navigating to product URL...", self.query_count)
+            
+            # Watch the page's own API calls for a stock endpoint until one is found
+            sniffing = not self.stock_api_url and self.product_id
+            if sniffing:
+                self.page.on("response", self.sniff_stock_api)
             
             # Navigate to product URL
+            self._name_cache.clear()
             try:
                 await self.page.goto(self.product_url, wait_until="domcontentloaded", timeout=30000)
             except Exception as e:
-                logger.warning(f"Navigation took longer: {e}")
+                logger.warning("Navigation took longer: %s", e)
             
-            await asyncio.sleep(2)
+            # Wait until the page shows its stock state instead of a fixed settle delay
+            try:
+                await self.page.wait_for_function(STOCK_READY_JS, timeout=SETTLE_TIMEOUT)
+            except Exception:
+                logger.debug("Stock state did not render in time")
+            if sniffing:
+                self.page.remove_listener("response", self.sniff_stock_api)
             
             # Get product name
             product_name = await self.get_product_name(self.page)
-            logger.info(f"[PRODUCT] {colorize_product(product_name)}")
+            if product_name != self.last_product_name:
+                self.last_product_name = product_name
+                self._colored_name = colorize_product(product_name)
+            logger.info("[PRODUCT] %s", self._colored_name)
             
-            # Check for "Out of Stock" text
+            # Check for "Out of Stock" and the "Add to Cart" button in a single DOM query
             is_out_of_stock = False
-            try:
-                out_of_stock_indicators = [
-                    "text=Out of Stock",
-                    "text=Out of stock",
-                    "[class*='outofstock' i]",
-                    "[class*='out-of-stock' i]"
-                ]
-                
-                for indicator in out_of_stock_indicators:
-                    try:
-                        if await self.page.is_visible(indicator, timeout=2000):
-                            is_out_of_stock = True
-                            break
-                    except Exception:
-                        pass
-            except Exception as e:
-                logger.debug(f"Error checking out of stock: {e}")
-            
-            # Check for "Add to Cart" button
             add_to_cart_visible = False
             try:
-                # Look for the Add to Cart button - aria-label or button text
-                add_selectors = [
-                    "button[aria-label='Add to Cart']",
-                    "button:has-text('Add To Cart')",
-                    "div[aria-label='Add to Cart'] button",
-                    "button:has-text('Add to Cart')"
-                ]
-                
-                for selector in add_selectors:
-                    try:
-                        if await self.page.is_visible(selector, timeout=2000):
-                            add_to_cart_visible = True
-                            break
-                    except Exception:
-                        pass
+                state = await self.page.evaluate(STOCK_STATE_JS)
+                is_out_of_stock = state["outOfStock"]
+                add_to_cart_visible = state["addToCart"]
             except Exception as e:
-                logger.debug(f"Error checking add to cart button: {e}")
+                logger.debug("Error checking stock state: %s", e)
             
-            logger.info(f"[STATUS] Out of Stock: {is_out_of_stock}, Add to Cart visible: {add_to_cart_visible}")
+            logger.info("[STATUS] Out of Stock: %s, Add to Cart visible: %s", is_out_of_stock, add_to_cart_visible)
             
             if add_to_cart_visible and not is_out_of_stock:
                 # Product is AVAILABLE
-                logger.info(f"[AVAILABLE] Product {colorize_product(product_name)} is now AVAILABLE!")
+                logger.info("[AVAILABLE] Product %s is now AVAILABLE!", self._colored_name)
                 play_alert_sound()
                 
                 self.write_status("available", {
@@ -621,7 +859,7 @@ class ZeptoChecker:
             else:
                 # Product not available
                 status_msg = "Out of Stock" if is_out_of_stock else "Not Available"
-                logger.info(f"[WAITING] Product {colorize_product(product_name)} is {status_msg}...")
+                logger.info("[WAITING] Product %s is %s...", self._colored_name, status_msg)
                 self.write_status(status_msg.lower().replace(" ", "_"), {
                     "message": f"Product is {status_msg}",
                     "product_name": product_name,
@@ -630,7 +868,7 @@ class ZeptoChecker:
                 return False
                 
         except Exception as e:
-            logger.error(f"Error checking product availability: {e}")
+            logger.error("Error checking product availability: %s", e)
             self.write_status("error", {"error": str(e)})
             return False
 
@@ -639,66 +877,43 @@ class ZeptoChecker:
         try:
             logger.info("Step 1: Verifying product details...")
             product_name = await self.get_product_name(self.page)
-            logger.info(f"[VERIFY] Product: {colorize_product(product_name)}")
+            logger.info("[VERIFY] Product: %s", colorize_product(product_name))
             
             # Verify product name matches expected name (fuzzy matching)
             if self.product_name:
-                similarity = fuzz.ratio(product_name.lower(), self.product_name.lower())
+                if fuzz is not None:
+                    # Scores below the cutoff come back as 0 without finishing the comparison
+                    similarity = round(fuzz.ratio(product_name.lower(), self._expected_lower, score_cutoff=70))
+                else:
+                    similarity = round(difflib.SequenceMatcher(None, product_name.lower(), self._expected_lower).ratio() * 100)
                 if similarity < 70:
-                    logger.warning(f"[WARNING] Product name mismatch! Expected: {self.product_name}, Found: {product_name}")
+                    logger.warning("[WARNING] Product name mismatch! Expected: %s, Found: %s", self.product_name, product_name)
                 else:
-                    logger.info(f"[OK] Product name verified (match: {similarity}%)")
+                    logger.info("[OK] Product name verified (match: %s%%)", similarity)
             
             logger.info("Step 2: Clicking Add to Cart button...")
             
-            # Click the Add to Cart button
-            add_selectors = [
-                "button[aria-label='Add to Cart']",
-                "button:has-text('Add To Cart')",
-                "div[aria-label='Add to Cart'] button",
-                "button:has-text('Add to Cart')"
-            ]
-            
-            clicked = False
-            for selector in add_selectors:
-                try:
-                    await self.page.click(selector, timeout=5000)
-                    clicked = True
-                    logger.info("[OK] Add to Cart button clicked")
-                    break
-                except Exception:
-                    pass
-            
-            if not clicked:
+            # Click the product's own visible Add to Cart button (any visible one if it is not in the product section)
+            add_button = await click_visible(self.page, ADD_TO_CART_CSS, scope=PRODUCT_SECTION_CSS)
+            if add_button is None:
                 logger.error("[FAILED] Could not click Add to Cart button")
                 return False
+            logger.info("[OK] Add to Cart button clicked")
             
-            await asyncio.sleep(2)
+            # The Add to Cart button is swapped for the quantity stepper once the item is in the cart
+            await settle(add_button, "hidden")
             
             logger.info("Step 3: Opening cart...")
             
             # Click on the Cart button
-            cart_selectors = [
-                "button[aria-label='Cart']",
-                "button[data-testid='cart-btn']",
-                "div.group button[data-testid='cart-btn']"
-            ]
-            
-            cart_clicked = False
-            for selector in cart_selectors:
-                try:
-                    await self.page.click(selector, timeout=5000)
-                    cart_clicked = True
-                    logger.info("[OK] Cart button clicked")
-                    break
-                except Exception:
-                    pass
-            
-            if not cart_clicked:
+            if await click_visible(self.page, CART_BUTTON_CSS) is None:
                 logger.error("[FAILED] Could not click Cart button")
                 return False
+            logger.info("[OK] Cart button clicked")
             
-            await asyncio.sleep(2)
+            # Wait for the cart drawer (or checkout page) to show before reporting success
+            if not await settle(self.page.locator(CART_OPEN_CSS).locator("visible=true").first):
+                logger.debug("Cart drawer did not appear in time")
             
             # Send Telegram notification
             if self.telegram_bot:
@@ -712,7 +927,7 @@ class ZeptoChecker:
                     await self.telegram_bot.send_message(message)
                     logger.info("[TELEGRAM] Notification sent")
                 except Exception as e:
-                    logger.error(f"Failed to send Telegram notification: {e}")
+                    logger.error("Failed to send Telegram notification: %s", e)
             
             logger.info("[SUCCESS] Product successfully added to cart!")
             print("\n" + "=" * 70)
@@ -730,30 +945,22 @@ class ZeptoChecker:
             return True
             
         except Exception as e:
-            logger.error(f"Error adding to cart: {e}")
+            logger.error("Error adding to cart: %s", e)
             return False
 
-    async def watch(self, max_checks=None):
+    async def start_session(self):
         """
-        Monitor product until available
+        Open the browser, restore or complete the Zepto login and select the location
         
-        Args:
-            max_checks: Max checks before giving up (None = infinite)
+        Returns:
+            The BlinkitAuth owning the browser, or None if setup failed
         """
-        logger.info("=" * 70)
-        logger.info("ZEPTO PRODUCT CHECKER - Hot Wheels Tracker")
-        logger.info("=" * 70)
-        logger.info(f"Product: {self.product_name}")
-        logger.info(f"URL: {self.product_url}")
-        logger.info(f"Location: {self.location_label}")
-        logger.info(f"Check interval: {self.check_interval} seconds")
-        logger.info(f"Max checks: {max_checks if max_checks else 'Unlimited'}")
-        logger.info("-" * 70)
-        
-        # Initialize browser
         try:
             logger.info("Initializing browser...")
-            auth = BlinkitAuth(headless=False)  # Show browser
+            # The context is created from the saved Zepto session (cookies + local storage) when there is one
+            has_saved_session = self.prepare_saved_session()
+            session_path = str(self.ZEPTO_COOKIES_FILE) if has_saved_session else None
+            auth = BlinkitAuth(headless=False, session_path=session_path)  # Show browser
             await auth.start_browser()
             self.page = auth.page
             self.browser = self.page.context.browser
@@ -763,12 +970,10 @@ class ZeptoChecker:
             await self.page.goto("https://www.zepto.com/", wait_until="domcontentloaded", timeout=30000)
             await asyncio.sleep(2)
             
-            # Try to load saved cookies first
+            # Saved cookies were loaded with the context
             logger.info("Checking for saved Zepto cookies...")
-            if await self.load_cookies():
-                # Reload page with cookies
-                await self.page.reload(wait_until="domcontentloaded")
-                await asyncio.sleep(2)
+            if has_saved_session:
+                logger.info("[OK] Cookies loaded from %s", self.ZEPTO_COOKIES_FILE)
                 
                 # Check if we're still logged in
                 if not await self.is_logged_in():
@@ -777,14 +982,14 @@ class ZeptoChecker:
                     if not await self.login():
                         logger.error("[FAILED] Could not complete login")
                         await auth.close_browser()
-                        return False
+                        return None
             else:
                 # No saved cookies - need to login
                 logger.info("No saved cookies found - login required")
                 if not await self.login():
                     logger.error("[FAILED] Could not complete login")
                     await auth.close_browser()
-                    return False
+                    return None
             
             logger.info("[OK] Authentication successful")
             
@@ -796,12 +1001,37 @@ class ZeptoChecker:
             if not await self.select_location(self.page, self.location_label):
                 logger.error("[FAILED] Could not select location")
                 await auth.close_browser()
-                return False
+                return None
             
             logger.info("[OK] Location selected successfully")
             
+            # Login and location are done in the visible browser; from here on only stock state matters
+            await self.context.route(BLOCKED_REQUESTS_RE, lambda route: route.abort())
+            return auth
+            
         except Exception as e:
-            logger.error(f"Failed to initialize browser: {e}")
+            logger.error("Failed to initialize browser: %s", e)
+            return None
+
+    async def watch(self, max_checks=None):
+        """
+        Monitor product until available
+        
+        Args:
+            max_checks: Max checks before giving up (None = infinite)
+        """
+        logger.info("=" * 70)
+        logger.info("ZEPTO PRODUCT CHECKER - Hot Wheels Tracker")
+        logger.info("=" * 70)
+        logger.info("Product: %s", self.product_name)
+        logger.info("URL: %s", self.product_url)
+        logger.info("Location: %s", self.location_label)
+        logger.info("Check interval: %s seconds", self.check_interval)
+        logger.info("Max checks: %s", max_checks if max_checks else 'Unlimited')
+        logger.info("-" * 70)
+        
+        # Initialize browser
+        if not await self.start_session():
             return False
         
         # Initial status
@@ -828,11 +1058,11 @@ class ZeptoChecker:
                 
                 # Check max checks
                 if max_checks and check_num >= max_checks:
-                    logger.info(f"[LIMIT] Reached maximum checks ({max_checks})")
+                    logger.info("[LIMIT] Reached maximum checks (%s)", max_checks)
                     break
                 
                 # Wait before next check
-                logger.info(f"Next check in {self.check_interval} seconds...")
+                logger.info("Next check in %s seconds...", self.check_interval)
                 await asyncio.sleep(self.check_interval)
                 
         except KeyboardInterrupt:
@@ -846,6 +1076,8 @@ class ZeptoChecker:
             return False
         
         finally:
+            if self.telegram_bot:
+                await self.telegram_bot.close()
             try:
                 # Close browser
                 if self.browser:
@@ -855,13 +1087,108 @@ class ZeptoChecker:
         
         return True
 
+    @classmethod
+    async def watch_many(cls, products, max_checks=None, **kwargs):
+        """
+        Monitor several products from a single browser, one page per product
+        
+        Login and location selection happen once; every product then gets its own page
+        in the shared context, so all checks reuse the same session and connections.
+        
+        Args:
+            products: List of {'name': ..., 'url': ...} dicts
+            max_checks: Max check rounds before giving up (None = infinite)
+            **kwargs: Passed through to ZeptoChecker (location_label, check_interval, ...)
+        
+        Returns:
+            Dict mapping product URL to True if added to cart, False otherwise
+        """
+        checkers = [cls(product['url'], product['name'], **kwargs) for product in products]
+        # Checks run concurrently, so each product writes its own zepto_status_<product id>.json
+        for i, checker in enumerate(checkers, 1):
+            suffix = checker.product_id or str(i)
+            checker.status_file = ZEPTO_STATUS_FILE.with_name(f"{ZEPTO_STATUS_FILE.stem}_{suffix}.json")
+        results = {checker.product_url: False for checker in checkers}
+        if not checkers:
+            return results
+        
+        lead = checkers[0]
+        logger.info("=" * 70)
+        logger.info("ZEPTO PRODUCT CHECKER - Watching %s products", len(checkers))
+        logger.info("=" * 70)
+        
+        auth = await lead.start_session()
+        if not auth:
+            return results
+        
+        pending = list(checkers)
+        check_num = 0
+        try:
+            # One shared browser context, one cheap page per product, one Telegram connection pool
+            for checker in checkers[1:]:
+                checker.page = await lead.context.new_page()
+                checker.browser = lead.browser
+                checker.context = lead.context
+                checker.telegram_bot = lead.telegram_bot
+            
+            for checker in checkers:
+                checker.write_status("monitoring", {"started_at": datetime.now().isoformat()})
+            
+            while pending:
+                check_num += 1
+                
+                outcomes = await asyncio.gather(
+                    *(checker.check_product_availability() for checker in pending), return_exceptions=True
+                )
+                for checker, outcome in zip(list(pending), outcomes):
+                    if isinstance(outcome, Exception):
+                        logger.error("Error checking %s: %s", checker.product_url, outcome)
+                        continue
+                    if not outcome:
+                        continue
+                    
+                    # Adding to cart drives the shared cart, so run purchases one at a time
+                    logger.info("[PURCHASING] Attempting to add to cart...")
+                    if await checker.add_to_cart():
+                        results[checker.product_url] = True
+                        pending.remove(checker)
+                
+                if max_checks and check_num >= max_checks:
+                    logger.info("[LIMIT] Reached maximum checks (%s)", max_checks)
+                    break
+                
+                if pending:
+                    interval = min(checker.check_interval for checker in pending)
+                    logger.info("Next check in %s seconds...", interval)
+                    await asyncio.sleep(interval)
+        
+        except KeyboardInterrupt:
+            logger.info("\n[STOPPED] Checker stopped by user")
+            for checker in pending:
+                checker.write_status("stopped", {
+                    "reason": "User interrupted",
+                    "checks_performed": check_num
+                })
+        
+        finally:
+            if lead.telegram_bot:
+                await lead.telegram_bot.close()
+            try:
+                # Close browser
+                if lead.browser:
+                    await lead.browser.close()
+            except Exception:
+                pass
+        
+        return results
+
 
 def load_products_from_file():
     """Load product URLs from hot-wheels-urls.txt"""
     products = []
     try:
         if not ZEPTO_URLS_FILE.exists():
-            logger.error(f"File not found: {ZEPTO_URLS_FILE}")
+            logger.error("File not found: %s", ZEPTO_URLS_FILE)
             return products
         
         with open(ZEPTO_URLS_FILE, 'r') as f:
@@ -879,10 +1206,10 @@ def load_products_from_file():
                         'url': url.strip()
                     })
         
-        logger.info(f"Loaded {len(products)} products from {ZEPTO_URLS_FILE}")
+        logger.info("Loaded %s products from %s", len(products), ZEPTO_URLS_FILE)
         return products
     except Exception as e:
-        logger.error(f"Error loading products: {e}")
+        logger.error("Error loading products: %s", e)
         return products
 
 
@@ -911,17 +1238,19 @@ async def main():
     for i, product in enumerate(products, 1):
         print(f"{i}. {product['name']}")
     
-    # Ask user to select a product
+    # Ask user to select one or more products (comma-separated numbers share one browser)
     try:
-        choice = int(input("\nSelect product number to track (1-{}): ".format(len(products)))) - 1
-        if choice < 0 or choice >= len(products):
+        answer = input("\nSelect product number(s) to track (1-{}, comma-separated): ".format(len(products)))
+        choices = [int(part) - 1 for part in answer.split(",") if part.strip()]
+        if not choices or any(choice < 0 or choice >= len(products) for choice in choices):
             print("Invalid selection")
             return
     except ValueError:
         print("Invalid input")
         return
     
-    selected_product = products[choice]
+    selected_products = [products[choice] for choice in dict.fromkeys(choices)]
+    selected_product = selected_products[0]
     
     # Ask for location
     location = input("\nEnter location label to select (default 'home'): ").strip().lower() or "home"
@@ -936,15 +1265,29 @@ async def main():
     telegram_bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
     telegram_channel_id = os.getenv("TELEGRAM_CHANNEL_ID")
     
-    logger.info(f"Product: {selected_product['name']}")
-    logger.info(f"URL: {selected_product['url']}")
-    logger.info(f"Location: {location}")
-    logger.info(f"Check interval: {check_interval} seconds")
+    for product in selected_products:
+        logger.info("Product: %s", product['name'])
+        logger.info("URL: %s", product['url'])
+    logger.info("Location: %s", location)
+    logger.info("Check interval: %s seconds", check_interval)
     if telegram_bot_token and telegram_channel_id:
         logger.info("Telegram notifications: ENABLED")
     else:
         logger.info("Telegram notifications: DISABLED")
     
+    if len(selected_products) > 1:
+        # Several products: one browser, one page per product
+        results = await ZeptoChecker.watch_many(
+            selected_products,
+            location_label=location,
+            check_interval=check_interval,
+            telegram_bot_token=telegram_bot_token,
+            telegram_channel_id=telegram_channel_id
+        )
+        for url, added in results.items():
+            logger.info("%s %s", '[SUCCESS]' if added else '[INFO] Not added to cart:', url)
+        return
+    
     # Start checker
     checker = ZeptoChecker(
         selected_product['url'],
@@ -967,5 +1310,5 @@ if __name__ == "__main__":
     try:
         asyncio.run(main())
     except Exception as e:
-        logger.error(f"Fatal error: {e}", exc_info=True)
+        logger.error("Fatal error: %s", e, exc_info=True)
         sys.exit(1)
@@ -76,6 +76,20 @@ class TelegramBot:
         self.bot_token = bot_token
         self.channel_id = channel_id
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        # Reused across messages so each notification skips the TCP/TLS handshake
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the bot's HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+    
+    async def close(self):
+        """Close the bot's HTTP session if it was opened"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def send_message(self, message: str, parse_mode: str = "HTML") -> bool:
         """Send message to Telegram"""
@@ -91,15 +105,14 @@ class TelegramBot:
             logger.info(f"[TELEGRAM] Message length: {len(message)} characters")
             logger.info(f"[TELEGRAM] Full message:\n{message}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status == 200:
-                        logger.info("[OK] Telegram message sent successfully")
-                        return True
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"[ERROR] Telegram send failed (status {response.status}): {error_text}")
-                        return False
+            async with self._get_session().post(url, json=payload) as response:
+                if response.status == 200:
+                    logger.info("[OK] Telegram message sent successfully")
+                    return True
+                else:
+                    error_text = await response.text()
+                    logger.error(f"[ERROR] Telegram send failed (status {response.status}): {error_text}")
+                    return False
         except Exception as e:
             logger.error(f"[ERROR] Telegram error: {e}")
             logger.error(f"[ERROR] Traceback: {traceback.format_exc()}")
@@ -1111,6 +1124,8 @@ async def main():
         finally:
             # Cleanup
             await monitor.shutdown()
+            if telegram_bot:
+                await telegram_bot.close()
             logger.info("[OK] Script completed successfully")
             
     except KeyboardInterrupt: